@@ -0,0 +1,101 @@
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+
+class AspectTable(NamedTuple):
+    angles: np.ndarray
+    orbs: np.ndarray
+    names: List[str]
+
+    @classmethod
+    def from_dict(cls, aspects: Dict[float, tuple]) -> "AspectTable":
+        # Order matters: when orbs overlap, the first matching aspect wins
+        angles = list(aspects)
+        return cls(
+            angles=np.array(angles, dtype=float),
+            orbs=np.array([aspects[a][1] for a in angles], dtype=float),
+            names=[aspects[a][0] for a in angles],
+        )
+
+
+class AspectHits(NamedTuple):
+    """Aspects found between two position sets, as parallel arrays.
+
+    ``first``/``second`` index into the input longitudes, ``kind`` into the
+    aspect table; ``angle`` is the separation and ``orb`` its distance from
+    the exact aspect.
+    """
+    first: np.ndarray
+    second: np.ndarray
+    kind: np.ndarray
+    angle: np.ndarray
+    orb: np.ndarray
+
+    def __len__(self):
+        return len(self.first)
+
+
+MAJOR_ASPECTS = {
+    0: ("Кон'юнкція", 8),
+    60: ("Секстиль", 6),
+    90: ("Квадрат", 8),
+    120: ("Тригон", 8),
+    180: ("Опозиція", 8),
+}
+
+MINOR_ASPECTS = {
+    30: ("Напівсекстиль", 2),
+    45: ("Напівквадрат", 2),
+    72: ("Квінтиль", 2),
+    135: ("Півтораквадрат", 2),
+    144: ("Біквінтиль", 2),
+    150: ("Квінконс", 3),
+}
+
+MAJOR_TABLE = AspectTable.from_dict(MAJOR_ASPECTS)
+FULL_TABLE = AspectTable.from_dict({**MAJOR_ASPECTS, **MINOR_ASPECTS})
+
+
+def find_aspects(longitudes: Sequence[float], others: Optional[Sequence[float]] = None,
+                 table: AspectTable = MAJOR_TABLE) -> AspectHits:
+    """Aspects within one position set (each pair once) or, with ``others``,
+    between two sets (every cross pair, e.g. synastry or transits)."""
+    a = np.asarray(longitudes, dtype=float)
+    b = a if others is None else np.asarray(others, dtype=float)
+
+    separation = np.abs(a[:, None] - b[None, :])
+    separation = np.where(separation > 180, 360 - separation, separation)
+    # (len(a), len(b), aspects)
+    distance = np.abs(separation[..., None] - table.angles)
+    within = distance <= table.orbs
+    matched = within.any(axis=-1)
+    if others is None:
+        matched = np.triu(matched, k=1)
+
+    first, second = np.nonzero(matched)
+    kind = within[first, second].argmax(axis=-1)
+    return AspectHits(
+        first=first,
+        second=second,
+        kind=kind,
+        angle=separation[first, second],
+        orb=distance[first, second, kind],
+    )
+
+
+def to_dicts(hits: AspectHits, names: Sequence[str], other_names: Optional[Sequence[str]] = None,
+             table: AspectTable = MAJOR_TABLE) -> List[Dict]:
+    """Hits as stored aspects, keyed in ``models.Aspect`` field order.
+
+    Built straight from the arrays: the values are already the right
+    types, so validating them through the model would only cost time.
+    """
+    other_names = names if other_names is None else other_names
+    return [
+        {'planet1': names[i], 'planet2': other_names[j], 'aspect_type': table.names[k], 'angle': angle, 'orb': orb}
+        for i, j, k, angle, orb in zip(
+            hits.first.tolist(), hits.second.tolist(), hits.kind.tolist(),
+            hits.angle.tolist(), hits.orb.tolist(),
+        )
+    ]
@@ -0,0 +1,242 @@
+import os
+from bisect import bisect_right
+from datetime import datetime
+from typing import List, Dict
+import swisseph as swe
+
+from models import PlanetPosition, House
+from aspects import MAJOR_ASPECTS, find_aspects, to_dicts
+from metrics import buffer_spans, span
+from timezones import TimezoneResolver
+
+# Bump whenever a change alters calculated output; cached charts computed by
+# other versions are discarded
+CALCULATION_VERSION = "1"
+
+DEFAULT_HOUSE_SYSTEM = "P"  # Placidus
+
+# Swiss Ephemeris house system codes accepted by the API (see models.HouseSystem)
+HOUSE_SYSTEMS = {
+    "P": "Плацидус",
+    "K": "Кох",
+    "O": "Порфирій",
+    "R": "Регіомонтан",
+    "C": "Кампанус",
+    "B": "Алкабітіус",
+    "E": "Рівнодомна",
+    "W": "Цілі знаки",
+}
+
+# Timezone index of the API process. Birth times are converted to a Julian
+# day there (off the event loop), so compute workers never load the finder.
+timezone_resolver = TimezoneResolver.from_env()
+
+def init_ephemeris():
+    ephe_path = os.environ.get('EPHE_PATH')
+    if ephe_path:
+        swe.set_ephe_path(ephe_path)
+
+def init_worker():
+    init_ephemeris()
+    buffer_spans()
+
+def get_zodiac_sign(longitude: float) -> str:
+    signs = ["Овен", "Телець", "Близнюки", "Рак", "Лев", "Діва", 
+             "Терези", "Скорпіон", "Стрілець", "Козеріг", "Водолій", "Риби"]
+    sign_index = int(longitude / 30)
+    return signs[sign_index]
+
+def get_degree_in_sign(longitude: float) -> float:
+    return longitude % 30
+
+# angle -> (name, orb)
+ASPECT_TYPES = MAJOR_ASPECTS
+
+PLANET_DATA = [
+    (swe.SUN, "Сонце"),
+    (swe.MOON, "Місяць"),
+    (swe.MERCURY, "Меркурій"),
+    (swe.VENUS, "Венера"),
+    (swe.MARS, "Марс"),
+    (swe.JUPITER, "Юпітер"),
+    (swe.SATURN, "Сатурн"),
+    (swe.URANUS, "Уран"),
+    (swe.NEPTUNE, "Нептун"),
+    (swe.PLUTO, "Плутон"),
+    (swe.CHIRON, "Хірон"),
+    (swe.MEAN_NODE, "Північний вузол"),
+]
+
+# Chart angles: listed with the planets but left out of houses and aspects
+ANGLES = ("Асцендент", "Середина Неба (MC)")
+
+def unwrap_cusps(house_cusps) -> List[float]:
+    # Cusps measured forward from the 1st, so the array ascends from
+    # cusps[0] to below cusps[0] + 360 whichever sign the houses wrap in
+    start = house_cusps[0]
+    return [start + (cusp - start) % 360 for cusp in house_cusps[:12]]
+
+def house_in(longitude: float, unwrapped_cusps: List[float]) -> int:
+    start = unwrapped_cusps[0]
+    return bisect_right(unwrapped_cusps, start + (longitude - start) % 360)
+
+def house_of(longitude: float, house_cusps) -> int:
+    return house_in(longitude, unwrap_cusps(house_cusps))
+
+def assign_houses(planets: List[Dict], house_cusps):
+    # Normalizes the cusps once for the whole chart
+    unwrapped = unwrap_cusps(house_cusps)
+    for planet in planets:
+        if planet['name'] not in ANGLES:
+            planet['house'] = house_in(planet['longitude'], unwrapped)
+
+def calculate_houses(jd: float, latitude: float, longitude: float,
+                     house_system: str = DEFAULT_HOUSE_SYSTEM) -> tuple:
+    if house_system not in HOUSE_SYSTEMS:
+        raise ValueError(f"Unsupported house system: {house_system}")
+    house_cusps, ascmc = swe.houses(jd, latitude, longitude, house_system.encode())
+    houses = [
+        House(number=i + 1, cusp=cusp, sign=get_zodiac_sign(cusp))
+        for i, cusp in enumerate(house_cusps[:12])
+    ]
+    return houses, ascmc
+
+def calculate_aspects(planets: List[Dict]) -> List[Dict]:
+    hits = find_aspects([p['longitude'] for p in planets])
+    return to_dicts(hits, [p['name'] for p in planets])
+
+def birth_julian_day(birth_date: str, birth_time: str, latitude: float, longitude: float) -> float:
+    # Parse date and time
+    dt_str = f"{birth_date} {birth_time}"
+    dt = datetime.strptime(dt_str, "%Y-%m-%d %H:%M")
+    
+    # Get timezone
+    with span("timezone"):
+        utc_dt = timezone_resolver.to_utc(dt, latitude, longitude)
+    
+    # Convert to Julian Day
+    return swe.julday(utc_dt.year, utc_dt.month, utc_dt.day, 
+                      utc_dt.hour + utc_dt.minute/60.0 + utc_dt.second/3600.0)
+
+def calculate_natal_chart(birth_date: str, birth_time: str, latitude: float, longitude: float,
+                          house_system: str = DEFAULT_HOUSE_SYSTEM) -> Dict:
+    jd = birth_julian_day(birth_date, birth_time, latitude, longitude)
+    return calculate_chart_at(jd, latitude, longitude, house_system)
+
+def calculate_chart_at(jd: float, latitude: float, longitude: float,
+                       house_system: str = DEFAULT_HOUSE_SYSTEM) -> Dict:
+    # Calculate planets
+    planet_data = PLANET_DATA
+    
+    with span("ephemeris"):
+        planets = []
+        planet_longs = []
+    
+        for planet_id, planet_name in planet_data:
+            result = swe.calc_ut(jd, planet_id)
+            lon, lat, dist, speed_lon, speed_lat, speed_dist = result[0]
+        
+            planet_info = {
+                'name': planet_name,
+                'longitude': lon,
+                'latitude': lat,
+                'speed': speed_lon,
+                'sign': get_zodiac_sign(lon),
+                'degree': get_degree_in_sign(lon)
+            }
+            planets.append(planet_info)
+            planet_longs.append(lon)
+    
+        # Add South Node (opposite of North Node)
+        north_node_lon = planet_longs[-1]
+        south_node_lon = (north_node_lon + 180) % 360
+        planets.append({
+            'name': "Південний вузол",
+            'longitude': south_node_lon,
+            'latitude': 0,
+            'speed': 0,
+            'sign': get_zodiac_sign(south_node_lon),
+            'degree': get_degree_in_sign(south_node_lon)
+        })
+        planet_longs.append(south_node_lon)
+    
+        # Calculate Lilith (Mean Apogee)
+        result = swe.calc_ut(jd, swe.MEAN_APOG)
+        lon, lat, dist, speed_lon, speed_lat, speed_dist = result[0]
+        planets.append({
+            'name': "Ліліт",
+            'longitude': lon,
+            'latitude': lat,
+            'speed': speed_lon,
+            'sign': get_zodiac_sign(lon),
+            'degree': get_degree_in_sign(lon)
+        })
+        planet_longs.append(lon)
+    
+    with span("houses"):
+        # Calculate houses (Placidus unless another system is requested)
+        houses, ascmc = calculate_houses(jd, latitude, longitude, house_system)
+    
+        # Add Ascendant
+        asc_lon = ascmc[0]
+        planets.insert(0, {
+            'name': "Асцендент",
+            'longitude': asc_lon,
+            'latitude': 0,
+            'speed': 0,
+            'sign': get_zodiac_sign(asc_lon),
+            'degree': get_degree_in_sign(asc_lon)
+        })
+    
+        # Add MC (Midheaven)
+        mc_lon = ascmc[1]
+        planets.insert(1, {
+            'name': "Середина Неба (MC)",
+            'longitude': mc_lon,
+            'latitude': 0,
+            'speed': 0,
+            'sign': get_zodiac_sign(mc_lon),
+            'degree': get_degree_in_sign(mc_lon)
+        })
+    
+        # Assign planets to houses
+        assign_houses(planets, [h.cusp for h in houses])
+    
+    # Calculate aspects (excluding Ascendant and MC from aspects)
+    planets_for_aspects = [p for p in planets if p['name'] not in ANGLES]
+    with span("aspects"):
+        aspects = calculate_aspects(planets_for_aspects)
+    
+    with span("models"):
+        planet_models = [PlanetPosition(**p) for p in planets]
+    return {
+        'planets': planet_models,
+        'houses': houses,
+        'aspects': aspects
+    }
+
+def calculate_chart_data(jd: float, latitude: float, longitude: float,
+                         house_system: str = DEFAULT_HOUSE_SYSTEM) -> Dict:
+    # Plain-dict variant for the compute engine and the chart cache: cheaper to
+    # pickle across processes and ready to store as-is
+    chart = calculate_chart_at(jd, latitude, longitude, house_system)
+    with span("serialize"):
+        return {
+            'planets': [p.model_dump() for p in chart['planets']],
+            'houses': [h.model_dump() for h in chart['houses']],
+            'aspects': chart['aspects']
+        }
+
+def calculate_charts_data(records: List[tuple]) -> List[tuple]:
+    # Batch entry point for the compute engine: one IPC round trip per group.
+    # Records (jd, latitude, longitude[, house_system]) are evaluated in time order so Swiss
+    # Ephemeris keeps hitting the same cached file segments; errors are
+    # captured per record.
+    results = [None] * len(records)
+    order = sorted(range(len(records)), key=lambda i: records[i][0])
+    for i in order:
+        try:
+            results[i] = (True, calculate_chart_data(*records[i]))
+        except Exception as e:
+            results[i] = (False, str(e))
+    return results
@@ -0,0 +1,78 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Optional
+
+import jwt
+
+
+@lru_cache(maxsize=None)
+def pwd_context():
+    # passlib and its bcrypt backend take ~30 ms to import; only logins need them
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# bcrypt is deliberately slow (~100-300 ms); run it off the event loop on a
+# small dedicated pool so a burst of logins cannot take every thread
+_hash_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('AUTH_HASH_CONCURRENCY', 2)),
+    thread_name_prefix="bcrypt",
+)
+
+TOKEN_TTL = timedelta(seconds=int(os.environ.get('JWT_TTL_SECONDS', 12 * 3600)))
+
+
+async def hash_password(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, pwd_context().hash, password)
+
+
+async def verify_password(password: str, hashed: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, pwd_context().verify, password, hashed)
+
+
+def create_access_token(username: str, secret_key: str) -> str:
+    now = datetime.now(timezone.utc)
+    return jwt.encode({"sub": username, "iat": now, "exp": now + TOKEN_TTL}, secret_key, algorithm="HS256")
+
+
+def decode_access_token(token: str, secret_key: str) -> Dict:
+    return jwt.decode(token, secret_key, algorithms=["HS256"], options={"require": ["sub", "iat", "exp"]})
+
+
+class PrincipalCache:
+    """Short-lived memory of admins confirmed to exist, so authenticated
+    requests skip the admins lookup. Deleting an admin invalidates it here;
+    other replicas notice within ``ttl_seconds``."""
+
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._expires: Dict[str, float] = {}
+
+    def contains(self, username: str) -> bool:
+        expires = self._expires.get(username)
+        if expires is None:
+            return False
+        if expires < time.monotonic():
+            del self._expires[username]
+            return False
+        return True
+
+    def add(self, username: str):
+        if len(self._expires) >= self.max_entries:
+            now = time.monotonic()
+            self._expires = {u: e for u, e in self._expires.items() if e >= now}
+            if len(self._expires) >= self.max_entries:
+                self._expires.pop(next(iter(self._expires)))
+        self._expires[username] = time.monotonic() + self.ttl_seconds
+
+    def invalidate(self, username: Optional[str] = None):
+        if username is None:
+            self._expires.clear()
+        else:
+            self._expires.pop(username, None)
@@ -0,0 +1,84 @@
+import json
+from typing import Any, AsyncIterator, List, Tuple
+
+from fastapi import HTTPException, Request
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def is_ndjson(request: Request) -> bool:
+    content_type = request.headers.get("content-type", "")
+    return "ndjson" in content_type or "jsonlines" in content_type
+
+
+async def read_records(request: Request, max_records: int) -> AsyncIterator[Tuple[int, Any]]:
+    # The body is read in full before the response starts: StreamingResponse
+    # listens on the same ASGI receive channel for disconnects, so it cannot
+    # be consumed while results are being streamed back. The record limit
+    # keeps that buffer bounded, and violations still get a plain 400.
+    body = await request.body()
+
+    if is_ndjson(request):
+        lines = [line for line in body.split(b"\n") if line.strip()]
+        if len(lines) > max_records:
+            raise HTTPException(status_code=400, detail=_limit_message(max_records))
+        return _iter_list([_parse_line(line, i) for i, line in enumerate(lines)])
+
+    try:
+        payload = json.loads(body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+    if not isinstance(payload, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array of charts")
+    if len(payload) > max_records:
+        raise HTTPException(status_code=400, detail=_limit_message(max_records))
+    return _iter_list(payload)
+
+
+async def stream_ndjson_records(request: Request, max_line_bytes: int = 1024 * 1024) -> AsyncIterator[Tuple[int, Any]]:
+    """Parses an NDJSON body as it arrives, holding at most one line.
+
+    Only for endpoints that answer after the body is consumed; streaming
+    responses must use read_records (see the note there).
+    """
+    buffer = b""
+    index = 0
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        if len(buffer) > max_line_bytes:
+            raise HTTPException(status_code=413, detail=f"Line {index + len(lines) + 1} exceeds {max_line_bytes} bytes")
+        for line in lines:
+            if line.strip():
+                yield index, _parse_line(line, index)
+            index += 1
+    if buffer.strip():
+        yield index, _parse_line(buffer, index)
+
+
+async def _iter_list(payload: List[Any]) -> AsyncIterator[Tuple[int, Any]]:
+    for index, record in enumerate(payload):
+        yield index, record
+
+
+async def iter_groups(records: AsyncIterator[Tuple[int, Any]], size: int) -> AsyncIterator[List[Tuple[int, Any]]]:
+    group = []
+    async for record in records:
+        group.append(record)
+        if len(group) >= size:
+            yield group
+            group = []
+    if group:
+        yield group
+
+
+def _parse_line(line: bytes, index: int) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        # Keep going; the record is reported back as a per-line error
+        return ValueError(f"Invalid JSON on line {index + 1}: {e}")
+
+
+def _limit_message(max_records: int) -> str:
+    return f"Batch exceeds the limit of {max_records} records"
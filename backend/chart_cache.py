@@ -0,0 +1,148 @@
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional
+
+from astrology import CALCULATION_VERSION, DEFAULT_HOUSE_SYSTEM
+
+logger = logging.getLogger(__name__)
+
+
+def chart_cache_key(jd: float, latitude: float, longitude: float,
+                    house_system: str = DEFAULT_HOUSE_SYSTEM,
+                    version: str = CALCULATION_VERSION) -> str:
+    # jd to 1e-6 days (~0.1 s) and coordinates to 1e-4 degrees (~10 m) are
+    # well below anything that changes a chart
+    raw = f"{version}|{jd:.6f}|{latitude:.4f}|{longitude:.4f}|{house_system}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class ChartCache:
+    """Two-tier cache of calculated chart data (planets, houses, aspects).
+
+    The in-process LRU is always on; passing a Motor collection adds a
+    persistent tier shared by all replicas, expired by a TTL index.
+    """
+
+    def __init__(self, max_entries: int = 4096, collection=None,
+                 ttl_seconds: int = 30 * 24 * 3600, version: str = CALCULATION_VERSION):
+        self.max_entries = max_entries
+        self.collection = collection
+        self.ttl_seconds = ttl_seconds
+        self.version = version
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._hits = 0
+        self._persistent_hits = 0
+        self._misses = 0
+
+    @classmethod
+    def from_env(cls, db) -> "ChartCache":
+        persistent = os.environ.get('CHART_CACHE_MONGO', '').lower() in ('1', 'true', 'yes')
+        return cls(
+            max_entries=int(os.environ.get('CHART_CACHE_SIZE', 4096)),
+            collection=db.chart_cache if persistent else None,
+            ttl_seconds=int(os.environ.get('CHART_CACHE_TTL_SECONDS', 30 * 24 * 3600)),
+        )
+
+    async def setup(self):
+        if self.collection is None:
+            return
+        await self.collection.create_index("created_at", expireAfterSeconds=self.ttl_seconds)
+        result = await self.collection.delete_many({"version": {"$ne": self.version}})
+        if result.deleted_count:
+            logger.info(f"Discarded {result.deleted_count} cached charts from other calculation versions")
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+        if self.collection is not None:
+            doc = await self.collection.find_one({"_id": key, "version": self.version}, {"chart": 1})
+            if doc:
+                self._persistent_hits += 1
+                self._remember(key, doc["chart"])
+                return doc["chart"]
+
+        self._misses += 1
+        return None
+
+    async def put(self, key: str, value: Dict[str, Any], **fields):
+        self._remember(key, value)
+        if self.collection is not None:
+            try:
+                await self.collection.replace_one(
+                    {"_id": key},
+                    {**fields, "version": self.version, "chart": value, "created_at": datetime.now(timezone.utc)},
+                    upsert=True,
+                )
+            except Exception as e:
+                # The persistent tier is best effort; the chart is already computed
+                logger.warning(f"Could not persist cached chart: {str(e)}")
+
+    async def invalidate(self):
+        self._entries.clear()
+        if self.collection is not None:
+            await self.collection.delete_many({})
+
+    def _remember(self, key: str, value: Dict[str, Any]):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self._hits + self._persistent_hits + self._misses
+        return {
+            'version': self.version,
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'persistent': self.collection is not None,
+            'hits': self._hits,
+            'persistent_hits': self._persistent_hits,
+            'misses': self._misses,
+            'hit_ratio': round((self._hits + self._persistent_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+def pair_cache_key(kind: str, first_id: str, second_id: str, version: str = CALCULATION_VERSION) -> str:
+    # Composites are symmetric, synastry is not (planet1 always belongs to
+    # the first chart)
+    if kind == "composite":
+        first_id, second_id = sorted((first_id, second_id))
+    return f"{version}|{kind}|{first_id}|{second_id}"
+
+
+class PairCache(ChartCache):
+    """Synastry and composite results for a pair of stored charts.
+
+    Stored charts never change, so entries stay valid until one of the two
+    charts is deleted; ``forget_chart`` drops every pair it belongs to.
+    """
+
+    @classmethod
+    def from_env(cls, db) -> "PairCache":
+        persistent = os.environ.get('CHART_CACHE_MONGO', '').lower() in ('1', 'true', 'yes')
+        return cls(
+            max_entries=int(os.environ.get('PAIR_CACHE_SIZE', 16384)),
+            collection=db.pair_cache if persistent else None,
+            ttl_seconds=int(os.environ.get('CHART_CACHE_TTL_SECONDS', 30 * 24 * 3600)),
+        )
+
+    async def setup(self):
+        await super().setup()
+        if self.collection is not None:
+            await self.collection.create_index("charts")
+
+    async def put_pair(self, key: str, value: Dict[str, Any], chart_ids: Iterable[str]):
+        await self.put(key, value, charts=list(chart_ids))
+
+    async def forget_chart(self, chart_id: str):
+        for key in [k for k in self._entries if chart_id in k.split("|")[2:]]:
+            del self._entries[key]
+        if self.collection is not None:
+            await self.collection.delete_many({"charts": chart_id})
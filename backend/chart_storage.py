@@ -0,0 +1,217 @@
+"""Compact persisted form of natal chart documents.
+
+A full chart document repeats Ukrainian planet, sign and aspect names in
+~60 sub-documents. The compact form (``format: 1``) keeps the top-level
+fields as they are (indexes and summary projections are unaffected) and
+replaces ``planets``, ``houses`` and ``aspects`` with packed binaries:
+
+    points        uint8 point codes (POINT_NAMES)
+    positions     float64 (longitude, latitude, speed) per point
+    point_houses  uint8 house per point, 0 for none
+    cusps         float64 house cusps
+    aspect_pairs  uint8 (point index, point index, aspect angle) triples
+
+Sign, degree, aspect angle and orb are derived from the longitudes on
+read, exactly as they were computed. Both forms can coexist in the
+collection; ``unpack_chart`` expands compact documents and leaves full
+ones alone.
+
+Every chart also records the ``calculation_version`` it was computed
+under. Responses for a chart are cached as immutable only while that
+matches the running ``CALCULATION_VERSION``; older charts are served
+uncached until ``jobs.recompute_aspects`` brings them up to date.
+"""
+import logging
+import os
+from typing import Dict, Optional
+
+import numpy as np
+from bson import Binary
+from pymongo import UpdateOne
+
+from aspects import MAJOR_ASPECTS, MINOR_ASPECTS
+from astrology import CALCULATION_VERSION, get_degree_in_sign, get_zodiac_sign
+
+logger = logging.getLogger(__name__)
+
+COMPACT_FORMAT = 1
+
+# Persisted codes: append only, never reorder
+POINT_NAMES = [
+    "Асцендент",
+    "Середина Неба (MC)",
+    "Сонце",
+    "Місяць",
+    "Меркурій",
+    "Венера",
+    "Марс",
+    "Юпітер",
+    "Сатурн",
+    "Уран",
+    "Нептун",
+    "Плутон",
+    "Хірон",
+    "Північний вузол",
+    "Південний вузол",
+    "Ліліт",
+]
+POINT_CODES = {name: code for code, name in enumerate(POINT_NAMES)}
+
+ASPECT_NAMES = {angle: name for angle, (name, _) in {**MAJOR_ASPECTS, **MINOR_ASPECTS}.items()}
+ASPECT_ANGLES = {name: angle for angle, name in ASPECT_NAMES.items()}
+
+COMPACT_FIELDS = ("format", "points", "positions", "point_houses", "cusps", "aspect_pairs")
+FULL_FIELDS = ("planets", "houses", "aspects")
+
+# Charts stored before calculation_version was recorded
+LEGACY_CALCULATION_VERSION = "1"
+
+
+def compact_enabled() -> bool:
+    return os.environ.get('CHART_STORAGE_FORMAT', 'compact').lower() == 'compact'
+
+
+def is_current(doc: Dict) -> bool:
+    return doc.get("calculation_version", LEGACY_CALCULATION_VERSION) == CALCULATION_VERSION
+
+
+def outdated_filter() -> Dict:
+    # Charts without the field count as the legacy version
+    if CALCULATION_VERSION == LEGACY_CALCULATION_VERSION:
+        return {"calculation_version": {"$exists": True, "$ne": CALCULATION_VERSION}}
+    return {"calculation_version": {"$ne": CALCULATION_VERSION}}
+
+
+def chart_projection(*fields: str) -> Dict[str, int]:
+    # Asking for any of planets/houses/aspects pulls in the packed fields too,
+    # so the projection works against both document forms
+    projection = {"_id": 0, **{field: 1 for field in fields}}
+    if set(fields) & set(FULL_FIELDS):
+        projection.update({field: 1 for field in COMPACT_FIELDS})
+    return projection
+
+
+def pack_chart(doc: Dict) -> Optional[Dict]:
+    """Compact fields for a full chart document, or None if it has points or
+    aspects without a code (those documents stay in the full form)."""
+    planets = doc["planets"]
+    if any(p["name"] not in POINT_CODES for p in planets):
+        return None
+    index = {p["name"]: i for i, p in enumerate(planets)}
+    try:
+        pairs = [(index[a["planet1"]], index[a["planet2"]], ASPECT_ANGLES[a["aspect_type"]]) for a in doc["aspects"]]
+    except KeyError:
+        return None
+    cusps = [h["cusp"] for h in sorted(doc["houses"], key=lambda h: h["number"])]
+
+    return {
+        "format": COMPACT_FORMAT,
+        "points": Binary(bytes(POINT_CODES[p["name"]] for p in planets)),
+        "positions": Binary(np.array(
+            [(p["longitude"], p["latitude"], p["speed"]) for p in planets], dtype="<f8"
+        ).tobytes()),
+        "point_houses": Binary(bytes(p.get("house") or 0 for p in planets)),
+        "cusps": Binary(np.array(cusps, dtype="<f8").tobytes()),
+        "aspect_pairs": Binary(np.array(pairs, dtype=np.uint8).tobytes()),
+    }
+
+
+def to_storage(doc: Dict) -> Dict:
+    if not compact_enabled():
+        return doc
+    packed = pack_chart(doc)
+    if packed is None:
+        return doc
+    stored = {key: value for key, value in doc.items() if key not in FULL_FIELDS}
+    stored.update(packed)
+    return stored
+
+
+def storage_update(fields: Dict) -> Dict:
+    """Update operators that replace planets/houses/aspects of a stored chart
+    (in either form) with ``fields``, written the way new charts are."""
+    stored = to_storage(dict(fields))
+    stale = FULL_FIELDS if stored.get("format") == COMPACT_FORMAT else COMPACT_FIELDS
+    return {"$set": stored, "$unset": {field: "" for field in stale}}
+
+
+def unpack_chart(doc: Dict) -> Dict:
+    """Expands a compact document in place into planets/houses/aspects."""
+    if doc.get("format") != COMPACT_FORMAT:
+        return doc
+
+    codes = list(doc.pop("points"))
+    positions = np.frombuffer(doc.pop("positions"), dtype="<f8").reshape(-1, 3).tolist()
+    point_houses = list(doc.pop("point_houses"))
+    cusps = np.frombuffer(doc.pop("cusps"), dtype="<f8").tolist()
+    pairs = np.frombuffer(doc.pop("aspect_pairs"), dtype=np.uint8).reshape(-1, 3).tolist()
+    doc.pop("format")
+
+    doc["planets"] = [
+        {
+            'name': POINT_NAMES[code],
+            'longitude': lon,
+            'latitude': lat,
+            'speed': speed,
+            'sign': get_zodiac_sign(lon),
+            'degree': get_degree_in_sign(lon),
+            'house': house or None,
+        }
+        for code, (lon, lat, speed), house in zip(codes, positions, point_houses)
+    ]
+    doc["houses"] = [
+        {'number': i + 1, 'cusp': cusp, 'sign': get_zodiac_sign(cusp)}
+        for i, cusp in enumerate(cusps)
+    ]
+
+    aspects = []
+    for first, second, aspect_angle in pairs:
+        # Same arithmetic as aspects.find_aspects, so angle and orb round-trip exactly
+        angle = abs(positions[first][0] - positions[second][0])
+        if angle > 180:
+            angle = 360 - angle
+        aspects.append({
+            'planet1': POINT_NAMES[codes[first]],
+            'planet2': POINT_NAMES[codes[second]],
+            'aspect_type': ASPECT_NAMES[aspect_angle],
+            'angle': angle,
+            'orb': abs(angle - aspect_angle),
+        })
+    doc["aspects"] = aspects
+    return doc
+
+
+async def migrate_charts(collection, compact: bool = True, batch_size: int = 500) -> Dict[str, int]:
+    """Rewrites stored charts into the compact form, or back to the full one."""
+    if compact:
+        query = {"format": {"$exists": False}}
+        projection = {"_id": 1, "planets": 1, "houses": 1, "aspects": 1}
+    else:
+        query = {"format": COMPACT_FORMAT}
+        projection = {"_id": 1, **{field: 1 for field in COMPACT_FIELDS}}
+
+    counts = {"migrated": 0, "skipped": 0}
+    batch = []
+    async for doc in collection.find(query, projection):
+        if compact:
+            packed = pack_chart(doc)
+            if packed is None:
+                counts["skipped"] += 1
+                continue
+            update = {"$set": packed, "$unset": {field: "" for field in FULL_FIELDS}}
+        else:
+            full = unpack_chart(doc)
+            update = {
+                "$set": {field: full[field] for field in FULL_FIELDS},
+                "$unset": {field: "" for field in COMPACT_FIELDS},
+            }
+        # The query is repeated as a guard against concurrent rewrites
+        batch.append(UpdateOne({"_id": doc["_id"], **query}, update))
+        if len(batch) >= batch_size:
+            counts["migrated"] += (await collection.bulk_write(batch, ordered=False)).modified_count
+            batch = []
+    if batch:
+        counts["migrated"] += (await collection.bulk_write(batch, ordered=False)).modified_count
+    if counts["skipped"]:
+        logger.warning(f"{counts['skipped']} charts have points without a storage code and stay in full form")
+    return counts
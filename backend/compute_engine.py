@@ -0,0 +1,155 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+import astrology
+from metrics import drain_spans, record_spans
+
+
+class EngineOverloaded(Exception):
+    pass
+
+
+class WorkerCrashed(EngineOverloaded):
+    """A worker process died running the job, twice in a row."""
+
+
+def _timed_call(fn: Callable, args: tuple) -> tuple:
+    # Runs inside the worker process so the reported time excludes queueing;
+    # calculation spans buffered by the worker travel back with the result
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result, drain_spans()
+
+
+class ChartComputeEngine:
+    """Runs CPU-bound chart calculations in a process pool.
+
+    Admission is bounded: once ``max_pending`` jobs are running or queued,
+    further submissions fail fast with ``EngineOverloaded`` instead of
+    piling up behind the pool.
+
+    A worker that dies (a crash in the ephemeris library, an OOM kill)
+    breaks the whole pool. The pool is then rebuilt and the job retried
+    once; if it takes the new worker down too, ``WorkerCrashed`` is raised,
+    which callers answer like an overload (503).
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.max_workers * 4
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._restarts = 0
+        self._compute_seconds = 0.0
+        self._compute_max = 0.0
+        self._wait_seconds = 0.0
+
+    @classmethod
+    def from_env(cls) -> "ChartComputeEngine":
+        return cls(
+            max_workers=int(os.environ.get('CHART_WORKERS', 0)) or None,
+            max_pending=int(os.environ.get('CHART_QUEUE_SIZE', 0)) or None,
+        )
+
+    def start(self):
+        if self._executor is None:
+            # spawn keeps workers free of the parent's event loop and Mongo threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=astrology.init_worker,
+            )
+
+    async def warm_up(self):
+        # Spawns every worker and runs its initializer ahead of the first
+        # request; the pool starts one process per submission while none
+        # is idle
+        self.start()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._executor, os.getpid) for _ in range(self.max_workers)))
+
+    def _restart(self, broken: ProcessPoolExecutor):
+        # Every job in flight on the broken pool lands here; only the first
+        # one replaces it
+        if self._executor is broken:
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._restarts += 1
+            self.start()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, fn: Callable, *args) -> Any:
+        if self._pending >= self.max_pending:
+            self._rejected += 1
+            raise EngineOverloaded(f"Chart engine is at capacity ({self.max_pending} pending jobs)")
+
+        self.start()
+        self._pending += 1
+        submitted = time.perf_counter()
+        try:
+            elapsed, result, spans = await self._submit(fn, args)
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._pending -= 1
+
+        self._completed += 1
+        self._compute_seconds += elapsed
+        self._compute_max = max(self._compute_max, elapsed)
+        self._wait_seconds += max(time.perf_counter() - submitted - elapsed, 0.0)
+        record_spans(spans)
+        return result
+
+    async def _submit(self, fn: Callable, args: tuple) -> tuple:
+        loop = asyncio.get_running_loop()
+        for _ in range(2):
+            executor = self._executor
+            try:
+                return await loop.run_in_executor(executor, _timed_call, fn, args)
+            except BrokenProcessPool:
+                self._restart(executor)
+        raise WorkerCrashed(f"Chart engine worker died running {getattr(fn, '__name__', fn)}")
+
+    async def run_waiting(self, fn: Callable, *args, poll_interval: float = 0.1) -> Any:
+        # For bulk and background work: wait for capacity instead of failing
+        while True:
+            try:
+                return await self.run(fn, *args)
+            except WorkerCrashed:
+                raise
+            except EngineOverloaded:
+                await asyncio.sleep(poll_interval)
+
+    @property
+    def queue_depth(self) -> int:
+        return max(self._pending - self.max_workers, 0)
+
+    def metrics(self) -> Dict[str, Any]:
+        completed = self._completed or 1
+        return {
+            'workers': self.max_workers,
+            'max_pending': self.max_pending,
+            'pending': self._pending,
+            'queue_depth': self.queue_depth,
+            'completed': self._completed,
+            'failed': self._failed,
+            'rejected': self._rejected,
+            'restarts': self._restarts,
+            'compute_seconds_total': round(self._compute_seconds, 6),
+            'compute_seconds_avg': round(self._compute_seconds / completed, 6),
+            'compute_seconds_max': round(self._compute_max, 6),
+            'queue_wait_seconds_avg': round(self._wait_seconds / completed, 6),
+        }
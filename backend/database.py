@@ -0,0 +1,101 @@
+"""MongoDB client configuration shared by the API, worker.py and db_setup.py.
+
+Pool size and timeouts come from the environment, so each deployment can
+size its pool to its share of the server's connection limit:
+
+    MONGO_MAX_POOL_SIZE                 connections per process (100)
+    MONGO_MIN_POOL_SIZE                 kept open when idle (0)
+    MONGO_MAX_IDLE_MS                   idle connections are closed after this (60000)
+    MONGO_WAIT_QUEUE_TIMEOUT_MS         wait for a free connection before failing (5000)
+    MONGO_SERVER_SELECTION_TIMEOUT_MS   find a usable server (5000)
+    MONGO_CONNECT_TIMEOUT_MS            open a connection (5000)
+    MONGO_SOCKET_TIMEOUT_MS             any single round trip (30000)
+    MONGO_LIST_READ_PREFERENCE          list and export reads (secondaryPreferred)
+    MONGO_MAX_STALENESS_SECONDS         secondaries further behind are skipped (unset)
+    MONGO_CHART_WRITE_CONCERN           chart inserts: a number or "majority" (1)
+
+Options given in MONGO_URL itself take precedence over these defaults.
+"""
+import os
+from typing import Dict, Optional
+from urllib.parse import parse_qsl
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReadPreference
+from pymongo.read_preferences import (
+    Nearest, Primary, PrimaryPreferred, Secondary, SecondaryPreferred,
+)
+from pymongo.write_concern import WriteConcern
+
+from metrics import MongoCommandMetrics, MongoPoolMetrics
+
+CLIENT_OPTIONS = {
+    # keyword: (environment variable, default)
+    "maxPoolSize": ("MONGO_MAX_POOL_SIZE", 100),
+    "minPoolSize": ("MONGO_MIN_POOL_SIZE", 0),
+    "maxIdleTimeMS": ("MONGO_MAX_IDLE_MS", 60000),
+    "waitQueueTimeoutMS": ("MONGO_WAIT_QUEUE_TIMEOUT_MS", 5000),
+    "serverSelectionTimeoutMS": ("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000),
+    "connectTimeoutMS": ("MONGO_CONNECT_TIMEOUT_MS", 5000),
+    "socketTimeoutMS": ("MONGO_SOCKET_TIMEOUT_MS", 30000),
+}
+
+READ_PREFERENCES = {
+    "primary": Primary,
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+
+def client_options(mongo_url: str) -> Dict[str, int]:
+    # URI option names are case-insensitive; the query string is read
+    # directly so mongodb+srv URLs are not resolved here
+    query = mongo_url.split("?", 1)[1] if "?" in mongo_url else ""
+    in_url = {key.lower() for key, _ in parse_qsl(query)}
+    return {
+        option: int(os.environ.get(variable, default))
+        for option, (variable, default) in CLIENT_OPTIONS.items()
+        if option.lower() not in in_url
+    }
+
+
+def create_client(mongo_url: Optional[str] = None, appname: Optional[str] = None) -> AsyncIOMotorClient:
+    mongo_url = mongo_url or os.environ['MONGO_URL']
+    options = client_options(mongo_url)
+    if appname:
+        options["appname"] = appname
+    return AsyncIOMotorClient(
+        mongo_url,
+        tz_aware=True,
+        event_listeners=[MongoCommandMetrics(), MongoPoolMetrics()],
+        **options,
+    )
+
+
+def list_read_preference():
+    name = os.environ.get('MONGO_LIST_READ_PREFERENCE', 'secondaryPreferred')
+    if name not in READ_PREFERENCES:
+        raise ValueError(f"Unknown read preference {name!r}; expected one of {', '.join(READ_PREFERENCES)}")
+    if name == "primary":
+        return ReadPreference.PRIMARY
+    staleness = int(os.environ.get('MONGO_MAX_STALENESS_SECONDS', -1))
+    return READ_PREFERENCES[name](max_staleness=staleness)
+
+
+def list_reads(client: AsyncIOMotorClient, name: str):
+    """The database as seen by heavy list and export reads.
+
+    These tolerate replication lag, so by default they go to a secondary
+    when one is available and keep load off the primary. On a standalone
+    server every read preference resolves to the primary.
+    """
+    return client.get_database(name, read_preference=list_read_preference())
+
+
+def chart_write_concern() -> WriteConcern:
+    # Charts are derived from their request and can be recomputed, so
+    # inserts wait for the primary only unless configured otherwise
+    value = os.environ.get('MONGO_CHART_WRITE_CONCERN', '1')
+    return WriteConcern(w=int(value) if value.isdigit() else value)
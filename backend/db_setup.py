@@ -0,0 +1,116 @@
+"""Index and data-migration bootstrap for the MongoDB collections.
+
+Runs on every app startup (idempotent) and can be driven by hand:
+
+    python db_setup.py apply            # create indexes, run migrations
+    python db_setup.py verify           # exit 1 if any index is missing
+    python db_setup.py compact-charts   # rewrite charts in the compact format
+    python db_setup.py expand-charts    # ...and back (see chart_storage.py)
+"""
+import asyncio
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+INDEXES: Dict[str, List[IndexModel]] = {
+    "natal_charts": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)], name="created_at_id"),
+    ],
+    "interpretations": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("category", ASCENDING), ("key", ASCENDING)], name="category_key"),
+        IndexModel([("created_at", DESCENDING)], name="created_at"),
+    ],
+    "admins": [
+        IndexModel([("username", ASCENDING)], name="username_unique", unique=True),
+    ],
+    "jobs": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("status", ASCENDING), ("run_after", ASCENDING)], name="status_run_after"),
+        # Finished jobs are kept for a week for polling and inspection
+        IndexModel([("finished_at", ASCENDING)], name="finished_at_ttl", expireAfterSeconds=7 * 24 * 3600),
+    ],
+}
+
+
+async def _natal_chart_dates(db):
+    # Charts saved before created_at became a BSON date still hold ISO strings.
+    # Converted server-side in one pass; strings without an offset are UTC, as
+    # in pagination.as_utc, and an unparsable one is left as it is rather than
+    # failing startup
+    await db.natal_charts.update_many(
+        {"created_at": {"$type": "string"}},
+        [{"$set": {"created_at": {"$convert": {"input": "$created_at", "to": "date", "onError": "$created_at"}}}}],
+    )
+
+
+MIGRATIONS = [_natal_chart_dates]
+
+
+async def apply(db) -> bool:
+    ok = True
+    for collection, indexes in INDEXES.items():
+        try:
+            await db[collection].create_indexes(indexes)
+        except OperationFailure as e:
+            # Usually duplicates blocking a unique index; the other
+            # collections still get theirs, and the warm-up stays unready
+            logger.error(f"Could not create indexes on {collection}: {str(e)}")
+            ok = False
+    for migration in MIGRATIONS:
+        await migration(db)
+    return ok
+
+
+async def missing_indexes(db) -> Dict[str, List[str]]:
+    missing = {}
+    for collection, indexes in INDEXES.items():
+        existing = await db[collection].index_information()
+        names = [index.document["name"] for index in indexes if index.document["name"] not in existing]
+        if names:
+            missing[collection] = names
+    return missing
+
+
+CHART_FORMAT_COMMANDS = ("compact-charts", "expand-charts")
+
+
+async def _main(command: str) -> int:
+    from dotenv import load_dotenv
+    from database import create_client
+
+    load_dotenv(Path(__file__).parent / '.env')
+    client = create_client(appname="astrology-db-setup")
+    db = client[os.environ['DB_NAME']]
+    try:
+        if command in CHART_FORMAT_COMMANDS:
+            from chart_storage import migrate_charts
+            counts = await migrate_charts(db.natal_charts, compact=command == "compact-charts")
+            print(f"{counts['migrated']} charts rewritten, {counts['skipped']} skipped")
+            return 0
+        if command == "apply":
+            if not await apply(db):
+                return 1
+        missing = await missing_indexes(db)
+        for collection, names in missing.items():
+            print(f"{collection}: missing {', '.join(names)}")
+        if not missing:
+            print("All indexes present")
+        return 1 if missing else 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2 or sys.argv[1] not in ("apply", "verify", *CHART_FORMAT_COMMANDS):
+        print(__doc__)
+        sys.exit(2)
+    sys.exit(asyncio.run(_main(sys.argv[1])))
@@ -0,0 +1,129 @@
+"""Streaming dumps and bulk loads of whole collections.
+
+Exports walk a Motor cursor and emit one chunk per cursor batch, so the
+API holds a single batch in memory whatever the collection size.
+Imports consume NDJSON as it arrives and write in bulk.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from chart_storage import unpack_chart
+
+EXPORT_BATCH_SIZE = 500
+
+CHART_FIELDS = ["id", "name", "birth_date", "birth_time", "birth_location",
+                "latitude", "longitude", "house_system", "created_at"]
+PLANET_FIELDS = ["planet", "planet_longitude", "planet_latitude", "speed", "sign", "degree", "house"]
+INTERPRETATION_FIELDS = ["id", "category", "key", "title", "content", "created_at", "updated_at"]
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _csv_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def chart_rows(chart: Dict, per_planet: bool = False) -> List[List[Any]]:
+    base = [_csv_value(chart.get(field)) for field in CHART_FIELDS]
+    if not per_planet:
+        return [base]
+    return [
+        base + [p["name"], p["longitude"], p["latitude"], p["speed"], p["sign"], p["degree"], p.get("house")]
+        for p in chart.get("planets", [])
+    ]
+
+
+def interpretation_rows(doc: Dict) -> List[List[Any]]:
+    return [[_csv_value(doc.get(field)) for field in INTERPRETATION_FIELDS]]
+
+
+async def _batches(cursor, batch_size: int, transform: Optional[Callable[[Dict], Dict]]) -> AsyncIterator[List[Dict]]:
+    batch = []
+    async for doc in cursor.batch_size(batch_size):
+        batch.append(transform(doc) if transform else doc)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def stream_ndjson(cursor, batch_size: int = EXPORT_BATCH_SIZE,
+                        transform: Optional[Callable[[Dict], Dict]] = None) -> AsyncIterator[str]:
+    async for batch in _batches(cursor, batch_size, transform):
+        yield "".join(json.dumps(doc, ensure_ascii=False, default=_json_default) + "\n" for doc in batch)
+
+
+async def stream_csv(cursor, header: List[str], rows: Callable[[Dict], Iterable[List[Any]]],
+                     batch_size: int = EXPORT_BATCH_SIZE,
+                     transform: Optional[Callable[[Dict], Dict]] = None) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    async for batch in _batches(cursor, batch_size, transform):
+        for doc in batch:
+            writer.writerows(rows(doc))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_charts(cursor, fmt: str, per_planet: bool = False,
+                  batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator[str]:
+    if fmt == "csv":
+        header = CHART_FIELDS + (PLANET_FIELDS if per_planet else [])
+        return stream_csv(cursor, header, lambda chart: chart_rows(chart, per_planet), batch_size, unpack_chart)
+    return stream_ndjson(cursor, batch_size, unpack_chart)
+
+
+def export_interpretations(cursor, fmt: str, batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator[str]:
+    if fmt == "csv":
+        return stream_csv(cursor, INTERPRETATION_FIELDS, interpretation_rows, batch_size)
+    return stream_ndjson(cursor, batch_size)
+
+
+async def bulk_import(collection, records: AsyncIterator[Tuple[int, Any]],
+                      to_update: Callable[[Any], UpdateOne],
+                      batch_size: int = EXPORT_BATCH_SIZE, max_errors: int = 100) -> Dict[str, Any]:
+    """Writes records with one unordered bulk write per batch.
+
+    ``to_update`` turns a parsed record into an upsert and raises on invalid
+    input; failures are counted and the first ``max_errors`` reported.
+    """
+    summary = {"received": 0, "inserted": 0, "updated": 0, "unchanged": 0, "failed": 0, "errors": []}
+    batch = []
+
+    async def flush():
+        result = await collection.bulk_write(batch, ordered=False)
+        summary["inserted"] += result.upserted_count
+        summary["updated"] += result.modified_count
+        summary["unchanged"] += result.matched_count - result.modified_count
+        batch.clear()
+
+    async for index, record in records:
+        summary["received"] += 1
+        try:
+            if isinstance(record, Exception):
+                raise record
+            batch.append(to_update(record))
+        except Exception as e:
+            summary["failed"] += 1
+            if len(summary["errors"]) < max_errors:
+                summary["errors"].append({"index": index, "error": str(e)})
+            continue
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+    return summary
@@ -0,0 +1,252 @@
+import asyncio
+import bisect
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.casefold().split())
+
+
+def place_key(place: Dict) -> tuple:
+    return (place["display_name"], round(place["lat"], 5), round(place["lon"], 5))
+
+
+class NominatimBackend:
+    """Runs geopy's blocking Nominatim client in a thread, honouring the
+    public instance's one-request-per-second policy."""
+
+    def __init__(self, user_agent: str = "astrology_app", min_interval: float = 1.0):
+        self.user_agent = user_agent
+        self.min_interval = min_interval
+        self._geolocator = None
+        self._lock = asyncio.Lock()
+        self._last_call = 0.0
+
+    @property
+    def geolocator(self):
+        # geopy pulls in requests and its adapters (~90 ms); most lookups are
+        # answered from the query cache without it
+        if self._geolocator is None:
+            from geopy.geocoders import Nominatim
+            self._geolocator = Nominatim(user_agent=self.user_agent)
+        return self._geolocator
+
+    async def geocode(self, query: str, limit: int) -> List[Dict]:
+        async with self._lock:
+            wait = self._last_call + self.min_interval - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                locations = await asyncio.to_thread(
+                    self.geolocator.geocode, query, exactly_one=False, limit=limit
+                )
+            finally:
+                self._last_call = time.monotonic()
+        return [
+            {"display_name": loc.address, "lat": loc.latitude, "lon": loc.longitude}
+            for loc in locations or []
+        ]
+
+
+class StaticGeocoderBackend:
+    """Offline stand-in that matches queries against a fixed list of places."""
+
+    def __init__(self, places: List[Dict]):
+        self.places = places
+        self.calls = 0
+
+    @classmethod
+    def from_file(cls, path: str) -> "StaticGeocoderBackend":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    async def geocode(self, query: str, limit: int) -> List[Dict]:
+        self.calls += 1
+        needle = normalize_query(query)
+        return [p for p in self.places if needle in normalize_query(p["display_name"])][:limit]
+
+
+class PrefixIndex:
+    """Sorted index of place names for typeahead over already-resolved places.
+
+    Each place is indexed under its full name and each comma-separated part,
+    so "Київ" finds "Київ, Україна" and "Україна" finds every Ukrainian place.
+    """
+
+    def __init__(self, max_places: int = 50000):
+        self.max_places = max_places
+        self._keys: List[tuple] = []
+        self._places: "OrderedDict[tuple, Dict]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._places)
+
+    def add(self, place: Dict):
+        ident = place_key(place)
+        if ident in self._places:
+            return
+        if len(self._places) >= self.max_places:
+            self._drop(next(iter(self._places)))
+        self._places[ident] = place
+        for key in self._index_keys(place["display_name"]):
+            bisect.insort(self._keys, (key, ident))
+
+    def search(self, prefix: str, limit: int) -> List[Dict]:
+        results = []
+        seen = set()
+        start = bisect.bisect_left(self._keys, (prefix,))
+        for key, ident in self._keys[start:]:
+            if not key.startswith(prefix) or len(results) >= limit:
+                break
+            if ident not in seen:
+                seen.add(ident)
+                results.append(self._places[ident])
+        return results
+
+    def _drop(self, ident: tuple):
+        place = self._places.pop(ident)
+        for key in self._index_keys(place["display_name"]):
+            i = bisect.bisect_left(self._keys, (key, ident))
+            if i < len(self._keys) and self._keys[i] == (key, ident):
+                del self._keys[i]
+
+    @staticmethod
+    def _index_keys(display_name: str) -> set:
+        name = normalize_query(display_name)
+        return {name, *(part.strip() for part in name.split(",") if part.strip())}
+
+
+class LocationSearchService:
+    """Location search in front of a (slow, rate-limited) geocoder.
+
+    Lookups go: query cache (memory, then MongoDB with TTL when a collection
+    is given) -> geocoder. Identical queries that arrive while a geocoder
+    call is in flight share that call. Short result lists are topped up
+    with known places from the prefix index, which also answers typeahead
+    queries when the geocoder fails. The index never replaces a geocoder
+    answer: "Paris" must not be limited to the Paris found earlier for
+    "Paris, Texas".
+    """
+
+    def __init__(self, backend, collection=None, ttl_seconds: int = 30 * 24 * 3600,
+                 limit: int = 10, max_cached_queries: int = 10000):
+        self.backend = backend
+        self.collection = collection
+        self.ttl_seconds = ttl_seconds
+        self.limit = limit
+        self.max_cached_queries = max_cached_queries
+        self.index = PrefixIndex()
+        self._queries: "OrderedDict[str, List[Dict]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"index_hits": 0, "index_fallbacks": 0, "cache_hits": 0, "geocoder_calls": 0, "coalesced": 0}
+
+    @classmethod
+    def from_env(cls, db) -> "LocationSearchService":
+        if os.environ.get('GEOCODER_BACKEND', 'nominatim') == 'static':
+            backend = StaticGeocoderBackend.from_file(os.environ['GEOCODER_STATIC_FILE'])
+        else:
+            backend = NominatimBackend()
+        return cls(
+            backend,
+            collection=db.location_cache,
+            ttl_seconds=int(os.environ.get('LOCATION_CACHE_TTL_SECONDS', 30 * 24 * 3600)),
+        )
+
+    async def setup(self):
+        if self.collection is not None:
+            await self.collection.create_index("created_at", expireAfterSeconds=self.ttl_seconds)
+
+    async def search(self, query: str) -> List[Dict]:
+        normalized = normalize_query(query)
+        if not normalized:
+            return []
+
+        try:
+            results = await self._lookup(query, normalized)
+        except Exception:
+            indexed = self.index.search(normalized, self.limit)
+            if not indexed:
+                raise
+            self.stats["index_fallbacks"] += 1
+            return indexed
+        return self._topped_up(normalized, results)
+
+    async def _lookup(self, query: str, normalized: str) -> List[Dict]:
+        inflight = self._inflight.get(normalized)
+        if inflight is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(inflight)
+
+        cached = await self._cached(normalized)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            return cached
+
+        inflight = self._inflight.get(normalized)
+        if inflight is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(inflight)
+
+        # Shielded so a disconnecting client does not cancel the call for others
+        task = asyncio.ensure_future(self._geocode(query, normalized))
+        self._inflight[normalized] = task
+        return await asyncio.shield(task)
+
+    def _topped_up(self, normalized: str, results: List[Dict]) -> List[Dict]:
+        if len(results) >= self.limit:
+            return results
+        known = {place_key(place) for place in results}
+        extra = [place for place in self.index.search(normalized, self.limit) if place_key(place) not in known]
+        if not extra:
+            return results
+        self.stats["index_hits"] += 1
+        return results + extra[:self.limit - len(results)]
+
+    async def _cached(self, normalized: str) -> Optional[List[Dict]]:
+        results = self._queries.get(normalized)
+        if results is not None:
+            self._queries.move_to_end(normalized)
+            return results
+        if self.collection is not None:
+            doc = await self.collection.find_one({"_id": normalized}, {"results": 1})
+            if doc is not None:
+                self._remember(normalized, doc["results"])
+                return doc["results"]
+        return None
+
+    async def _geocode(self, query: str, normalized: str) -> List[Dict]:
+        try:
+            self.stats["geocoder_calls"] += 1
+            results = await self.backend.geocode(query, self.limit)
+            self._remember(normalized, results)
+            if self.collection is not None:
+                try:
+                    await self.collection.replace_one(
+                        {"_id": normalized},
+                        {"results": results, "created_at": datetime.now(timezone.utc)},
+                        upsert=True,
+                    )
+                except Exception as e:
+                    logger.warning(f"Could not persist location search: {str(e)}")
+            return results
+        finally:
+            self._inflight.pop(normalized, None)
+
+    def _remember(self, normalized: str, results: List[Dict]):
+        self._queries[normalized] = results
+        self._queries.move_to_end(normalized)
+        while len(self._queries) > self.max_cached_queries:
+            self._queries.popitem(last=False)
+        for place in results:
+            self.index.add(place)
+
+    def metrics(self) -> Dict:
+        return {**self.stats, "cached_queries": len(self._queries), "indexed_places": len(self.index)}
@@ -0,0 +1,31 @@
+"""Validators and headers for responses that never change once created.
+
+Stored charts and everything rendered from them only change through a
+recompute after a calculation version bump, so a key made of the
+resource id, the variant and the versions identifies the response body.
+The ETag is derived from that key alone, but a conditional request is
+only answered with 304 once the resource is known to exist (a cache hit
+or a database read): a deleted chart is a 404 whatever its old ETag.
+"""
+import hashlib
+from typing import Dict, Optional
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def immutable_headers(key: str) -> Dict[str, str]:
+    return {"ETag": f'"{hashlib.sha1(key.encode()).hexdigest()}"', "Cache-Control": IMMUTABLE}
+
+
+def not_modified(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match matching as RFC 9110 asks for GET: weak comparison
+    over a comma-separated list, with ``*`` matching any current
+    representation. Call it only once the representation exists; ``*``
+    must not turn a missing resource into a 304."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
@@ -0,0 +1,149 @@
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Dict, Iterable, List, Optional
+
+from pymongo.errors import PyMongoError
+
+from pagination import as_utc
+
+logger = logging.getLogger(__name__)
+
+
+class InterpretationCatalogue:
+    """In-memory copy of the interpretations collection.
+
+    Indexed by id, category and key. Writes made through this process update
+    it directly; writes from other replicas arrive through a change stream
+    when the deployment supports one (replica set / Atlas), otherwise the
+    catalogue reloads itself once it is older than ``refresh_seconds``.
+    """
+
+    def __init__(self, collection, refresh_seconds: float = 60.0):
+        self.collection = collection
+        self.refresh_seconds = refresh_seconds
+        self._by_id: Dict[str, Dict] = {}
+        self._by_category: Dict[str, Dict[str, Dict]] = {}
+        self._by_key: Dict[str, Dict[str, Dict]] = {}
+        self._object_ids: Dict = {}
+        self._loaded_at: Optional[float] = None
+        self._load_lock = asyncio.Lock()
+        self._etags: Dict[Optional[str], str] = {}
+        self._watch_task: Optional[asyncio.Task] = None
+        self.watching = False
+
+    def _is_stale(self) -> bool:
+        if self._loaded_at is None:
+            return True
+        return not self.watching and time.monotonic() - self._loaded_at > self.refresh_seconds
+
+    async def ensure_loaded(self):
+        if self._is_stale():
+            async with self._load_lock:
+                if self._is_stale():
+                    await self.reload()
+
+    async def reload(self):
+        docs = await self.collection.find({}).to_list(None)
+        self._by_id.clear()
+        self._by_category.clear()
+        self._by_key.clear()
+        self._object_ids.clear()
+        for doc in docs:
+            self._add(doc)
+        self._etags.clear()
+        self._loaded_at = time.monotonic()
+
+    def upsert(self, doc: Dict):
+        existing = self._by_id.get(doc["id"])
+        if existing is not None:
+            self._discard(existing)
+        self._add(doc)
+        self._etags.clear()
+
+    def remove(self, interp_id: str):
+        existing = self._by_id.get(interp_id)
+        if existing is not None:
+            self._discard(existing)
+            self._etags.clear()
+
+    def get(self, interp_id: str) -> Optional[Dict]:
+        return self._by_id.get(interp_id)
+
+    def list(self, category: Optional[str] = None) -> List[Dict]:
+        if category:
+            return list(self._by_category.get(category, {}).values())
+        return list(self._by_id.values())
+
+    def by_keys(self, keys: Iterable[str]) -> Dict[str, List[Dict]]:
+        return {key: list(self._by_key[key].values()) for key in keys if key in self._by_key}
+
+    def etag(self, category: Optional[str] = None) -> str:
+        # Derived from content rather than a local counter so every replica
+        # hands out the same tag for the same data
+        etag = self._etags.get(category)
+        if etag is None:
+            digest = hashlib.sha1()
+            for doc in sorted(self.list(category), key=lambda d: d["id"]):
+                digest.update(f"{doc['id']}|{doc['updated_at'].isoformat()};".encode())
+            etag = self._etags[category] = f'"{digest.hexdigest()}"'
+        return etag
+
+    def start_watching(self):
+        if self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch())
+
+    async def stop_watching(self):
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+        self.watching = False
+
+    async def _watch(self):
+        try:
+            async with self.collection.watch(full_document="updateLookup") as stream:
+                self.watching = True
+                # Anything written between the initial load and now
+                await self.reload()
+                async for change in stream:
+                    self._apply_change(change)
+        except PyMongoError as e:
+            logger.info(f"Interpretation change stream unavailable, falling back to periodic reload: {str(e)}")
+        finally:
+            self.watching = False
+
+    def _apply_change(self, change: Dict):
+        operation = change["operationType"]
+        if operation in ("insert", "update", "replace"):
+            if change.get("fullDocument"):
+                self.upsert(change["fullDocument"])
+        elif operation == "delete":
+            interp_id = self._object_ids.get(change["documentKey"]["_id"])
+            if interp_id:
+                self.remove(interp_id)
+        elif operation in ("drop", "rename", "dropDatabase", "invalidate"):
+            self._loaded_at = None
+
+    def _add(self, doc: Dict):
+        object_id = doc.pop("_id", None)
+        doc["created_at"] = as_utc(doc.get("created_at"))
+        doc["updated_at"] = as_utc(doc.get("updated_at"))
+        if object_id is not None:
+            self._object_ids[object_id] = doc["id"]
+        self._by_id[doc["id"]] = doc
+        self._by_category.setdefault(doc["category"], {})[doc["id"]] = doc
+        self._by_key.setdefault(doc["key"], {})[doc["id"]] = doc
+
+    def _discard(self, doc: Dict):
+        self._by_id.pop(doc["id"], None)
+        for index, field in ((self._by_category, "category"), (self._by_key, "key")):
+            bucket = index.get(doc[field])
+            if bucket is not None:
+                bucket.pop(doc["id"], None)
+                if not bucket:
+                    del index[doc[field]]
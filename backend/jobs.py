@@ -0,0 +1,235 @@
+"""Deferred jobs stored in the ``jobs`` collection.
+
+The API enqueues; worker processes (``python worker.py``) claim jobs one
+at a time with an atomic find_one_and_update and hold a lease that they
+renew while the job runs. A job whose worker dies is picked up again
+once its lease expires. Failures are retried with exponential backoff
+up to ``max_attempts``; ``JobFailed`` marks errors that retrying cannot
+fix.
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from pymongo import ReturnDocument, UpdateOne
+
+from astrology import ANGLES, CALCULATION_VERSION, calculate_aspects
+from chart_storage import chart_projection, outdated_filter, storage_update, unpack_chart
+from transits import date_to_jd, find_transits, scan_windows
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+
+TRANSIT_SCAN_MAX_DAYS = 20 * 366
+
+
+class JobFailed(Exception):
+    """A permanent failure: the job is not retried."""
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class JobQueue:
+    def __init__(self, collection, lease_seconds: float = 60.0, retry_base_seconds: float = 5.0):
+        self.collection = collection
+        self.lease_seconds = lease_seconds
+        self.retry_base_seconds = retry_base_seconds
+
+    async def enqueue(self, job_type: str, params: Dict[str, Any], max_attempts: int = 3) -> Dict:
+        now = _now()
+        job = {
+            "id": str(uuid.uuid4()),
+            "type": job_type,
+            "params": params,
+            "status": QUEUED,
+            "attempts": 0,
+            "max_attempts": max_attempts,
+            "progress": None,
+            "result": None,
+            "error": None,
+            "run_after": now,
+            "locked_until": None,
+            "worker": None,
+            "created_at": now,
+            "updated_at": now,
+            "finished_at": None,
+        }
+        await self.collection.insert_one(dict(job))
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict]:
+        return await self.collection.find_one({"id": job_id}, {"_id": 0})
+
+    async def claim(self, worker: str) -> Optional[Dict]:
+        now = _now()
+        return await self.collection.find_one_and_update(
+            {"$or": [
+                {"status": QUEUED, "run_after": {"$lte": now}},
+                # Lease ran out: the worker holding it is gone
+                {"status": RUNNING, "locked_until": {"$lt": now}},
+            ]},
+            {
+                "$set": {
+                    "status": RUNNING,
+                    "worker": worker,
+                    "locked_until": now + timedelta(seconds=self.lease_seconds),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("run_after", 1)],
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _update_owned(self, job: Dict, update: Dict) -> bool:
+        # Guarded by worker and attempt, so a worker whose lease was taken
+        # over cannot overwrite the new owner's state
+        result = await self.collection.update_one(
+            {"id": job["id"], "worker": job["worker"], "attempts": job["attempts"], "status": RUNNING}, update
+        )
+        return result.modified_count == 1
+
+    async def heartbeat(self, job: Dict, progress: Optional[Dict] = None) -> bool:
+        now = _now()
+        fields = {"locked_until": now + timedelta(seconds=self.lease_seconds), "updated_at": now}
+        if progress is not None:
+            fields["progress"] = progress
+        return await self._update_owned(job, {"$set": fields})
+
+    async def complete(self, job: Dict, result: Any):
+        now = _now()
+        await self._update_owned(job, {"$set": {
+            "status": SUCCEEDED, "result": result, "error": None,
+            "locked_until": None, "updated_at": now, "finished_at": now,
+        }})
+
+    async def fail(self, job: Dict, error: str, permanent: bool = False):
+        now = _now()
+        if permanent or job["attempts"] >= job["max_attempts"]:
+            fields = {"status": FAILED, "finished_at": now}
+        else:
+            delay = self.retry_base_seconds * 2 ** (job["attempts"] - 1)
+            fields = {"status": QUEUED, "run_after": now + timedelta(seconds=delay)}
+        await self._update_owned(job, {"$set": {**fields, "error": error, "locked_until": None, "updated_at": now}})
+
+
+class JobContext:
+    """What a handler gets besides its params: the database, the compute
+    engine and a progress callback that also renews the lease."""
+
+    def __init__(self, queue: JobQueue, job: Dict, db, engine):
+        self.queue = queue
+        self.job = job
+        self.db = db
+        self.engine = engine
+
+    async def progress(self, done: int, total: int):
+        await self.queue.heartbeat(self.job, {"done": done, "total": total})
+
+
+async def recompute_aspects(ctx: JobContext, params: Dict) -> Dict:
+    # After orbs or aspect tables change: rebuild aspects from the stored
+    # positions without touching the ephemeris. Only charts stored under an
+    # older calculation version are touched, so a chart never changes while
+    # its responses are cached as immutable (see chart_storage)
+    query = outdated_filter()
+    if params.get("chart_ids"):
+        query["id"] = {"$in": params["chart_ids"]}
+    batch_size = int(params.get("batch_size", 500))
+    total = await ctx.db.natal_charts.count_documents(query)
+    if not total:
+        raise JobFailed(f"No charts older than calculation version {CALCULATION_VERSION}; "
+                        f"bump CALCULATION_VERSION with the aspect change")
+    done = changed = 0
+    batch = []
+    cursor = ctx.db.natal_charts.find(query, chart_projection("id", "planets", "houses", "aspects"))
+    async for chart in cursor.batch_size(batch_size):
+        unpack_chart(chart)
+        points = [p for p in chart["planets"] if p["name"] not in ANGLES]
+        aspects = calculate_aspects(points)
+        if aspects != chart["aspects"]:
+            fields = {"planets": chart["planets"], "houses": chart["houses"], "aspects": aspects,
+                      "calculation_version": CALCULATION_VERSION}
+            batch.append(UpdateOne({"id": chart["id"]}, storage_update(fields)))
+            changed += 1
+        else:
+            batch.append(UpdateOne({"id": chart["id"]}, {"$set": {"calculation_version": CALCULATION_VERSION}}))
+        done += 1
+        if done % batch_size == 0:
+            await ctx.db.natal_charts.bulk_write(batch, ordered=False)
+            batch = []
+            await ctx.progress(done, total)
+    if batch:
+        await ctx.db.natal_charts.bulk_write(batch, ordered=False)
+    await ctx.progress(done, total)
+    return {"charts": done, "changed": changed}
+
+
+async def transit_scan(ctx: JobContext, params: Dict) -> Dict:
+    try:
+        jd_start, jd_end = date_to_jd(params["from"]), date_to_jd(params["to"])
+        step = float(params.get("step", 1.0))
+    except (KeyError, ValueError) as e:
+        raise JobFailed(f"Invalid parameters: {e}")
+    if not 1 / 24 <= step <= 1.0 or jd_end <= jd_start:
+        raise JobFailed("Invalid range or step")
+    if jd_end - jd_start > TRANSIT_SCAN_MAX_DAYS:
+        # Hits are stored on the job document, which must stay under 16 MB
+        raise JobFailed(f"Range exceeds {TRANSIT_SCAN_MAX_DAYS} days")
+
+    chart = await ctx.db.natal_charts.find_one({"id": params.get("chart_id")}, chart_projection("planets"))
+    if not chart:
+        raise JobFailed("Chart not found")
+    unpack_chart(chart)
+    natal_points = [{"name": p["name"], "longitude": p["longitude"]} for p in chart["planets"]]
+
+    hits = []
+    windows = scan_windows(jd_start, jd_end, step, 120)
+    for done, window in enumerate(windows, start=1):
+        hits.extend(await ctx.engine.run_waiting(find_transits, natal_points, *window, step))
+        await ctx.progress(done, len(windows))
+    return {"count": len(hits), "hits": hits}
+
+
+JOB_HANDLERS: Dict[str, Callable[[JobContext, Dict], Awaitable[Any]]] = {
+    "recompute_aspects": recompute_aspects,
+    "transit_scan": transit_scan,
+}
+
+
+async def run_job(queue: JobQueue, job: Dict, db, engine):
+    handler = JOB_HANDLERS.get(job["type"])
+    if handler is None:
+        await queue.fail(job, f"Unknown job type: {job['type']}", permanent=True)
+        return
+
+    if job["attempts"] > job["max_attempts"]:
+        # Only reachable by reclaiming expired leases: the job keeps taking its worker down
+        await queue.fail(job, job.get("error") or "Worker lost while running the job", permanent=True)
+        return
+
+    ctx = JobContext(queue, job, db, engine)
+
+    async def keep_lease():
+        while True:
+            await asyncio.sleep(queue.lease_seconds / 3)
+            await queue.heartbeat(job)
+
+    lease = asyncio.create_task(keep_lease())
+    try:
+        result = await handler(ctx, job["params"])
+    except JobFailed as e:
+        await queue.fail(job, str(e), permanent=True)
+    except Exception as e:
+        logger.exception(f"Job {job['id']} ({job['type']}) failed")
+        await queue.fail(job, str(e))
+    else:
+        await queue.complete(job, result)
+    finally:
+        lease.cancel()
@@ -0,0 +1,312 @@
+"""Process-local metrics in the Prometheus text exposition format.
+
+Deliberately small: counters, gauges and histograms with fixed label
+names, a registry that renders them, and pull-time collectors for
+components that already keep their own numbers (compute engine, caches).
+
+Spans timed inside compute workers cannot reach this process's registry
+directly; workers buffer them (``buffer_spans``) and the compute engine
+ships them back with each result (``drain_spans`` / ``record_spans``).
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from pymongo import monitoring
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SPAN_BUCKETS = (0.00001, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        # Motor runs pymongo in threads, so observations can come from any of them
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_labels(self.label_names, labels)} {_number(value)}" for labels, value in values
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+        # labels -> (per-bucket counts with a final +Inf slot, sum)
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    @contextmanager
+    def time(self, *labels: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            snapshot = [(labels, list(counts), total[0]) for labels, (counts, total) in self._series.items()]
+        lines = self.header()
+        for labels, counts, total in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[str]]] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[str]]):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+def gauges_from(prefix: str, values: Dict, help: str) -> List[str]:
+    """Renders the numeric values of a component's metrics() dict as gauges."""
+    lines = []
+    for key, value in values.items():
+        if isinstance(value, bool):
+            value = int(value)
+        if isinstance(value, (int, float)):
+            name = f"{prefix}_{key}"
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} gauge", f"{name} {_number(value)}"]
+    return lines
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "http_requests_total", "HTTP requests by route and status code", ("method", "route", "status")))
+HTTP_LATENCY = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "Time to the end of the response body", ("method", "route")))
+HTTP_IN_FLIGHT = REGISTRY.register(Gauge(
+    "http_requests_in_flight", "Requests currently being handled"))
+CHART_SPANS = REGISTRY.register(Histogram(
+    "chart_span_seconds", "Time spent in chart calculation stages", ("span",), buckets=SPAN_BUCKETS))
+MONGO_COMMANDS = REGISTRY.register(Histogram(
+    "mongo_command_duration_seconds", "MongoDB command round trips", ("command", "outcome")))
+MONGO_POOL_MAX = REGISTRY.register(Gauge(
+    "mongo_pool_max_connections", "Configured maximum pool size", ("address",)))
+MONGO_POOL_CONNECTIONS = REGISTRY.register(Gauge(
+    "mongo_pool_connections", "Open pool connections", ("address",)))
+MONGO_POOL_IN_USE = REGISTRY.register(Gauge(
+    "mongo_pool_connections_in_use", "Connections checked out of the pool", ("address",)))
+MONGO_POOL_WAITING = REGISTRY.register(Gauge(
+    "mongo_pool_checkouts_waiting", "Operations waiting for a pool connection", ("address",)))
+MONGO_POOL_CHECKOUT_FAILURES = REGISTRY.register(Counter(
+    "mongo_pool_checkout_failures_total", "Failed connection checkouts by reason", ("address", "reason")))
+
+
+# Chart calculation spans
+
+_span_buffer: Optional[List[Tuple[str, float]]] = None
+
+
+def buffer_spans():
+    # Called in compute workers: keep spans for the engine to ship back
+    global _span_buffer
+    _span_buffer = []
+
+
+def drain_spans() -> List[Tuple[str, float]]:
+    if not _span_buffer:
+        return []
+    spans = list(_span_buffer)
+    _span_buffer.clear()
+    return spans
+
+
+def record_spans(spans: Iterable[Tuple[str, float]]):
+    for name, seconds in spans:
+        CHART_SPANS.observe(seconds, name)
+
+
+@contextmanager
+def span(name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        if _span_buffer is not None:
+            _span_buffer.append((name, elapsed))
+        else:
+            CHART_SPANS.observe(elapsed, name)
+
+
+# Request instrumentation
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: no request/response wrapping, so streaming
+    responses pass through untouched and overhead stays at a few
+    microseconds per request."""
+
+    def __init__(self, app, skip_paths: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.skip_paths = set(skip_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            # The route template, not the raw path, keeps label cardinality bounded
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            HTTP_LATENCY.observe(time.perf_counter() - started, scope["method"], route)
+            HTTP_REQUESTS.inc(scope["method"], route, status)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Times every command the Mongo client sends (pass as event_listeners)."""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        MONGO_COMMANDS.observe(event.duration_micros / 1e6, event.command_name, "ok")
+
+    def failed(self, event):
+        MONGO_COMMANDS.observe(event.duration_micros / 1e6, event.command_name, "error")
+
+
+def _address(event) -> str:
+    host, port = event.address
+    return f"{host}:{port}"
+
+
+class MongoPoolMetrics(monitoring.ConnectionPoolListener):
+    """Pool utilization per server (pass as event_listeners). Checkouts
+    waiting close to the maximum pool size mean the pool is exhausted."""
+
+    def pool_created(self, event):
+        MONGO_POOL_MAX.set(event.options.get("maxPoolSize", 100), _address(event))
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        MONGO_POOL_CONNECTIONS.inc(_address(event))
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        MONGO_POOL_CONNECTIONS.dec(_address(event))
+
+    def connection_check_out_started(self, event):
+        MONGO_POOL_WAITING.inc(_address(event))
+
+    def connection_check_out_failed(self, event):
+        MONGO_POOL_WAITING.dec(_address(event))
+        MONGO_POOL_CHECKOUT_FAILURES.inc(_address(event), str(event.reason))
+
+    def connection_checked_out(self, event):
+        MONGO_POOL_WAITING.dec(_address(event))
+        MONGO_POOL_IN_USE.inc(_address(event))
+
+    def connection_checked_in(self, event):
+        MONGO_POOL_IN_USE.dec(_address(event))
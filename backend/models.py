@@ -0,0 +1,158 @@
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Any, Dict, List, Literal, Optional
+import uuid
+from datetime import datetime, timezone
+
+class AdminLogin(BaseModel):
+    username: str
+    password: str
+
+class AdminCreate(BaseModel):
+    username: str
+    password: str
+
+class LocationSearch(BaseModel):
+    query: str
+
+class LocationResult(BaseModel):
+    display_name: str
+    lat: float
+    lon: float
+
+# Swiss Ephemeris codes: Placidus, Koch, Porphyry, Regiomontanus, Campanus,
+# Alcabitius, Equal, Whole Sign
+HouseSystem = Literal["P", "K", "O", "R", "C", "B", "E", "W"]
+
+class NatalChartCreate(BaseModel):
+    name: str
+    birth_date: str  # YYYY-MM-DD
+    birth_time: str  # HH:MM
+    birth_location: str
+    latitude: float
+    longitude: float
+    house_system: HouseSystem = "P"
+
+class PlanetPosition(BaseModel):
+    name: str
+    longitude: float
+    latitude: float
+    speed: float
+    sign: str
+    degree: float
+    house: Optional[int] = None
+
+class House(BaseModel):
+    number: int
+    cusp: float
+    sign: str
+
+class Aspect(BaseModel):
+    planet1: str
+    planet2: str
+    aspect_type: str
+    angle: float
+    orb: float
+
+class NatalChart(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    name: str
+    birth_date: str
+    birth_time: str
+    birth_location: str
+    latitude: float
+    longitude: float
+    planets: List[PlanetPosition]
+    houses: List[House]
+    aspects: List[Aspect]
+    house_system: HouseSystem = "P"
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class ChartHouses(BaseModel):
+    chart_id: str
+    house_system: HouseSystem
+    houses: List[House]
+    planets: List[PlanetPosition]
+
+class NatalChartSummary(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    name: str
+    birth_date: str
+    birth_time: str
+    birth_location: str
+    latitude: float
+    longitude: float
+    created_at: datetime
+
+class ChartPair(BaseModel):
+    chart_id: str
+    partner_id: str
+
+class SynastryBatch(BaseModel):
+    chart_id: str
+    partner_ids: List[str]
+
+class Synastry(BaseModel):
+    chart_id: str
+    partner_id: str
+    aspects: List[Aspect]
+
+class CompositeChart(BaseModel):
+    chart_ids: List[str]
+    names: List[str]
+    planets: List[PlanetPosition]
+    houses: List[House]
+    aspects: List[Aspect]
+
+class Interpretation(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    category: str  # planet_in_sign, planet_in_house, aspect
+    key: str  # e.g., "sun_in_aries", "moon_in_1st_house", "sun_conjunct_moon"
+    title: str
+    content: str
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class ReadingEntry(BaseModel):
+    category: str
+    key: str
+    subject: str
+    interpretations: List[Interpretation]
+
+class ChartReading(BaseModel):
+    chart_id: str
+    name: str
+    entries: List[ReadingEntry]
+    missing_keys: List[str]
+
+class InterpretationCreate(BaseModel):
+    category: str
+    key: str
+    title: str
+    content: str
+
+class InterpretationUpdate(BaseModel):
+    title: Optional[str] = None
+    content: Optional[str] = None
+
+class JobCreate(BaseModel):
+    type: str
+    params: Dict[str, Any] = Field(default_factory=dict)
+    max_attempts: int = Field(3, ge=1, le=10)
+
+class Job(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    type: str
+    status: str  # queued, running, succeeded, failed
+    params: Dict[str, Any]
+    attempts: int
+    max_attempts: int
+    progress: Optional[Dict[str, int]] = None
+    result: Any = None
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
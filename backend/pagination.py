@@ -0,0 +1,40 @@
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException
+
+
+def encode_cursor(created_at: datetime, chart_id: str) -> str:
+    raw = json.dumps([created_at.isoformat(), chart_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, chart_id = json.loads(base64.urlsafe_b64decode(padded))
+        return as_utc(datetime.fromisoformat(created_at)), chart_id
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_filter(after: Optional[str]) -> Dict[str, Any]:
+    # Matches the (created_at desc, id desc) sort order, so the index on those
+    # two fields serves both the filter and the sort
+    if not after:
+        return {}
+    created_at, chart_id = decode_cursor(after)
+    return {"$or": [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "id": {"$lt": chart_id}},
+    ]}
+
+
+def as_utc(value: Any) -> Any:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime) and value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
@@ -0,0 +1,63 @@
+"""Background warm-up with a readiness report.
+
+The API accepts connections as soon as the lifespan starts. Slow
+preparation runs concurrently in the background: index builds, cache
+setup, spawning the compute workers and loading the timezone polygons.
+GET /ready answers 503 until every step has succeeded once, so a load
+balancer keeps traffic away from a replica that is still warming up.
+A failed step is logged and retried; a replica that cannot reach MongoDB
+therefore stays unready rather than exiting.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PENDING, READY, FAILED = "pending", "ready", "failed"
+
+
+class WarmUp:
+    def __init__(self, retry_seconds: float = 5.0):
+        self.retry_seconds = retry_seconds
+        self._steps: Dict[str, Callable[[], Awaitable[Any]]] = {}
+        self._status: Dict[str, Dict[str, Any]] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._started: Optional[float] = None
+
+    def add(self, name: str, step: Callable[[], Awaitable[Any]]):
+        self._steps[name] = step
+        self._status[name] = {"status": PENDING, "seconds": None, "error": None}
+
+    async def _run(self, name: str, step: Callable[[], Awaitable[Any]]):
+        while True:
+            started = time.perf_counter()
+            try:
+                await step()
+            except Exception as e:
+                self._status[name].update(status=FAILED, error=str(e))
+                logger.warning(f"Warm-up step {name} failed, retrying in {self.retry_seconds:g} s: {str(e)}")
+                await asyncio.sleep(self.retry_seconds)
+                continue
+            self._status[name].update(status=READY, seconds=round(time.perf_counter() - started, 3), error=None)
+            return
+
+    def start(self):
+        if not self._tasks:
+            self._started = time.perf_counter()
+            self._tasks = [asyncio.create_task(self._run(name, step)) for name, step in self._steps.items()]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    @property
+    def ready(self) -> bool:
+        return all(status["status"] == READY for status in self._status.values())
+
+    def report(self) -> Dict[str, Any]:
+        uptime = time.perf_counter() - self._started if self._started is not None else 0.0
+        return {"ready": self.ready, "uptime_seconds": round(uptime, 3), "steps": self._status}
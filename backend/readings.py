@@ -0,0 +1,101 @@
+from typing import Dict, List, Tuple
+
+# Interpretation keys are English slugs ("sun_in_aries", "moon_in_1st_house",
+# "sun_conjunct_moon") while charts store Ukrainian display names
+PLANET_SLUGS = {
+    "Асцендент": "ascendant",
+    "Середина Неба (MC)": "mc",
+    "Сонце": "sun",
+    "Місяць": "moon",
+    "Меркурій": "mercury",
+    "Венера": "venus",
+    "Марс": "mars",
+    "Юпітер": "jupiter",
+    "Сатурн": "saturn",
+    "Уран": "uranus",
+    "Нептун": "neptune",
+    "Плутон": "pluto",
+    "Хірон": "chiron",
+    "Північний вузол": "north_node",
+    "Південний вузол": "south_node",
+    "Ліліт": "lilith",
+}
+
+SIGN_SLUGS = {
+    "Овен": "aries",
+    "Телець": "taurus",
+    "Близнюки": "gemini",
+    "Рак": "cancer",
+    "Лев": "leo",
+    "Діва": "virgo",
+    "Терези": "libra",
+    "Скорпіон": "scorpio",
+    "Стрілець": "sagittarius",
+    "Козеріг": "capricorn",
+    "Водолій": "aquarius",
+    "Риби": "pisces",
+}
+
+ASPECT_SLUGS = {
+    "Кон'юнкція": "conjunct",
+    "Секстиль": "sextile",
+    "Квадрат": "square",
+    "Тригон": "trine",
+    "Опозиція": "opposite",
+}
+
+
+def ordinal(number: int) -> str:
+    if 10 <= number % 100 <= 20:
+        suffix = "th"
+    else:
+        suffix = {1: "st", 2: "nd", 3: "rd"}.get(number % 10, "th")
+    return f"{number}{suffix}"
+
+
+def reading_keys(chart: Dict) -> List[Tuple[str, str, List[str]]]:
+    """Lists (category, subject, candidate keys) for everything in a chart.
+
+    Aspect keys are symmetric, so both planet orders are candidates.
+    """
+    entries = []
+    for planet in chart.get("planets", []):
+        slug = PLANET_SLUGS.get(planet["name"])
+        if slug is None:
+            continue
+        sign = SIGN_SLUGS.get(planet["sign"])
+        if sign:
+            entries.append(("planet_in_sign", f"{planet['name']} — {planet['sign']}", [f"{slug}_in_{sign}"]))
+        if planet.get("house"):
+            entries.append((
+                "planet_in_house", f"{planet['name']} — {planet['house']} дім",
+                [f"{slug}_in_{ordinal(planet['house'])}_house"],
+            ))
+
+    for aspect in chart.get("aspects", []):
+        first = PLANET_SLUGS.get(aspect["planet1"])
+        second = PLANET_SLUGS.get(aspect["planet2"])
+        kind = ASPECT_SLUGS.get(aspect["aspect_type"])
+        if first and second and kind:
+            entries.append((
+                "aspect", f"{aspect['planet1']} — {aspect['aspect_type']} — {aspect['planet2']}",
+                [f"{first}_{kind}_{second}", f"{second}_{kind}_{first}"],
+            ))
+    return entries
+
+
+def assemble_reading(chart: Dict, interpretations_by_key: Dict[str, List[Dict]]) -> Dict:
+    entries = []
+    missing = []
+    for category, subject, keys in reading_keys(chart):
+        found = [
+            interp
+            for key in keys
+            for interp in interpretations_by_key.get(key, [])
+            if interp["category"] == category
+        ]
+        if found:
+            entries.append({"category": category, "key": keys[0], "subject": subject, "interpretations": found})
+        else:
+            missing.append(keys[0])
+    return {"chart_id": chart["id"], "name": chart["name"], "entries": entries, "missing_keys": missing}
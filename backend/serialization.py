@@ -0,0 +1,67 @@
+"""Direct JSON encoding of stored documents for read endpoints.
+
+Charts and interpretations are validated by their pydantic models once,
+when they are written. Reading them back through ``response_model`` would
+validate and serialize every nested planet, house and aspect again on
+each request; for a page of 100 full charts that is most of the request
+time. Read endpoints instead pass stored documents through ``shape``,
+which puts the model's fields in order and fills defaults for documents
+written before a field existed, and encode the result with orjson.
+
+The output matches what FastAPI would produce for the same model
+(tests/test_serialization.py checks it against the models), but no
+validation happens here: documents that did not come through the models
+must not be sent down this path.
+"""
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type, get_args, get_origin
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+
+from pagination import as_utc
+
+# UTC datetimes end in "Z", as pydantic writes them
+OPTIONS = orjson.OPT_UTC_Z
+
+
+@lru_cache(maxsize=None)
+def field_plan(model: Type[BaseModel]) -> Tuple[Tuple[str, Any, Optional[Type[BaseModel]], bool], ...]:
+    """(name, default, nested item model, is datetime) per field of ``model``.
+
+    Default factories (new ids, creation times) are not applied: a stored
+    document always has those fields.
+    """
+    plan = []
+    for name, field in model.model_fields.items():
+        default = None if field.is_required() or field.default_factory else field.default
+        nested = None
+        if get_origin(field.annotation) in (list, List):
+            (item,) = get_args(field.annotation)
+            if isinstance(item, type) and issubclass(item, BaseModel):
+                nested = item
+        plan.append((name, default, nested, field.annotation is datetime))
+    return tuple(plan)
+
+
+def shape(doc: Dict[str, Any], model: Type[BaseModel]) -> Dict[str, Any]:
+    """The fields of ``model`` from ``doc``, in model order, ready to encode."""
+    out = {}
+    for name, default, nested, is_datetime in field_plan(model):
+        value = doc.get(name, default)
+        if nested is not None and value is not None:
+            value = [shape(item, nested) for item in value]
+        elif is_datetime:
+            value = as_utc(value)
+        out[name] = value
+    return out
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, option=OPTIONS)
+
+
+def json_response(content: Any, headers: Optional[Dict[str, str]] = None, status_code: int = 200) -> Response:
+    return Response(dumps(content), status_code=status_code, media_type="application/json", headers=headers)
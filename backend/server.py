@@ -1,321 +1,142 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument, UpdateOne
 import os
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional, Dict, Any
-import uuid
+from typing import List, Optional, Dict, Any, Literal, Union
 from datetime import datetime, timezone
-import swisseph as swe
-from timezonefinder import TimezoneFinder
-from geopy.geocoders import Nominatim
-import pytz
-import math
 import jwt
-from passlib.context import CryptContext
+
+from models import (
+    AdminLogin, AdminCreate, LocationSearch, LocationResult, NatalChartCreate,
+    NatalChart, NatalChartSummary, Interpretation, InterpretationCreate, InterpretationUpdate,
+    ChartReading, ChartPair, SynastryBatch, Synastry, CompositeChart, ChartHouses, HouseSystem,
+    JobCreate, Job,
+)
+from astrology import (
+    timezone_resolver, birth_julian_day, calculate_chart_data, calculate_charts_data,
+    calculate_houses, assign_houses,
+    DEFAULT_HOUSE_SYSTEM, CALCULATION_VERSION,
+)
+from chart_cache import ChartCache, PairCache, chart_cache_key, pair_cache_key
+from geocoding import LocationSearchService
+from pagination import encode_cursor, keyset_filter
+import db_setup
+from interpretations import InterpretationCatalogue
+from readings import reading_keys, assemble_reading
+from transits import find_transits, scan_windows, date_to_jd
+from synastry import PAIR_PROJECTION, synastry_aspects, composite_chart
+from chart_storage import LEGACY_CALCULATION_VERSION, chart_projection, is_current, to_storage, unpack_chart
+from byte_cache import ByteCache
+from http_caching import immutable_headers, not_modified
+from serialization import dumps, json_response, shape
+from wheel import WHEEL_VERSION, render_wheel_svg, render_wheel_png
+from auth import (
+    PrincipalCache, hash_password, verify_password, create_access_token, decode_access_token, pwd_context,
+)
+from compute_engine import ChartComputeEngine, EngineOverloaded, WorkerCrashed
+from batch_import import NDJSON_MEDIA_TYPE, read_records, iter_groups, stream_ndjson_records
+from exports import export_charts, export_interpretations, bulk_import
+from jobs import JOB_HANDLERS, JobQueue
+from metrics import REGISTRY, CONTENT_TYPE, MetricsMiddleware, gauges_from
+from database import create_client, list_reads, chart_write_concern
+from readiness import WarmUp
+from pydantic import ValidationError
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = create_client(mongo_url, appname="astrology-api")
 db = client[os.environ['DB_NAME']]
+# List and export reads may be served by secondaries (MONGO_LIST_READ_PREFERENCE)
+list_db = list_reads(client, os.environ['DB_NAME'])
+# Chart inserts use their own write concern (MONGO_CHART_WRITE_CONCERN)
+chart_writes = db.get_collection("natal_charts", write_concern=chart_write_concern())
 
 # Security
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 SECRET_KEY = os.environ.get('JWT_SECRET', 'astrology-secret-key-change-in-production')
-
-# Set Swiss Ephemeris path - using default ephemeris
-# swe.set_ephe_path('/app/backend/ephe')
+admin_principals = PrincipalCache(ttl_seconds=float(os.environ.get('AUTH_CACHE_TTL_SECONDS', 60)))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Serve right away; slow preparation runs in the background (see /ready)
+    chart_engine.start()
+    warm_up.start()
+    interpretation_catalogue.start_watching()
+    try:
+        yield
+    finally:
+        await warm_up.stop()
+        await interpretation_catalogue.stop_watching()
+        client.close()
+        chart_engine.shutdown()
 
 # Create the main app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 api_router = APIRouter(prefix="/api")
 
-tf = TimezoneFinder()
-geolocator = Nominatim(user_agent="astrology_app")
-
-# Models
-class AdminLogin(BaseModel):
-    username: str
-    password: str
-
-class AdminCreate(BaseModel):
-    username: str
-    password: str
-
-class LocationSearch(BaseModel):
-    query: str
-
-class LocationResult(BaseModel):
-    display_name: str
-    lat: float
-    lon: float
-
-class NatalChartCreate(BaseModel):
-    name: str
-    birth_date: str  # YYYY-MM-DD
-    birth_time: str  # HH:MM
-    birth_location: str
-    latitude: float
-    longitude: float
-
-class PlanetPosition(BaseModel):
-    name: str
-    longitude: float
-    latitude: float
-    speed: float
-    sign: str
-    degree: float
-    house: Optional[int] = None
-
-class House(BaseModel):
-    number: int
-    cusp: float
-    sign: str
-
-class Aspect(BaseModel):
-    planet1: str
-    planet2: str
-    aspect_type: str
-    angle: float
-    orb: float
-
-class NatalChart(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    name: str
-    birth_date: str
-    birth_time: str
-    birth_location: str
-    latitude: float
-    longitude: float
-    planets: List[PlanetPosition]
-    houses: List[House]
-    aspects: List[Aspect]
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-
-class Interpretation(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    category: str  # planet_in_sign, planet_in_house, aspect
-    key: str  # e.g., "sun_in_aries", "moon_in_1st_house", "sun_conjunct_moon"
-    title: str
-    content: str
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-
-class InterpretationCreate(BaseModel):
-    category: str
-    key: str
-    title: str
-    content: str
-
-class InterpretationUpdate(BaseModel):
-    title: Optional[str] = None
-    content: Optional[str] = None
-
-# Helper functions
-def get_zodiac_sign(longitude: float) -> str:
-    signs = ["Овен", "Телець", "Близнюки", "Рак", "Лев", "Діва", 
-             "Терези", "Скорпіон", "Стрілець", "Козеріг", "Водолій", "Риби"]
-    sign_index = int(longitude / 30)
-    return signs[sign_index]
-
-def get_degree_in_sign(longitude: float) -> float:
-    return longitude % 30
-
-def calculate_aspects(planets: List[Dict]) -> List[Aspect]:
-    aspects = []
-    aspect_types = {
-        0: ("Кон'юнкція", 8),
-        60: ("Секстиль", 6),
-        90: ("Квадрат", 8),
-        120: ("Тригон", 8),
-        180: ("Опозиція", 8)
-    }
-    
-    for i in range(len(planets)):
-        for j in range(i + 1, len(planets)):
-            p1 = planets[i]
-            p2 = planets[j]
-            angle = abs(p1['longitude'] - p2['longitude'])
-            if angle > 180:
-                angle = 360 - angle
-            
-            for asp_angle, (asp_name, orb) in aspect_types.items():
-                diff = abs(angle - asp_angle)
-                if diff <= orb:
-                    aspects.append(Aspect(
-                        planet1=p1['name'],
-                        planet2=p2['name'],
-                        aspect_type=asp_name,
-                        angle=angle,
-                        orb=diff
-                    ))
-                    break
-    
-    return aspects
+# Chart calculations run in worker processes (see compute_engine.py);
+# set EPHE_PATH to point Swiss Ephemeris at its data files
+chart_engine = ChartComputeEngine.from_env()
+chart_cache = ChartCache.from_env(db)
+BATCH_MAX_RECORDS = int(os.environ.get('BATCH_MAX_RECORDS', 10000))
+BATCH_GROUP_SIZE = int(os.environ.get('BATCH_GROUP_SIZE', 50))
+TRANSIT_MAX_SAMPLES = int(os.environ.get('TRANSIT_MAX_SAMPLES', 100000))
+TRANSIT_WINDOW_SAMPLES = 120
+pair_cache = PairCache.from_env(db)
+SYNASTRY_MAX_PARTNERS = int(os.environ.get('SYNASTRY_MAX_PARTNERS', 500))
+wheel_cache = ByteCache(max_bytes=int(os.environ.get('WHEEL_CACHE_BYTES', 64 * 1024 * 1024)))
+WHEEL_MEDIA_TYPES = {"svg": "image/svg+xml", "png": "image/png"}
+# Serialized GET /natal-charts/{id} bodies; charts are immutable once stored
+chart_response_cache = ByteCache(max_bytes=int(os.environ.get('CHART_RESPONSE_CACHE_BYTES', 32 * 1024 * 1024)))
+EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 500))
+EXPORT_MEDIA_TYPES = {"ndjson": NDJSON_MEDIA_TYPE, "csv": "text/csv; charset=utf-8"}
+# Deferred work runs in worker.py processes; the API only enqueues and reports
+job_queue = JobQueue(db.jobs, lease_seconds=float(os.environ.get('JOB_LEASE_SECONDS', 60)))
+location_search = LocationSearchService.from_env(db)
+interpretation_catalogue = InterpretationCatalogue(
+    db.interpretations, refresh_seconds=float(os.environ.get('INTERPRETATIONS_REFRESH_SECONDS', 60))
+)
 
-def calculate_natal_chart(birth_date: str, birth_time: str, latitude: float, longitude: float) -> Dict:
-    # Parse date and time
-    dt_str = f"{birth_date} {birth_time}"
-    dt = datetime.strptime(dt_str, "%Y-%m-%d %H:%M")
-    
-    # Get timezone
-    tz_name = tf.timezone_at(lat=latitude, lng=longitude)
-    if tz_name:
-        tz = pytz.timezone(tz_name)
-        local_dt = tz.localize(dt)
-        utc_dt = local_dt.astimezone(pytz.UTC)
-    else:
-        utc_dt = dt.replace(tzinfo=pytz.UTC)
-    
-    # Convert to Julian Day
-    jd = swe.julday(utc_dt.year, utc_dt.month, utc_dt.day, 
-                    utc_dt.hour + utc_dt.minute/60.0 + utc_dt.second/3600.0)
-    
-    # Calculate planets
-    planet_data = [
-        (swe.SUN, "Сонце"),
-        (swe.MOON, "Місяць"),
-        (swe.MERCURY, "Меркурій"),
-        (swe.VENUS, "Венера"),
-        (swe.MARS, "Марс"),
-        (swe.JUPITER, "Юпітер"),
-        (swe.SATURN, "Сатурн"),
-        (swe.URANUS, "Уран"),
-        (swe.NEPTUNE, "Нептун"),
-        (swe.PLUTO, "Плутон"),
-        (swe.CHIRON, "Хірон"),
-        (swe.MEAN_NODE, "Північний вузол"),
-    ]
-    
-    planets = []
-    planet_longs = []
-    
-    for planet_id, planet_name in planet_data:
-        result = swe.calc_ut(jd, planet_id)
-        lon, lat, dist, speed_lon, speed_lat, speed_dist = result[0]
-        
-        planet_info = {
-            'name': planet_name,
-            'longitude': lon,
-            'latitude': lat,
-            'speed': speed_lon,
-            'sign': get_zodiac_sign(lon),
-            'degree': get_degree_in_sign(lon)
-        }
-        planets.append(planet_info)
-        planet_longs.append(lon)
-    
-    # Add South Node (opposite of North Node)
-    north_node_lon = planet_longs[-1]
-    south_node_lon = (north_node_lon + 180) % 360
-    planets.append({
-        'name': "Південний вузол",
-        'longitude': south_node_lon,
-        'latitude': 0,
-        'speed': 0,
-        'sign': get_zodiac_sign(south_node_lon),
-        'degree': get_degree_in_sign(south_node_lon)
-    })
-    planet_longs.append(south_node_lon)
-    
-    # Calculate Lilith (Mean Apogee)
-    result = swe.calc_ut(jd, swe.MEAN_APOG)
-    lon, lat, dist, speed_lon, speed_lat, speed_dist = result[0]
-    planets.append({
-        'name': "Ліліт",
-        'longitude': lon,
-        'latitude': lat,
-        'speed': speed_lon,
-        'sign': get_zodiac_sign(lon),
-        'degree': get_degree_in_sign(lon)
-    })
-    planet_longs.append(lon)
-    
-    # Calculate houses (Placidus system)
-    houses_data = swe.houses(jd, latitude, longitude, b'P')
-    house_cusps = houses_data[0]
-    ascmc = houses_data[1]
-    
-    # Add Ascendant
-    asc_lon = ascmc[0]
-    planets.insert(0, {
-        'name': "Асцендент",
-        'longitude': asc_lon,
-        'latitude': 0,
-        'speed': 0,
-        'sign': get_zodiac_sign(asc_lon),
-        'degree': get_degree_in_sign(asc_lon)
-    })
-    
-    # Add MC (Midheaven)
-    mc_lon = ascmc[1]
-    planets.insert(1, {
-        'name': "Середина Неба (MC)",
-        'longitude': mc_lon,
-        'latitude': 0,
-        'speed': 0,
-        'sign': get_zodiac_sign(mc_lon),
-        'degree': get_degree_in_sign(mc_lon)
-    })
-    
-    # Process houses
-    houses = []
-    for i in range(12):
-        cusp = house_cusps[i]
-        houses.append(House(
-            number=i + 1,
-            cusp=cusp,
-            sign=get_zodiac_sign(cusp)
-        ))
-    
-    # Assign planets to houses
-    for planet in planets:
-        if planet['name'] not in ["Асцендент", "Середина Неба (MC)"]:
-            planet_lon = planet['longitude']
-            for i in range(12):
-                next_i = (i + 1) % 12
-                cusp_current = house_cusps[i]
-                cusp_next = house_cusps[next_i] if next_i != 0 else house_cusps[0] + 360
-                
-                if cusp_next < cusp_current:
-                    cusp_next += 360
-                
-                planet_lon_adjusted = planet_lon if planet_lon >= cusp_current else planet_lon + 360
-                
-                if cusp_current <= planet_lon_adjusted < cusp_next:
-                    planet['house'] = i + 1
-                    break
-    
-    # Calculate aspects (excluding Ascendant and MC from aspects)
-    planets_for_aspects = [p for p in planets if p['name'] not in ["Асцендент", "Середина Неба (MC)"]]
-    aspects = calculate_aspects(planets_for_aspects)
-    
-    return {
-        'planets': [PlanetPosition(**p) for p in planets],
-        'houses': houses,
-        'aspects': aspects
-    }
+async def apply_indexes():
+    # Raising keeps the step failed, and /ready at 503, until the index
+    # builds (usually a duplicate blocking a unique index is removed)
+    if not await db_setup.apply(db):
+        raise RuntimeError("Index creation failed; run `python db_setup.py verify` for the missing indexes")
+
+warm_up = WarmUp(retry_seconds=float(os.environ.get('WARM_UP_RETRY_SECONDS', 5)))
+warm_up.add("indexes", apply_indexes)
+warm_up.add("chart_cache", chart_cache.setup)
+warm_up.add("pair_cache", pair_cache.setup)
+warm_up.add("location_search", location_search.setup)
+warm_up.add("interpretations", interpretation_catalogue.ensure_loaded)
+warm_up.add("chart_engine", chart_engine.warm_up)
+# Chart creation resolves timezones in this process before handing off to the engine
+warm_up.add("timezones", lambda: asyncio.to_thread(lambda: timezone_resolver.finder))
+warm_up.add("password_hashing", lambda: asyncio.to_thread(pwd_context))
 
 async def verify_admin_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
     try:
         token = credentials.credentials
-        payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
+        payload = decode_access_token(token, SECRET_KEY)
         username = payload.get("sub")
         if username is None:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-        admin = await db.admins.find_one({"username": username})
+        if admin_principals.contains(username):
+            return username
+        admin = await db.admins.find_one({"username": username}, {"_id": 1})
         if not admin:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Admin not found")
+        admin_principals.add(username)
         return username
     except jwt.PyJWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
@@ -329,95 +150,403 @@ async def root():
 @api_router.post("/locations/search")
 async def search_locations(location: LocationSearch):
     try:
-        locations = geolocator.geocode(location.query, exactly_one=False, limit=10)
-        if not locations:
-            return []
-        
-        results = []
-        for loc in locations:
-            results.append(LocationResult(
-                display_name=loc.address,
-                lat=loc.latitude,
-                lon=loc.longitude
-            ))
-        return results
+        locations = await location_search.search(location.query)
+        return [LocationResult(**loc) for loc in locations]
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 # Natal Charts
+def build_natal_chart(chart_data: NatalChartCreate, chart_calc: Dict) -> NatalChart:
+    return NatalChart(
+        name=chart_data.name,
+        birth_date=chart_data.birth_date,
+        birth_time=chart_data.birth_time,
+        birth_location=chart_data.birth_location,
+        latitude=chart_data.latitude,
+        longitude=chart_data.longitude,
+        planets=chart_calc['planets'],
+        houses=chart_calc['houses'],
+        aspects=chart_calc['aspects'],
+        house_system=chart_data.house_system
+    )
+
+def natal_chart_to_doc(doc: Dict[str, Any], calculation_version: str = CALCULATION_VERSION) -> Dict[str, Any]:
+    # created_at is stored as a BSON date so list queries sort on the index;
+    # positions are packed unless CHART_STORAGE_FORMAT=full (chart_storage.py)
+    return to_storage({**doc, "calculation_version": calculation_version})
+
 @api_router.post("/natal-charts", response_model=NatalChart)
 async def create_natal_chart(chart_data: NatalChartCreate):
     try:
-        # Calculate chart
-        chart_calc = calculate_natal_chart(
-            chart_data.birth_date,
-            chart_data.birth_time,
-            chart_data.latitude,
-            chart_data.longitude
-        )
+        # Calculate chart, reusing earlier results for the same birth data;
+        # the timezone lookup runs in a thread to keep it off the event loop
+        jd = await asyncio.to_thread(birth_julian_day, chart_data.birth_date, chart_data.birth_time,
+                                     chart_data.latitude, chart_data.longitude)
+        cache_key = chart_cache_key(jd, chart_data.latitude, chart_data.longitude, chart_data.house_system)
+        chart_calc = await chart_cache.get(cache_key)
+        if chart_calc is None:
+            chart_calc = await chart_engine.run(calculate_chart_data, jd, chart_data.latitude,
+                                                chart_data.longitude, chart_data.house_system)
+            await chart_cache.put(cache_key, chart_calc)
         
         # Create chart object
-        chart = NatalChart(
-            name=chart_data.name,
-            birth_date=chart_data.birth_date,
-            birth_time=chart_data.birth_time,
-            birth_location=chart_data.birth_location,
-            latitude=chart_data.latitude,
-            longitude=chart_data.longitude,
-            planets=chart_calc['planets'],
-            houses=chart_calc['houses'],
-            aspects=chart_calc['aspects']
-        )
+        chart = build_natal_chart(chart_data, chart_calc)
         
-        # Save to database
+        # Dumped once: the stored document and the response body share it
         doc = chart.model_dump()
-        doc['created_at'] = doc['created_at'].isoformat()
-        doc['planets'] = [p.model_dump() for p in chart.planets]
-        doc['houses'] = [h.model_dump() for h in chart.houses]
-        doc['aspects'] = [a.model_dump() for a in chart.aspects]
-        
-        await db.natal_charts.insert_one(doc)
-        return chart
+        await chart_writes.insert_one(natal_chart_to_doc(doc))
+        return json_response(doc)
+    except EngineOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         logging.error(f"Error creating natal chart: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
 
-@api_router.get("/natal-charts", response_model=List[NatalChart])
-async def get_natal_charts():
-    charts = await db.natal_charts.find({}, {"_id": 0}).sort("created_at", -1).to_list(100)
-    
-    for chart in charts:
-        if isinstance(chart.get('created_at'), str):
-            chart['created_at'] = datetime.fromisoformat(chart['created_at'])
-    
-    return charts
+async def _compute_batch_group(group: List[tuple]) -> List[Dict[str, Any]]:
+    results = {}
+    valid = []
+    for index, raw in group:
+        if isinstance(raw, Exception):
+            results[index] = {"index": index, "status": "error", "error": str(raw)}
+            continue
+        try:
+            valid.append((index, NatalChartCreate.model_validate(raw)))
+        except ValidationError as e:
+            results[index] = {"index": index, "status": "error", "error": str(e)}
+
+    computed = {}
+    misses = []
+    for index, chart_data in valid:
+        try:
+            jd = await asyncio.to_thread(birth_julian_day, chart_data.birth_date, chart_data.birth_time,
+                                         chart_data.latitude, chart_data.longitude)
+        except Exception as e:
+            results[index] = {"index": index, "status": "error", "error": str(e)}
+            continue
+        key = chart_cache_key(jd, chart_data.latitude, chart_data.longitude, chart_data.house_system)
+        cached = await chart_cache.get(key)
+        if cached is not None:
+            computed[index] = cached
+        else:
+            misses.append((index, key, (jd, chart_data.latitude, chart_data.longitude, chart_data.house_system)))
+
+    if misses:
+        # Bulk imports wait for capacity instead of failing like single requests
+        try:
+            outcomes = await chart_engine.run_waiting(calculate_charts_data, [record for _, _, record in misses])
+        except WorkerCrashed as e:
+            outcomes = [(False, str(e))] * len(misses)
+
+        for (index, key, _), (ok, outcome) in zip(misses, outcomes):
+            if ok:
+                computed[index] = outcome
+                await chart_cache.put(key, outcome)
+            else:
+                results[index] = {"index": index, "status": "error", "error": outcome}
+
+    if computed:
+        charts = [(index, build_natal_chart(chart_data, computed[index]).model_dump())
+                  for index, chart_data in valid if index in computed]
+        try:
+            await chart_writes.insert_many(
+                [natal_chart_to_doc(doc) for _, doc in charts], ordered=False
+            )
+            for index, doc in charts:
+                results[index] = {"index": index, "status": "ok", "chart": doc}
+        except Exception as e:
+            logging.error(f"Error saving natal chart batch: {str(e)}")
+            for index, _ in charts:
+                results[index] = {"index": index, "status": "error", "error": str(e)}
+
+    return [results[index] for index, _ in group]
+
+@api_router.post("/natal-charts/batch")
+async def create_natal_charts_batch(request: Request):
+    records = await read_records(request, BATCH_MAX_RECORDS)
+
+    async def stream_results():
+        # Keep one group per worker in flight and emit results in input order
+        window = []
+        try:
+            async for group in iter_groups(records, BATCH_GROUP_SIZE):
+                window.append(asyncio.create_task(_compute_batch_group(group)))
+                if len(window) >= chart_engine.max_workers:
+                    for result in await window.pop(0):
+                        yield dumps(result) + b"\n"
+            while window:
+                for result in await window.pop(0):
+                    yield dumps(result) + b"\n"
+        finally:
+            for task in window:
+                task.cancel()
+
+    return StreamingResponse(stream_results(), media_type=NDJSON_MEDIA_TYPE)
+
+@api_router.get("/engine/metrics")
+async def get_chart_engine_metrics():
+    return chart_engine.metrics()
+
+@api_router.get("/engine/cache/metrics")
+async def get_chart_cache_metrics():
+    return chart_cache.metrics()
+
+@api_router.get("/engine/pair-cache/metrics")
+async def get_pair_cache_metrics():
+    return pair_cache.metrics()
+
+@api_router.get("/engine/wheel-cache/metrics")
+async def get_wheel_cache_metrics():
+    return wheel_cache.metrics()
+
+@api_router.get("/engine/chart-response-cache/metrics")
+async def get_chart_response_cache_metrics():
+    return chart_response_cache.metrics()
+
+NATAL_CHART_SUMMARY_PROJECTION = {
+    "_id": 0, "id": 1, "name": 1, "birth_date": 1, "birth_time": 1,
+    "birth_location": 1, "latitude": 1, "longitude": 1, "created_at": 1,
+}
+
+@api_router.get("/natal-charts", response_model=List[Union[NatalChart, NatalChartSummary]])
+async def get_natal_charts(
+    limit: int = Query(100, ge=1, le=500),
+    after: Optional[str] = None,
+    view: Literal["full", "summary"] = "full",
+):
+    projection = NATAL_CHART_SUMMARY_PROJECTION if view == "summary" else {"_id": 0}
+    charts = await list_db.natal_charts.find(keyset_filter(after), projection) \
+        .sort([("created_at", -1), ("id", -1)]).limit(limit).to_list(limit)
+    
+    model = NatalChartSummary if view == "summary" else NatalChart
+    charts = [shape(unpack_chart(chart), model) for chart in charts]
+    
+    # Keyset pagination: pass X-Next-Cursor back as ?after= for the next page
+    headers = {}
+    if len(charts) == limit:
+        headers["X-Next-Cursor"] = encode_cursor(charts[-1]['created_at'], charts[-1]['id'])
+    
+    return json_response(charts, headers=headers)
 
 @api_router.get("/natal-charts/{chart_id}", response_model=NatalChart)
-async def get_natal_chart(chart_id: str):
-    chart = await db.natal_charts.find_one({"id": chart_id}, {"_id": 0})
+async def get_natal_chart(request: Request, chart_id: str):
+    key = f"{chart_id}|json|{CALCULATION_VERSION}"
+    headers = immutable_headers(key)
+    
+    body = chart_response_cache.get(key)
+    if body is None:
+        chart = await db.natal_charts.find_one({"id": chart_id}, {"_id": 0})
+        if not chart:
+            raise HTTPException(status_code=404, detail="Chart not found")
+        # Serialized once; hits skip Mongo and the encoder entirely
+        body = dumps(shape(unpack_chart(chart), NatalChart))
+        if not is_current(chart):
+            # Due for a recompute under this calculation version: the body
+            # will change, so it must not be cached under this version's ETag
+            return Response(body, media_type="application/json", headers={"Cache-Control": "no-cache"})
+        chart_response_cache.put(key, body)
+    
+    # Only now is the chart known to exist: a deleted one is a 404, not a 304
+    if not_modified(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+@api_router.get("/natal-charts/{chart_id}/reading", response_model=ChartReading)
+async def get_natal_chart_reading(chart_id: str):
+    chart = await db.natal_charts.find_one({"id": chart_id}, chart_projection("id", "name", "planets", "aspects"))
+    if not chart:
+        raise HTTPException(status_code=404, detail="Chart not found")
+    unpack_chart(chart)
+    
+    # One lookup for every key the chart needs, served from the catalogue
+    await interpretation_catalogue.ensure_loaded()
+    keys = {key for _, _, candidates in reading_keys(chart) for key in candidates}
+    return assemble_reading(chart, interpretation_catalogue.by_keys(keys))
+
+@api_router.get("/natal-charts/{chart_id}/houses", response_model=ChartHouses)
+async def get_natal_chart_houses(chart_id: str, system: HouseSystem = DEFAULT_HOUSE_SYSTEM):
+    chart = await db.natal_charts.find_one(
+        {"id": chart_id}, chart_projection("birth_date", "birth_time", "latitude", "longitude", "planets")
+    )
     if not chart:
         raise HTTPException(status_code=404, detail="Chart not found")
+    unpack_chart(chart)
+    
+    # Planets are reused as stored; cusps are only sidereal-time arithmetic,
+    # cheap enough to skip the compute engine
+    try:
+        jd = await asyncio.to_thread(birth_julian_day, chart["birth_date"], chart["birth_time"],
+                                     chart["latitude"], chart["longitude"])
+        houses, _ = calculate_houses(jd, chart["latitude"], chart["longitude"], system)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    planets = chart["planets"]
+    assign_houses(planets, [h.cusp for h in houses])
+    
+    return {"chart_id": chart_id, "house_system": system, "houses": houses, "planets": planets}
+
+@api_router.get("/natal-charts/{chart_id}/wheel.{fmt}")
+async def get_natal_chart_wheel(
+    request: Request,
+    chart_id: str,
+    fmt: Literal["svg", "png"],
+    size: int = Query(600, ge=100, le=2000),
+    aspects: bool = True,
+):
+    # Chart id + options + versions identify the image (see http_caching)
+    key = f"{chart_id}|{fmt}|{size}|{int(aspects)}|{WHEEL_VERSION}|{CALCULATION_VERSION}"
+    headers = immutable_headers(key)
+    matches = not_modified(request.headers.get("if-none-match"), headers["ETag"])
+    
+    body = wheel_cache.get(key)
+    if body is None:
+        chart = await db.natal_charts.find_one(
+            {"id": chart_id}, chart_projection("planets", "houses", "aspects", "calculation_version")
+        )
+        if not chart:
+            raise HTTPException(status_code=404, detail="Chart not found")
+        unpack_chart(chart)
+        if not is_current(chart):
+            headers = {"Cache-Control": "no-cache"}
+        elif matches:
+            # The chart exists and the client holds this image: skip rendering
+            return Response(status_code=304, headers=headers)
+        if fmt == "svg":
+            body = render_wheel_svg(chart, size, aspects).encode()
+        else:
+            try:
+                body = await chart_engine.run(render_wheel_png, chart, size, aspects)
+            except EngineOverloaded as e:
+                raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+            except (ImportError, OSError) as e:
+                logging.error(f"PNG rendering unavailable: {str(e)}")
+                raise HTTPException(status_code=501, detail="PNG rendering is not available on this server")
+        if is_current(chart):
+            wheel_cache.put(key, body)
+    elif matches:
+        return Response(status_code=304, headers=headers)
+    
+    return Response(body, media_type=WHEEL_MEDIA_TYPES[fmt], headers=headers)
+
+@api_router.get("/natal-charts/{chart_id}/transits")
+async def get_natal_chart_transits(
+    chart_id: str,
+    date_from: str = Query(..., alias="from"),
+    date_to: str = Query(..., alias="to"),
+    step: float = Query(1.0, ge=1 / 24, le=1.0),
+):
+    try:
+        jd_start, jd_end = date_to_jd(date_from), date_to_jd(date_to)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if jd_end <= jd_start:
+        raise HTTPException(status_code=400, detail="'to' must be after 'from'")
+    if (jd_end - jd_start) / step > TRANSIT_MAX_SAMPLES:
+        raise HTTPException(status_code=400, detail=f"Range exceeds {TRANSIT_MAX_SAMPLES} samples; use a larger step")
+    
+    chart = await db.natal_charts.find_one({"id": chart_id}, chart_projection("planets"))
+    if not chart:
+        raise HTTPException(status_code=404, detail="Chart not found")
+    unpack_chart(chart)
+    natal_points = [{"name": p["name"], "longitude": p["longitude"]} for p in chart["planets"]]
+    
+    windows = scan_windows(jd_start, jd_end, step, TRANSIT_WINDOW_SAMPLES)
+    try:
+        first = await chart_engine.run(find_transits, natal_points, *windows[0], step)
+    except EngineOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     
-    if isinstance(chart.get('created_at'), str):
-        chart['created_at'] = datetime.fromisoformat(chart['created_at'])
+    async def stream_hits():
+        # Later windows are computed as the client reads, one job at a time
+        hits = first
+        for window in windows[1:] + [None]:
+            for hit in hits:
+                yield dumps(hit) + b"\n"
+            if window is not None:
+                hits = await chart_engine.run_waiting(find_transits, natal_points, *window, step)
     
-    return chart
+    return StreamingResponse(stream_hits(), media_type=NDJSON_MEDIA_TYPE)
 
 @api_router.delete("/natal-charts/{chart_id}")
 async def delete_natal_chart(chart_id: str):
     result = await db.natal_charts.delete_one({"id": chart_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Chart not found")
+    await pair_cache.forget_chart(chart_id)
+    wheel_cache.forget(chart_id)
+    chart_response_cache.forget(chart_id)
     return {"message": "Chart deleted successfully"}
 
+# Synastry and composite charts, computed from stored positions
+async def _load_charts(chart_ids: List[str], projection: Dict[str, int] = PAIR_PROJECTION) -> Dict[str, Dict]:
+    docs = await db.natal_charts.find({"id": {"$in": chart_ids}}, projection).to_list(None)
+    charts = {doc["id"]: unpack_chart(doc) for doc in docs}
+    missing = sorted(set(chart_ids) - set(charts))
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Charts not found: {', '.join(missing)}")
+    return charts
+
+async def _require_charts(chart_ids: List[str]):
+    # Index-only lookup; cached pair results are still refused for deleted charts
+    await _load_charts(chart_ids, {"_id": 0, "id": 1})
+
+async def _synastries(chart_id: str, partner_ids: List[str]) -> List[Dict[str, Any]]:
+    partner_ids = list(dict.fromkeys(partner_ids))
+    await _require_charts([chart_id, *partner_ids])
+    
+    keys = {partner_id: pair_cache_key("synastry", chart_id, partner_id) for partner_id in partner_ids}
+    found = {}
+    for partner_id in partner_ids:
+        cached = await pair_cache.get(keys[partner_id])
+        if cached is not None:
+            found[partner_id] = cached
+    
+    misses = [partner_id for partner_id in partner_ids if partner_id not in found]
+    if misses:
+        # One query and one vectorized aspect pass for every uncached partner
+        charts = await _load_charts([chart_id, *misses])
+        partners = [charts[partner_id] for partner_id in misses]
+        for partner_id, aspects in zip(misses, synastry_aspects(charts[chart_id], partners)):
+            found[partner_id] = {"aspects": aspects}
+            await pair_cache.put_pair(keys[partner_id], found[partner_id], (chart_id, partner_id))
+    
+    return [{"chart_id": chart_id, "partner_id": partner_id, **found[partner_id]} for partner_id in partner_ids]
+
+@api_router.post("/synastry", response_model=Synastry)
+async def create_synastry(pair: ChartPair):
+    results = await _synastries(pair.chart_id, [pair.partner_id])
+    return results[0]
+
+@api_router.post("/synastry/batch", response_model=List[Synastry])
+async def create_synastry_batch(batch: SynastryBatch):
+    if len(batch.partner_ids) > SYNASTRY_MAX_PARTNERS:
+        raise HTTPException(status_code=400, detail=f"At most {SYNASTRY_MAX_PARTNERS} partners per request")
+    return await _synastries(batch.chart_id, batch.partner_ids)
+
+@api_router.post("/composite", response_model=CompositeChart)
+async def create_composite(pair: ChartPair):
+    chart_ids = sorted({pair.chart_id, pair.partner_id})
+    if len(chart_ids) < 2:
+        raise HTTPException(status_code=400, detail="A composite needs two different charts")
+    await _require_charts(chart_ids)
+    
+    key = pair_cache_key("composite", *chart_ids)
+    composite = await pair_cache.get(key)
+    if composite is None:
+        charts = await _load_charts(chart_ids)
+        first, second = charts[chart_ids[0]], charts[chart_ids[1]]
+        composite = {"names": [first["name"], second["name"]], **composite_chart(first, second)}
+        await pair_cache.put_pair(key, composite, chart_ids)
+    
+    return {"chart_ids": chart_ids, **composite}
+
 # Admin authentication
 @api_router.post("/admin/login")
 async def admin_login(admin: AdminLogin):
     db_admin = await db.admins.find_one({"username": admin.username})
-    if not db_admin or not pwd_context.verify(admin.password, db_admin["password"]):
+    if not db_admin or not await verify_password(admin.password, db_admin["password"]):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     
-    token = jwt.encode({"sub": admin.username}, SECRET_KEY, algorithm="HS256")
+    token = create_access_token(admin.username, SECRET_KEY)
     return {"token": token, "username": admin.username}
 
 @api_router.post("/admin/register")
@@ -427,16 +556,24 @@ async def admin_register(admin: AdminCreate):
     if existing:
         raise HTTPException(status_code=400, detail="Admin already exists")
     
-    hashed_password = pwd_context.hash(admin.password)
+    hashed_password = await hash_password(admin.password)
     await db.admins.insert_one({
         "username": admin.username,
         "password": hashed_password,
         "created_at": datetime.now(timezone.utc).isoformat()
     })
     
-    token = jwt.encode({"sub": admin.username}, SECRET_KEY, algorithm="HS256")
+    token = create_access_token(admin.username, SECRET_KEY)
     return {"token": token, "username": admin.username}
 
+@api_router.delete("/admin/{username}")
+async def delete_admin(username: str, admin: str = Depends(verify_admin_token)):
+    result = await db.admins.delete_one({"username": username})
+    admin_principals.invalidate(username)
+    if result.deleted_count == 0:
+        raise HTTPException(status_code=404, detail="Admin not found")
+    return {"message": "Admin deleted successfully"}
+
 # Interpretations
 @api_router.post("/interpretations", response_model=Interpretation)
 async def create_interpretation(interp: InterpretationCreate, admin: str = Depends(verify_admin_token)):
@@ -446,60 +583,134 @@ async def create_interpretation(interp: InterpretationCreate, admin: str = Depen
     doc['updated_at'] = doc['updated_at'].isoformat()
     
     await db.interpretations.insert_one(doc)
-    return interpretation
+    interpretation_catalogue.upsert(doc)
+    return json_response(shape(doc, Interpretation))
 
 @api_router.get("/interpretations", response_model=List[Interpretation])
-async def get_interpretations(category: Optional[str] = None):
-    query = {"category": category} if category else {}
-    interps = await db.interpretations.find(query, {"_id": 0}).to_list(1000)
+async def get_interpretations(request: Request, category: Optional[str] = None):
+    await interpretation_catalogue.ensure_loaded()
     
-    for interp in interps:
-        if isinstance(interp.get('created_at'), str):
-            interp['created_at'] = datetime.fromisoformat(interp['created_at'])
-        if isinstance(interp.get('updated_at'), str):
-            interp['updated_at'] = datetime.fromisoformat(interp['updated_at'])
+    etag = interpretation_catalogue.etag(category)
+    if not_modified(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
     
-    return interps
+    return json_response([shape(doc, Interpretation) for doc in interpretation_catalogue.list(category)],
+                         headers={"ETag": etag})
 
 @api_router.get("/interpretations/{interp_id}", response_model=Interpretation)
 async def get_interpretation(interp_id: str):
-    interp = await db.interpretations.find_one({"id": interp_id}, {"_id": 0})
+    await interpretation_catalogue.ensure_loaded()
+    interp = interpretation_catalogue.get(interp_id)
     if not interp:
         raise HTTPException(status_code=404, detail="Interpretation not found")
     
-    if isinstance(interp.get('created_at'), str):
-        interp['created_at'] = datetime.fromisoformat(interp['created_at'])
-    if isinstance(interp.get('updated_at'), str):
-        interp['updated_at'] = datetime.fromisoformat(interp['updated_at'])
-    
-    return interp
+    return json_response(shape(interp, Interpretation))
 
 @api_router.put("/interpretations/{interp_id}", response_model=Interpretation)
 async def update_interpretation(interp_id: str, update_data: InterpretationUpdate, admin: str = Depends(verify_admin_token)):
-    existing = await db.interpretations.find_one({"id": interp_id})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Interpretation not found")
-    
     update_dict = {k: v for k, v in update_data.model_dump().items() if v is not None}
     update_dict['updated_at'] = datetime.now(timezone.utc).isoformat()
     
-    await db.interpretations.update_one({"id": interp_id}, {"$set": update_dict})
-    
-    updated = await db.interpretations.find_one({"id": interp_id}, {"_id": 0})
-    if isinstance(updated.get('created_at'), str):
-        updated['created_at'] = datetime.fromisoformat(updated['created_at'])
-    if isinstance(updated.get('updated_at'), str):
-        updated['updated_at'] = datetime.fromisoformat(updated['updated_at'])
+    updated = await db.interpretations.find_one_and_update(
+        {"id": interp_id}, {"$set": update_dict}, return_document=ReturnDocument.AFTER
+    )
+    if not updated:
+        raise HTTPException(status_code=404, detail="Interpretation not found")
     
-    return updated
+    interpretation_catalogue.upsert(updated)
+    return json_response(shape(updated, Interpretation))
 
 @api_router.delete("/interpretations/{interp_id}")
 async def delete_interpretation(interp_id: str, admin: str = Depends(verify_admin_token)):
     result = await db.interpretations.delete_one({"id": interp_id})
+    interpretation_catalogue.remove(interp_id)
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Interpretation not found")
     return {"message": "Interpretation deleted successfully"}
 
+# Bulk export and import (admin only); memory stays at one cursor batch
+def _export_response(chunks, fmt: str, name: str) -> StreamingResponse:
+    return StreamingResponse(chunks, media_type=EXPORT_MEDIA_TYPES[fmt], headers={
+        "Content-Disposition": f'attachment; filename="{name}.{fmt}"',
+    })
+
+@api_router.get("/export/natal-charts")
+async def export_natal_charts(
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    rows: Literal["charts", "planets"] = "charts",
+    admin: str = Depends(verify_admin_token),
+):
+    cursor = list_db.natal_charts.find({}, {"_id": 0})
+    return _export_response(export_charts(cursor, fmt, rows == "planets", EXPORT_BATCH_SIZE), fmt, "natal-charts")
+
+@api_router.get("/export/interpretations")
+async def export_interpretations_dump(
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    admin: str = Depends(verify_admin_token),
+):
+    cursor = list_db.interpretations.find({}, {"_id": 0})
+    return _export_response(export_interpretations(cursor, fmt, EXPORT_BATCH_SIZE), fmt, "interpretations")
+
+def _chart_upsert(record: Any) -> UpdateOne:
+    chart = NatalChart.model_validate(record)
+    # Stored charts are immutable: an id that already exists is left as is.
+    # Records without a version may predate the current calculation rules
+    version = record.get("calculation_version") or LEGACY_CALCULATION_VERSION
+    doc = natal_chart_to_doc(chart.model_dump(), version)
+    return UpdateOne({"id": chart.id}, {"$setOnInsert": doc}, upsert=True)
+
+def _interpretation_upsert(record: Any) -> UpdateOne:
+    doc = Interpretation.model_validate(record).model_dump()
+    doc['created_at'] = doc['created_at'].isoformat()
+    doc['updated_at'] = doc['updated_at'].isoformat()
+    return UpdateOne({"id": doc["id"]}, {"$set": doc}, upsert=True)
+
+@api_router.post("/import/natal-charts")
+async def import_natal_charts(request: Request, admin: str = Depends(verify_admin_token)):
+    return await bulk_import(chart_writes, stream_ndjson_records(request), _chart_upsert, EXPORT_BATCH_SIZE)
+
+@api_router.post("/import/interpretations")
+async def import_interpretations(request: Request, admin: str = Depends(verify_admin_token)):
+    summary = await bulk_import(db.interpretations, stream_ndjson_records(request), _interpretation_upsert, EXPORT_BATCH_SIZE)
+    await interpretation_catalogue.reload()
+    return summary
+
+# Jobs
+@api_router.post("/jobs", response_model=Job, status_code=202)
+async def create_job(job: JobCreate, admin: str = Depends(verify_admin_token)):
+    if job.type not in JOB_HANDLERS:
+        raise HTTPException(status_code=400, detail=f"Unknown job type; expected one of: {', '.join(JOB_HANDLERS)}")
+    return await job_queue.enqueue(job.type, job.params, job.max_attempts)
+
+@api_router.get("/jobs/{job_id}", response_model=Job)
+async def get_job(job_id: str, admin: str = Depends(verify_admin_token)):
+    job = await job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+# Prometheus scrape endpoint, outside /api like a health check
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+# Readiness probe: 503 until the warm-up steps have all succeeded
+@app.get("/ready", include_in_schema=False)
+async def get_readiness():
+    return JSONResponse(warm_up.report(), status_code=200 if warm_up.ready else 503)
+
+for prefix, component in (
+    ("chart_engine", chart_engine),
+    ("chart_cache", chart_cache),
+    ("pair_cache", pair_cache),
+    ("wheel_cache", wheel_cache),
+    ("chart_response_cache", chart_response_cache),
+    ("location_search", location_search),
+):
+    REGISTRY.add_collector(
+        lambda prefix=prefix, component=component: gauges_from(prefix, component.metrics(), f"{prefix} metrics() value")
+    )
+
 # Include router
 app.include_router(api_router)
 
@@ -509,14 +720,13 @@ app.add_middleware(
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
+# Outermost, so timings include CORS handling and every status code is seen
+app.add_middleware(MetricsMiddleware, skip_paths=("/metrics", "/ready"))
 
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
-
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
\ No newline at end of file
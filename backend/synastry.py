@@ -0,0 +1,75 @@
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from aspects import MAJOR_TABLE, AspectTable, find_aspects, to_dicts
+from astrology import ANGLES, assign_houses, calculate_aspects, get_degree_in_sign, get_zodiac_sign
+from chart_storage import chart_projection
+
+# Only the stored positions are needed; nothing here touches the ephemeris
+PAIR_PROJECTION = chart_projection("id", "name", "planets", "houses")
+
+
+def aspect_points(chart: Dict) -> List[Dict]:
+    return [p for p in chart["planets"] if p["name"] not in ANGLES]
+
+
+def synastry_aspects(chart: Dict, partners: Sequence[Dict], table: AspectTable = MAJOR_TABLE) -> List[List[Dict]]:
+    """Cross aspects between ``chart`` and each partner, in partner order.
+
+    All partners are matched in a single call: their points are stacked
+    into one array and the hits are split back per partner afterwards.
+    """
+    own = aspect_points(chart)
+    points = [aspect_points(partner) for partner in partners]
+    others = [p for group in points for p in group]
+    if not own or not others:
+        return [[] for _ in partners]
+
+    hits = find_aspects([p["longitude"] for p in own], [p["longitude"] for p in others], table)
+    aspects = to_dicts(hits, [p["name"] for p in own], [p["name"] for p in others], table)
+
+    starts = np.cumsum([0] + [len(group) for group in points[:-1]])
+    owners = np.searchsorted(starts, hits.second, side="right") - 1
+    results = [[] for _ in partners]
+    for owner, aspect in zip(owners.tolist(), aspects):
+        results[owner].append(aspect)
+    return results
+
+
+def midpoint(first: float, second: float) -> float:
+    # Midpoint on the shorter arc, so 350° and 10° meet at 0°, not 180°
+    return (first + ((second - first + 180.0) % 360.0 - 180.0) / 2) % 360.0
+
+
+def composite_chart(first: Dict, second: Dict) -> Dict:
+    """Midpoint composite of two stored charts, in the calculate_chart_data shape."""
+    second_planets = {p["name"]: p for p in second["planets"]}
+    planets = []
+    for planet in first["planets"]:
+        other = second_planets.get(planet["name"])
+        if other is None:
+            continue
+        lon = midpoint(planet["longitude"], other["longitude"])
+        planets.append({
+            'name': planet["name"],
+            'longitude': lon,
+            'latitude': (planet["latitude"] + other["latitude"]) / 2,
+            'speed': (planet["speed"] + other["speed"]) / 2,
+            'sign': get_zodiac_sign(lon),
+            'degree': get_degree_in_sign(lon),
+            'house': None,
+        })
+
+    second_cusps = {h["number"]: h["cusp"] for h in second["houses"]}
+    cusps = [midpoint(h["cusp"], second_cusps[h["number"]]) for h in sorted(first["houses"], key=lambda h: h["number"])]
+    houses = [{'number': i + 1, 'cusp': cusp, 'sign': get_zodiac_sign(cusp)} for i, cusp in enumerate(cusps)]
+
+    if len(cusps) == 12:
+        assign_houses(planets, cusps)
+
+    return {
+        'planets': planets,
+        'houses': houses,
+        'aspects': calculate_aspects([p for p in planets if p['name'] not in ANGLES]),
+    }
@@ -0,0 +1,123 @@
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+
+import h3
+import pytz
+
+# Marks H3 cells that straddle a zone border; points in them always get an
+# exact lookup
+_MIXED = ""
+# Marks cells seen once; they are resolved when a second point lands in them
+_SEEN_ONCE = "?"
+
+
+@lru_cache(maxsize=None)
+def get_zone(tz_name: str):
+    return pytz.timezone(tz_name)
+
+
+class TimezoneResolver:
+    """Resolves coordinates to IANA zone names through an H3 grid index.
+
+    The first point in an H3 cell (resolution 7, ~5 km²) gets a plain
+    exact lookup, so birth places that never repeat cost what an
+    unindexed lookup costs. When a second point lands in the cell, the
+    cell is resolved: if the finder's own coarse grid holds a single zone
+    around its centre, or its centre and all boundary vertices fall in
+    the same zone, every later point in that cell is answered from the
+    index. Cells crossing a border are remembered as mixed and keep using
+    exact lookups. A border that clips a cell without crossing its centre
+    or vertices goes unnoticed, which at ~2.5 km cell edges is an
+    accepted trade-off. The finder itself is only created on first use.
+
+    Lookups may come from several threads; the finder reads its polygon
+    file through shared handles, so they are serialized by a lock.
+    """
+
+    def __init__(self, resolution: int = 7, max_cells: int = 65536):
+        self.resolution = resolution
+        self.max_cells = max_cells
+        self._finder = None
+        self._cells: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._finder_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.exact_lookups = 0
+
+    @classmethod
+    def from_env(cls) -> "TimezoneResolver":
+        return cls(
+            resolution=int(os.environ.get('TIMEZONE_H3_RESOLUTION', 7)),
+            max_cells=int(os.environ.get('TIMEZONE_INDEX_SIZE', 65536)),
+        )
+
+    @property
+    def finder(self):
+        if self._finder is None:
+            with self._finder_lock:
+                if self._finder is None:
+                    from timezonefinder import TimezoneFinder
+                    self._finder = TimezoneFinder()
+        return self._finder
+
+    def _exact(self, latitude: float, longitude: float) -> Optional[str]:
+        self.exact_lookups += 1
+        return self.finder.timezone_at(lat=latitude, lng=longitude)
+
+    def timezone_name(self, latitude: float, longitude: float) -> Optional[str]:
+        with self._lock:
+            return self._timezone_name(latitude, longitude)
+
+    def _timezone_name(self, latitude: float, longitude: float) -> Optional[str]:
+        cell = h3.geo_to_h3(latitude, longitude, self.resolution)
+        zone = self._cells.get(cell)
+        if zone is None:
+            self.misses += 1
+            self._cells[cell] = _SEEN_ONCE
+            if len(self._cells) > self.max_cells:
+                self._cells.popitem(last=False)
+            return self._exact(latitude, longitude)
+
+        self._cells.move_to_end(cell)
+        if zone == _SEEN_ONCE:
+            self.misses += 1
+            zone = self._cells[cell] = self._resolve_cell(cell)
+        elif zone != _MIXED:
+            self.hits += 1
+        return zone if zone != _MIXED else self._exact(latitude, longitude)
+
+    def _resolve_cell(self, cell: str) -> str:
+        centre = h3.h3_to_geo(cell)
+        # Away from borders the finder's grid answers without a polygon test
+        zone = self.finder.unique_timezone_at(lat=centre[0], lng=centre[1])
+        if zone:
+            return zone
+        points = [centre, *h3.h3_to_geo_boundary(cell)]
+        zones = {self._exact(lat, lng) for lat, lng in points}
+        if len(zones) == 1:
+            zone = zones.pop()
+            # Open ocean (None) is treated as mixed so the UTC fallback stays exact
+            return zone if zone else _MIXED
+        return _MIXED
+
+    def to_utc(self, local_dt: datetime, latitude: float, longitude: float) -> datetime:
+        tz_name = self.timezone_name(latitude, longitude)
+        if tz_name:
+            return get_zone(tz_name).localize(local_dt).astimezone(pytz.UTC)
+        return local_dt.replace(tzinfo=pytz.UTC)
+
+    def metrics(self):
+        return {
+            'cells': len(self._cells),
+            'max_cells': self.max_cells,
+            'resolution': self.resolution,
+            'hits': self.hits,
+            'misses': self.misses,
+            'exact_lookups': self.exact_lookups,
+            'finder_loaded': self._finder is not None,
+        }
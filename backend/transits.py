@@ -0,0 +1,142 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import swisseph as swe
+
+from astrology import ASPECT_TYPES, PLANET_DATA
+from ephemeris_table import EphemerisTable
+
+TRANSIT_BODIES = PLANET_DATA
+
+# Optional precomputed positions (EPHEMERIS_TABLE=path) for the sampling
+# grid; hits are still refined against Swiss Ephemeris
+ephemeris_table = EphemerisTable.from_env()
+
+
+def jd_to_datetime(jd: float) -> datetime:
+    year, month, day, hours = swe.revjul(jd)
+    return datetime(year, month, day, tzinfo=timezone.utc) + timedelta(hours=hours)
+
+
+def date_to_jd(value: str) -> float:
+    day = datetime.strptime(value, "%Y-%m-%d")
+    return swe.julday(day.year, day.month, day.day, 0.0)
+
+
+def time_grid(jd_start: float, jd_end: float, step: float) -> np.ndarray:
+    count = int(np.floor((jd_end - jd_start) / step + 1e-9)) + 1
+    jds = jd_start + step * np.arange(count)
+    if jd_end - jds[-1] > 1e-9:
+        jds = np.append(jds, jd_end)
+    return jds
+
+
+def ephemeris_grid(jds: np.ndarray, bodies: Sequence[Tuple[int, str]] = TRANSIT_BODIES) -> np.ndarray:
+    # Swiss Ephemeris has no array API, so without a precomputed table this
+    # is the one per-sample loop; everything downstream works on the
+    # (bodies, samples) matrix
+    calc = swe.calc_ut
+    lons = np.empty((len(bodies), len(jds)))
+    for row, (body_id, _) in enumerate(bodies):
+        if ephemeris_table is not None and ephemeris_table.covers(body_id, jds[0], jds[-1]):
+            lons[row] = ephemeris_table.positions(body_id, jds)[0]
+        else:
+            lons[row] = [calc(jd, body_id)[0][0] for jd in jds]
+    return lons
+
+
+def _wrap(angle):
+    return (angle + 180.0) % 360.0 - 180.0
+
+
+def _aspect_offsets(aspects: Dict) -> List[Tuple[float, int]]:
+    # A transit makes an aspect on either side of the natal point, except for
+    # the conjunction and opposition where both sides coincide
+    offsets = []
+    for angle in sorted(aspects):
+        offsets.append((float(angle), angle))
+        if angle % 180:
+            offsets.append((-float(angle), angle))
+    return offsets
+
+
+def _refine(body_id: int, target: float, t0: float, f0: float, t1: float, f1: float,
+            tolerance: float = 1e-5, max_iter: int = 30) -> float:
+    # Illinois-variant regula falsi inside the bracketing grid interval;
+    # converges to ~1 s in a handful of ephemeris calls
+    t = t1
+    side = 0
+    for _ in range(max_iter):
+        t = t1 - f1 * (t1 - t0) / (f1 - f0)
+        f = _wrap(swe.calc_ut(t, body_id)[0][0] - target)
+        if abs(f) < 1e-7 or t1 - t0 < tolerance:
+            break
+        if (f < 0) == (f1 < 0):
+            t1, f1 = t, f
+            if side == -1:
+                f0 /= 2
+            side = -1
+        else:
+            t0, f0 = t, f
+            if side == 1:
+                f1 /= 2
+            side = 1
+    return t
+
+
+def find_transits(natal_points: List[Dict], jd_start: float, jd_end: float, step: float,
+                  bodies: Sequence[Tuple[int, str]] = TRANSIT_BODIES,
+                  aspects: Dict = ASPECT_TYPES) -> List[Dict]:
+    """Exact times at which transiting bodies perfect an aspect to natal points.
+
+    Positions are sampled on a uniform grid and a sign change of
+    (transit - natal - aspect angle) between two samples marks a hit, which
+    is then refined to the exact moment. ``step`` must stay well below the
+    time the fastest body needs to cross half an orb circle (the Moon moves
+    ~13°/day, so up to a day is fine).
+    """
+    jds = time_grid(jd_start, jd_end, step)
+    if len(jds) < 2 or not natal_points:
+        return []
+    lons = ephemeris_grid(jds, bodies)
+
+    offsets = _aspect_offsets(aspects)
+    natal_lons = np.array([p["longitude"] for p in natal_points])
+    targets = natal_lons[:, None] + np.array([o for o, _ in offsets])[None, :]
+    # (bodies, natal points, aspect sides, samples)
+    diff = _wrap(lons[:, None, None, :] - targets[None, :, :, None])
+    before, after = diff[..., :-1], diff[..., 1:]
+    # The magnitude check drops the artificial jump where the difference wraps
+    crossings = ((before < 0) != (after < 0)) & (np.abs(after - before) < 180)
+
+    hits = []
+    for b, p, k, i in zip(*np.nonzero(crossings)):
+        body_id, body_name = bodies[b]
+        target = float(targets[p, k])
+        jd = _refine(body_id, target, float(jds[i]), float(before[b, p, k, i]),
+                     float(jds[i + 1]), float(after[b, p, k, i]))
+        angle = offsets[k][1]
+        hits.append({
+            "jd": jd,
+            "date": jd_to_datetime(jd).isoformat(),
+            "transit": body_name,
+            "natal": natal_points[p]["name"],
+            "aspect_type": aspects[angle][0],
+            "angle": int(angle),
+        })
+    hits.sort(key=lambda hit: hit["jd"])
+    return hits
+
+
+def scan_windows(jd_start: float, jd_end: float, step: float, samples_per_window: int) -> List[Tuple[float, float]]:
+    # Consecutive windows share their boundary sample, so every grid interval
+    # (and every hit) belongs to exactly one window
+    span = step * samples_per_window
+    windows = []
+    start = jd_start
+    while start < jd_end - 1e-9:
+        end = min(start + span, jd_end)
+        windows.append((start, end))
+        start = end
+    return windows
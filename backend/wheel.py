@@ -0,0 +1,175 @@
+"""Server-side chart wheel, drawn like frontend/src/components/NatalChartWheel.js.
+
+The geometry is laid out on the component's 600 px canvas and scaled with
+a viewBox, so any requested size renders the same picture.
+"""
+import math
+from typing import Dict, List
+from xml.sax.saxutils import escape
+
+from astrology import ANGLES
+
+# Bump whenever the drawing changes; part of the render cache key and ETag
+WHEEL_VERSION = "1"
+
+CANVAS = 600
+CENTER = CANVAS / 2
+OUTER_RADIUS = 280
+INNER_RADIUS = 200
+HOUSE_RADIUS = 160
+PLANET_RADIUS = 220
+ASPECT_RADIUS = 110
+
+ZODIAC_SIGNS = [
+    ("♈", "#ef4444"), ("♉", "#84cc16"), ("♊", "#eab308"), ("♋", "#a855f7"),
+    ("♌", "#f97316"), ("♍", "#22c55e"), ("♎", "#06b6d4"), ("♏", "#dc2626"),
+    ("♐", "#8b5cf6"), ("♑", "#64748b"), ("♒", "#3b82f6"), ("♓", "#06b6d4"),
+]
+
+PLANET_SYMBOLS = {
+    "Асцендент": "ASC",
+    "Середина Неба (MC)": "MC",
+    "Сонце": "☉",
+    "Місяць": "☽",
+    "Меркурій": "☿",
+    "Венера": "♀",
+    "Марс": "♂",
+    "Юпітер": "♃",
+    "Сатурн": "♄",
+    "Уран": "♅",
+    "Нептун": "♆",
+    "Плутон": "♇",
+    "Хірон": "⚷",
+    "Північний вузол": "☊",
+    "Південний вузол": "☋",
+    "Ліліт": "⚸",
+}
+
+PLANET_COLORS = {
+    "Сонце": "#fbbf24",
+    "Місяць": "#e0e7ff",
+    "Венера": "#f9a8d4",
+    "Марс": "#f87171",
+    "Меркурій": "#93c5fd",
+    "Юпітер": "#fb923c",
+    "Сатурн": "#a78bfa",
+}
+
+ASPECT_COLORS = {
+    "Кон'юнкція": "#fbbf24",
+    "Секстиль": "#22c55e",
+    "Квадрат": "#ef4444",
+    "Тригон": "#3b82f6",
+    "Опозиція": "#f87171",
+}
+
+
+def _point(radius: float, angle: float) -> str:
+    radians = math.radians(angle)
+    return f"{CENTER + radius * math.cos(radians):.2f} {CENTER - radius * math.sin(radians):.2f}"
+
+
+def _xy(radius: float, angle: float) -> Dict[str, str]:
+    x, y = _point(radius, angle).split()
+    return {"x": x, "y": y}
+
+
+def _text(radius: float, angle: float, content: str, size: int, color: str, weight: int) -> str:
+    pos = _xy(radius, angle)
+    return (
+        f'<text x="{pos["x"]}" y="{pos["y"]}" font-size="{size}" fill="{color}" text-anchor="middle" '
+        f'dominant-baseline="middle" font-weight="{weight}">{escape(content)}</text>'
+    )
+
+
+def _line(r1: float, a1: float, r2: float, a2: float, stroke: str, width: float, extra: str = "") -> str:
+    start, end = _xy(r1, a1), _xy(r2, a2)
+    return (
+        f'<line x1="{start["x"]}" y1="{start["y"]}" x2="{end["x"]}" y2="{end["y"]}" '
+        f'stroke="{stroke}" stroke-width="{width}"{extra}/>'
+    )
+
+
+def _circle(radius: float, fill: str, stroke: str, width: float, at: str = None) -> str:
+    cx, cy = (at or f"{CENTER} {CENTER}").split()
+    return f'<circle cx="{cx}" cy="{cy}" r="{radius}" fill="{fill}" stroke="{stroke}" stroke-width="{width}"/>'
+
+
+def render_wheel_svg(chart: Dict, size: int = CANVAS, show_aspects: bool = True) -> str:
+    planets = chart.get("planets", [])
+    houses = sorted(chart.get("houses", []), key=lambda h: h["number"])
+    asc = next((p["longitude"] for p in planets if p["name"] == "Асцендент"), None)
+
+    def to_angle(longitude: float) -> float:
+        # Ascendant at 9 o'clock, zodiac running counter-clockwise
+        return 0.0 if asc is None else (270 + longitude - asc) % 360
+
+    parts: List[str] = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" '
+        f'viewBox="0 0 {CANVAS} {CANVAS}" font-family="DejaVu Sans, sans-serif">',
+        _circle(CENTER, "#0f0f1e", "none", 0),
+        _circle(OUTER_RADIUS, "none", "rgba(139, 92, 246, 0.5)", 2),
+        _circle(INNER_RADIUS, "none", "rgba(139, 92, 246, 0.5)", 2),
+        _circle(HOUSE_RADIUS, "none", "rgba(139, 92, 246, 0.3)", 1),
+        _circle(50, "rgba(139, 92, 246, 0.1)", "rgba(139, 92, 246, 0.4)", 1),
+    ]
+
+    for index, (symbol, color) in enumerate(ZODIAC_SIGNS):
+        start, end = to_angle(index * 30), to_angle(index * 30 + 30)
+        parts.append(
+            f'<path d="M {_point(OUTER_RADIUS, start)} A {OUTER_RADIUS} {OUTER_RADIUS} 0 0 0 {_point(OUTER_RADIUS, end)} '
+            f'L {_point(INNER_RADIUS, end)} A {INNER_RADIUS} {INNER_RADIUS} 0 0 1 {_point(INNER_RADIUS, start)} Z" '
+            f'fill="rgba(139, 92, 246, 0.05)" stroke="rgba(139, 92, 246, 0.3)" stroke-width="1"/>'
+        )
+        parts.append(_text((OUTER_RADIUS + INNER_RADIUS) / 2, to_angle(index * 30 + 15), symbol, 24, color, 600))
+
+    for index, house in enumerate(houses):
+        angle = to_angle(house["cusp"])
+        following = to_angle(houses[(index + 1) % len(houses)]["cusp"])
+        middle = angle + ((following - angle) % 360) / 2
+        parts.append(_line(HOUSE_RADIUS, angle, 0, angle, "rgba(139, 92, 246, 0.4)", 1.5,
+                           ' stroke-dasharray="3,3"'))
+        parts.append(_text(HOUSE_RADIUS - 30, middle, str(house["number"]), 14, "rgba(196, 181, 253, 0.8)", 500))
+
+    longitudes = {p["name"]: p["longitude"] for p in planets}
+    if show_aspects:
+        for aspect in chart.get("aspects", []):
+            if aspect["planet1"] in longitudes and aspect["planet2"] in longitudes:
+                parts.append(_line(
+                    ASPECT_RADIUS, to_angle(longitudes[aspect["planet1"]]),
+                    ASPECT_RADIUS, to_angle(longitudes[aspect["planet2"]]),
+                    ASPECT_COLORS.get(aspect["aspect_type"], "#c4b5fd"), 1, ' stroke-opacity="0.6"',
+                ))
+
+    for name, label in (("Асцендент", "ASC"), ("Середина Неба (MC)", "MC")):
+        if name in longitudes:
+            angle = to_angle(longitudes[name])
+            parts.append(_line(INNER_RADIUS + 5, angle, 0, angle, "#8b5cf6", 3))
+            parts.append(_circle(20, "rgba(139, 92, 246, 0.2)", "#8b5cf6", 2, _point(INNER_RADIUS - 25, angle)))
+            parts.append(_text(INNER_RADIUS - 25, angle, label, 14, "#c4b5fd", 700))
+
+    drawn = [p for p in planets if p["name"] not in ANGLES]
+    for index, planet in enumerate(drawn):
+        angle = to_angle(planet["longitude"])
+        # Step planets inwards when they would overlap an earlier one
+        radius = PLANET_RADIUS
+        for other in drawn[:index]:
+            difference = abs(planet["longitude"] - other["longitude"])
+            if difference < 5 or difference > 355:
+                radius -= 15
+        color = PLANET_COLORS.get(planet["name"], "#c4b5fd")
+        parts.append(_line(INNER_RADIUS + 5, angle, radius, angle, "rgba(139, 92, 246, 0.3)", 1))
+        parts.append(_circle(18, "rgba(15, 15, 30, 0.9)", color, 2, _point(radius, angle)))
+        parts.append(_text(radius, angle, PLANET_SYMBOLS.get(planet["name"], planet["name"][:2]), 16, color, 600))
+
+    parts.append("</svg>")
+    return "\n".join(parts)
+
+
+def render_wheel_png(chart: Dict, size: int = CANVAS, show_aspects: bool = True) -> bytes:
+    # cairosvg needs the native cairo library; callers treat ImportError and
+    # OSError as "PNG rendering unavailable"
+    import cairosvg
+
+    svg = render_wheel_svg(chart, size, show_aspects)
+    return cairosvg.svg2png(bytestring=svg.encode(), output_width=size, output_height=size)
@@ -0,0 +1,72 @@
+"""Job worker: runs queued jobs from the ``jobs`` collection.
+
+    python worker.py [--concurrency N]
+
+Each consumer claims one job at a time; CPU-heavy steps go through the
+worker's own compute engine (CHART_WORKERS processes). Start as many
+worker processes as needed: claims are atomic, so they never share a job.
+SIGINT/SIGTERM stop claiming and let running jobs finish.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+from pathlib import Path
+
+from dotenv import load_dotenv
+from compute_engine import ChartComputeEngine
+from database import create_client
+from jobs import JobQueue, run_job
+
+logger = logging.getLogger("worker")
+
+
+async def consume(queue: JobQueue, name: str, db, engine, stopping: asyncio.Event, idle_seconds: float):
+    while not stopping.is_set():
+        try:
+            job = await queue.claim(name)
+        except Exception as e:
+            logger.error(f"{name}: could not claim a job: {str(e)}")
+            job = None
+        if job is None:
+            try:
+                await asyncio.wait_for(stopping.wait(), timeout=idle_seconds)
+            except asyncio.TimeoutError:
+                pass
+            continue
+        logger.info(f"{name}: running {job['type']} job {job['id']} (attempt {job['attempts']})")
+        await run_job(queue, job, db, engine)
+
+
+async def main(concurrency: int, idle_seconds: float):
+    load_dotenv(Path(__file__).parent / '.env')
+    client = create_client(appname="astrology-worker")
+    db = client[os.environ['DB_NAME']]
+    queue = JobQueue(db.jobs, lease_seconds=float(os.environ.get('JOB_LEASE_SECONDS', 60)))
+    engine = ChartComputeEngine.from_env()
+    engine.start()
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    prefix = f"{socket.gethostname()}:{os.getpid()}"
+    try:
+        await asyncio.gather(*(
+            consume(queue, f"{prefix}:{i}", db, engine, stopping, idle_seconds) for i in range(concurrency)
+        ))
+    finally:
+        client.close()
+        engine.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--concurrency', type=int, default=int(os.environ.get('JOB_CONCURRENCY', 4)))
+    parser.add_argument('--idle-seconds', type=float, default=1.0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    asyncio.run(main(args.concurrency, args.idle_seconds))
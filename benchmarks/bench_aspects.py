@@ -0,0 +1,72 @@
+"""Aspect detection: the original nested loop vs the NumPy aspect engine.
+
+Usage: python benchmarks/bench_aspects.py [--repeat N]
+"""
+import argparse
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from aspects import FULL_TABLE, MAJOR_ASPECTS, find_aspects  # noqa: E402
+from astrology import calculate_aspects  # noqa: E402
+from models import Aspect  # noqa: E402
+
+
+def legacy_calculate_aspects(planets):
+    aspects = []
+    for i in range(len(planets)):
+        for j in range(i + 1, len(planets)):
+            p1 = planets[i]
+            p2 = planets[j]
+            angle = abs(p1['longitude'] - p2['longitude'])
+            if angle > 180:
+                angle = 360 - angle
+            for asp_angle, (asp_name, orb) in MAJOR_ASPECTS.items():
+                diff = abs(angle - asp_angle)
+                if diff <= orb:
+                    aspects.append(Aspect(planet1=p1['name'], planet2=p2['name'],
+                                          aspect_type=asp_name, angle=angle, orb=diff))
+                    break
+    return aspects
+
+
+def positions(count, seed):
+    rng = random.Random(seed)
+    return [{'name': f"p{i}", 'longitude': rng.uniform(0, 360)} for i in range(count)]
+
+
+def report(label, fn, repeat):
+    best = min(timeit.repeat(fn, number=1, repeat=repeat))
+    print(f"{label:<44} {best * 1e6:10.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    natal = positions(16, 1)
+    print("One natal chart (16 points, aspect records built):")
+    report("  legacy nested loop", lambda: legacy_calculate_aspects(natal), args.repeat)
+    report("  calculate_aspects (engine + to_dicts)", lambda: calculate_aspects(natal), args.repeat)
+    longs = [p['longitude'] for p in natal]
+    report("  find_aspects only (arrays)", lambda: find_aspects(longs), args.repeat)
+
+    partners = positions(16 * 500, 2)
+    print("Synastry, one chart vs 500 partners (cross mode, arrays only):")
+    other = [p['longitude'] for p in partners]
+
+    def legacy_cross():
+        for start in range(0, len(partners), 16):
+            legacy_calculate_aspects(natal + partners[start:start + 16])
+
+    report("  legacy loop per partner (incl. intra-pairs)", legacy_cross, max(args.repeat // 50, 3))
+    report("  find_aspects, major", lambda: find_aspects(longs, other), args.repeat // 10)
+    report("  find_aspects, major + minor", lambda: find_aspects(longs, other, table=FULL_TABLE), args.repeat // 10)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Natal chart documents: full vs compact storage format.
+
+Usage: python benchmarks/bench_chart_storage.py [--charts N] [--mongo]
+
+Reports BSON size and the cost of decoding a page of documents into
+NatalChart models. With --mongo (MONGO_URL set) it also times list
+queries against two scratch collections holding each format.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+import bson
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from chart_storage import to_storage, unpack_chart  # noqa: E402
+from memory_db import synthetic_chart  # noqa: E402
+from models import NatalChart  # noqa: E402
+
+
+def decode_page(raw_docs):
+    return [NatalChart(**unpack_chart(bson.decode(raw))) for raw in raw_docs]
+
+
+def timeit_page(page):
+    started = time.perf_counter()
+    decode_page(page)
+    return time.perf_counter() - started
+
+
+async def mongo_reads(full_docs, compact_docs, repeat):
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'], tz_aware=True)
+    db = client[os.environ.get('DB_NAME', 'astrology') + '_bench']
+    try:
+        for label, docs in (("full", full_docs), ("compact", compact_docs)):
+            collection = db[f"charts_{label}"]
+            await collection.drop()
+            await collection.insert_many([dict(doc) for doc in docs])
+            stats = await db.command("collStats", collection.name)
+            best = float('inf')
+            for _ in range(repeat):
+                started = time.perf_counter()
+                page = await collection.find({}, {"_id": 0}).limit(100).to_list(100)
+                [NatalChart(**unpack_chart(doc)) for doc in page]
+                best = min(best, time.perf_counter() - started)
+            print(f"  {label:<8} storageSize {stats['storageSize'] / 1024:9.1f} KiB   "
+                  f"100-chart page {best * 1e3:7.2f} ms")
+            await collection.drop()
+    finally:
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--charts', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--mongo', action='store_true')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    full_docs = [synthetic_chart(rng) for _ in range(args.charts)]
+    compact_docs = [to_storage(dict(doc)) for doc in full_docs]
+
+    print(f"{args.charts} charts, average aspects per chart "
+          f"{sum(len(d['aspects']) for d in full_docs) / len(full_docs):.1f}")
+    for label, docs in (("full", full_docs), ("compact", compact_docs)):
+        raw = [bson.encode(doc) for doc in docs]
+        size = sum(len(r) for r in raw) / len(raw)
+        page = raw[:100]
+        best = min(timeit_page(page) for _ in range(args.repeat))
+        print(f"  {label:<8} {size:8.0f} B/doc   decode + model, 100 charts {best * 1e3:7.2f} ms")
+
+    if args.mongo:
+        print("MongoDB:")
+        asyncio.run(mongo_reads(full_docs, compact_docs, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
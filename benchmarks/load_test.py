@@ -0,0 +1,113 @@
+"""Concurrent load against the chart list and detail endpoints.
+
+Usage: python benchmarks/load_test.py [--clients N] [--seconds S] [--charts N] [--url URL]
+
+Without --url the ASGI app runs in-process against an in-memory database
+(memory_db.py), which isolates the application's own cost per request.
+With --url, requests go to a running deployment over HTTP; the charts
+listed there are used for the detail requests.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'astrology_bench')
+
+# (weight, request) mix: mostly detail views, as the frontend issues them
+MIX = [(6, "detail"), (3, "summary"), (1, "full")]
+
+
+def in_process_client(charts: int):
+    import server
+    from chart_storage import to_storage
+    from memory_db import MemoryDatabase, synthetic_charts
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    docs = synthetic_charts(charts)
+    server.db = server.list_db = MemoryDatabase()
+    server.db.natal_charts.add([to_storage(dict(doc)) for doc in docs])
+    transport = httpx.ASGITransport(app=server.app)
+    return httpx.AsyncClient(transport=transport, base_url="http://bench"), [doc["id"] for doc in docs]
+
+
+async def remote_client(url: str):
+    client = httpx.AsyncClient(base_url=url.rstrip("/"), timeout=30)
+    response = await client.get("/api/natal-charts", params={"view": "summary", "limit": 500})
+    response.raise_for_status()
+    return client, [chart["id"] for chart in response.json()]
+
+
+def request_for(kind: str, chart_ids, rng: random.Random):
+    if kind == "detail":
+        return f"/api/natal-charts/{rng.choice(chart_ids)}"
+    return f"/api/natal-charts?limit=100&view={kind}"
+
+
+async def worker(client, chart_ids, deadline: float, seed: int, latencies, errors):
+    rng = random.Random(seed)
+    kinds = [kind for weight, kind in MIX for _ in range(weight)]
+    while time.perf_counter() < deadline:
+        kind = rng.choice(kinds)
+        started = time.perf_counter()
+        try:
+            response = await client.get(request_for(kind, chart_ids, rng))
+            response.raise_for_status()
+        except httpx.HTTPError:
+            errors[kind] = errors.get(kind, 0) + 1
+            continue
+        latencies.setdefault(kind, []).append(time.perf_counter() - started)
+
+
+def percentile(samples, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+async def main_async(args):
+    if args.url:
+        client, chart_ids = await remote_client(args.url)
+    else:
+        client, chart_ids = in_process_client(args.charts)
+    if not chart_ids:
+        print("No charts to request")
+        return
+
+    latencies, errors = {}, {}
+    deadline = time.perf_counter() + args.seconds
+    async with client:
+        await asyncio.gather(*(
+            worker(client, chart_ids, deadline, seed, latencies, errors) for seed in range(args.clients)
+        ))
+
+    total = sum(len(samples) for samples in latencies.values())
+    print(f"{args.clients} clients, {args.seconds:.0f} s: {total} requests, {total / args.seconds:.1f} req/s")
+    for kind, samples in sorted(latencies.items()):
+        print(f"  {kind:<8} n={len(samples):<7} p50 {statistics.median(samples) * 1e3:8.2f} ms   "
+              f"p95 {percentile(samples, 0.95) * 1e3:8.2f} ms   p99 {percentile(samples, 0.99) * 1e3:8.2f} ms")
+    if errors:
+        print(f"  errors: {errors}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=20)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--charts', type=int, default=1000)
+    parser.add_argument('--url')
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""In-memory stand-in for the Motor database, for benchmarks and endpoint tests.
+
+Documents are kept as BSON and decoded on every read, so a request pays
+the same decode cost it would against MongoDB without the network. Only
+the query shapes the benchmarked endpoints send are supported: equality,
+``$lt``, ``$in`` and ``$or`` filters, inclusion or exclusion projections,
+sort, limit and single deletes.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import bson
+from bson.codec_options import CodecOptions
+
+from astrology import ANGLES, assign_houses, calculate_aspects, get_degree_in_sign, get_zodiac_sign
+from chart_storage import POINT_NAMES
+from models import NatalChart
+
+CODEC_OPTIONS = CodecOptions(tz_aware=True, tzinfo=timezone.utc)
+
+
+def synthetic_chart(rng: random.Random, created_at: Optional[datetime] = None) -> dict:
+    """A full chart document with random positions; no ephemeris needed."""
+    planets = []
+    for name in POINT_NAMES:
+        lon = rng.uniform(0, 360)
+        planets.append({'name': name, 'longitude': lon, 'latitude': rng.uniform(-5, 5), 'speed': rng.uniform(-1, 13),
+                        'sign': get_zodiac_sign(lon), 'degree': get_degree_in_sign(lon)})
+    start = rng.uniform(0, 360)
+    cusps = [(start + 30 * i) % 360 for i in range(12)]
+    assign_houses(planets, cusps)
+    chart = NatalChart(
+        name="Тестова карта", birth_date="1990-05-14", birth_time="12:00", birth_location="Київ, Україна",
+        latitude=50.45, longitude=30.52, planets=planets,
+        houses=[{'number': i + 1, 'cusp': c, 'sign': get_zodiac_sign(c)} for i, c in enumerate(cusps)],
+        aspects=calculate_aspects([p for p in planets if p['name'] not in ANGLES]),
+    )
+    if created_at is not None:
+        chart.created_at = created_at
+    return chart.model_dump()
+
+
+def synthetic_charts(count: int, seed: int = 42) -> List[dict]:
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [synthetic_chart(rng, start + timedelta(minutes=i)) for i in range(count)]
+
+
+def _matches(doc: Dict, query: Dict) -> bool:
+    for field, condition in query.items():
+        if field == "$or":
+            if not any(_matches(doc, branch) for branch in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = doc.get(field)
+            for op, operand in condition.items():
+                if op == "$lt" and not (value is not None and value < operand):
+                    return False
+                if op == "$in" and value not in operand:
+                    return False
+        elif doc.get(field) != condition:
+            return False
+    return True
+
+
+def _project(doc: Dict, projection: Optional[Dict]) -> Dict:
+    if not projection:
+        return doc
+    included = {field for field, flag in projection.items() if flag and field != "_id"}
+    if included:
+        return {field: doc[field] for field in included if field in doc}
+    return {field: value for field, value in doc.items() if projection.get(field, 1)}
+
+
+class MemoryCursor:
+    def __init__(self, collection: "MemoryCollection", query: Dict, projection: Optional[Dict]):
+        self.collection = collection
+        self.query = query
+        self.projection = projection
+        self._sort: List = []
+        self._limit = 0
+
+    def sort(self, keys):
+        self._sort = keys
+        return self
+
+    def limit(self, count: int):
+        self._limit = count
+        return self
+
+    def batch_size(self, size: int):
+        return self
+
+    def _documents(self) -> List[Dict]:
+        # Filtering and sorting run on the index fields only; just the
+        # returned page is decoded, as the server would send just that
+        rows = [row for row in self.collection.rows if _matches(row[0], self.query)]
+        for field, direction in reversed(self._sort):
+            rows.sort(key=lambda row: row[0][field], reverse=direction < 0)
+        if self._limit:
+            rows = rows[:self._limit]
+        return [_project(bson.decode(raw, CODEC_OPTIONS), self.projection) for _, raw in rows]
+
+    async def to_list(self, length: Optional[int] = None) -> List[Dict]:
+        docs = self._documents()
+        return docs[:length] if length else docs
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self._documents():
+            yield doc
+
+
+class MemoryCollection:
+    INDEXED = ("id", "created_at")
+
+    def __init__(self):
+        self.rows = []
+
+    def add(self, docs: List[Dict]):
+        # Synchronous seeding, for setting up a benchmark outside the event loop
+        for doc in docs:
+            self.rows.append(({field: doc.get(field) for field in self.INDEXED}, bson.encode(doc)))
+
+    async def insert_many(self, docs: List[Dict], ordered: bool = True):
+        self.add(docs)
+
+    def find(self, query: Optional[Dict] = None, projection: Optional[Dict] = None) -> MemoryCursor:
+        return MemoryCursor(self, query or {}, projection)
+
+    async def find_one(self, query: Dict, projection: Optional[Dict] = None) -> Optional[Dict]:
+        docs = self.find(query, projection).limit(1)._documents()
+        return docs[0] if docs else None
+
+    async def count_documents(self, query: Dict) -> int:
+        return sum(1 for index, _ in self.rows if _matches(index, query))
+
+    async def delete_one(self, query: Dict) -> SimpleNamespace:
+        for position, (index, _) in enumerate(self.rows):
+            if _matches(index, query):
+                del self.rows[position]
+                return SimpleNamespace(deleted_count=1)
+        return SimpleNamespace(deleted_count=0)
+
+
+class MemoryDatabase:
+    def __init__(self):
+        self._collections: Dict[str, MemoryCollection] = {}
+
+    def __getattr__(self, name: str) -> MemoryCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self._collections.setdefault(name, MemoryCollection())
+
+    def __getitem__(self, name: str) -> Any:
+        return getattr(self, name)
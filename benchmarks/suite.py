@@ -0,0 +1,178 @@
+"""Hot-path benchmarks with stored baselines and a regression gate.
+
+Usage: python benchmarks/suite.py [--only NAME ...] [--threshold 0.25]
+                                  [--save] [--baseline PATH]
+
+Each benchmark reports the median time per call over ``--rounds`` rounds.
+Results are compared with the baseline file (benchmarks/baselines.json);
+the script exits with status 1 if any benchmark is slower than its
+baseline by more than the threshold. ``--save`` records the current run
+as the new baseline. Baselines only compare on the machine that wrote
+them; a hostname or Python mismatch is reported before the comparison.
+
+API benchmarks drive the ASGI app in-process against an in-memory
+database (memory_db.py), so they measure routing, decoding, validation
+and serialization without MongoDB.
+
+One-off comparisons live beside this script as bench_*.py; the prefix
+keeps them from shadowing the backend modules they measure (aspects,
+chart_storage) when benchmarks/ is on the import path.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'astrology_bench')
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from astrology import ANGLES, calculate_aspects, calculate_natal_chart, get_zodiac_sign, init_ephemeris  # noqa: E402
+from chart_storage import to_storage  # noqa: E402
+from memory_db import MemoryDatabase, synthetic_charts  # noqa: E402
+from models import NatalChart  # noqa: E402
+
+BASELINE_PATH = Path(__file__).resolve().parent / 'baselines.json'
+API_CHARTS = 1000
+
+
+def measure(fn: Callable, rounds: int, min_round_seconds: float = 0.05) -> float:
+    """Median seconds per call; each round runs enough calls to last
+    ``min_round_seconds`` so that timer resolution does not matter."""
+    fn()
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - started >= min_round_seconds:
+            break
+        number *= 2
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - started) / number)
+    return statistics.median(samples)
+
+
+def calculation_benchmarks() -> Dict[str, Callable]:
+    init_ephemeris()
+    chart = NatalChart(**synthetic_charts(1)[0])
+    points = [p.model_dump() for p in chart.planets if p.name not in ANGLES]
+    return {
+        "get_zodiac_sign": lambda: get_zodiac_sign(123.4),
+        "calculate_aspects": lambda: calculate_aspects(points),
+        # Kyiv, so the timezone lookup hits the grid index after the first call
+        "calculate_natal_chart": lambda: calculate_natal_chart("1990-05-14", "12:00", 50.45, 30.52),
+        "natal_chart_model_dump_json": chart.model_dump_json,
+        "natal_chart_response_render": lambda: JSONResponse(jsonable_encoder(chart)).body,
+    }
+
+
+def api_benchmarks() -> Dict[str, Callable]:
+    import httpx
+    import server
+
+    # server configures INFO logging; httpx would log every request
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    docs = synthetic_charts(API_CHARTS)
+    server.db = server.list_db = MemoryDatabase()
+    server.db.natal_charts.add([to_storage(dict(doc)) for doc in docs])
+    chart_id = docs[len(docs) // 2]["id"]
+
+    loop = asyncio.new_event_loop()
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app), base_url="http://bench")
+
+    def get(url: str) -> Callable:
+        def call():
+            response = loop.run_until_complete(client.get(url))
+            response.raise_for_status()
+        return call
+
+    return {
+        "api_get_chart": get(f"/api/natal-charts/{chart_id}"),
+        "api_list_charts_full": get("/api/natal-charts?limit=100"),
+        "api_list_charts_summary": get("/api/natal-charts?limit=100&view=summary"),
+    }
+
+
+def run(names: List[str], rounds: int) -> Dict[str, float]:
+    benchmarks = {**calculation_benchmarks(), **api_benchmarks()}
+    results = {}
+    for name, fn in benchmarks.items():
+        if names and name not in names:
+            continue
+        try:
+            results[name] = measure(fn, rounds)
+        except Exception as e:
+            # e.g. the Swiss Ephemeris data files for Chiron are not installed
+            print(f"{name:<32} skipped: {e}")
+            continue
+        print(f"{name:<32} {results[name] * 1e6:12.1f} us")
+    return results
+
+
+def environment() -> Dict[str, str]:
+    return {"host": platform.node(), "python": platform.python_version(), "machine": platform.machine()}
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[str]:
+    regressions = []
+    for name, seconds in results.items():
+        if name not in baseline:
+            continue
+        change = seconds / baseline[name] - 1
+        flag = "REGRESSION" if change > threshold else ""
+        print(f"{name:<32} {baseline[name] * 1e6:12.1f} -> {seconds * 1e6:12.1f} us  {change:+7.1%}  {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--only', nargs='*', default=[])
+    parser.add_argument('--rounds', type=int, default=7)
+    parser.add_argument('--threshold', type=float, default=0.25)
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--save', action='store_true')
+    args = parser.parse_args()
+
+    results = run(args.only, args.rounds)
+
+    if args.save:
+        stored = json.loads(args.baseline.read_text()) if args.baseline.exists() else {"results": {}}
+        stored["environment"] = environment()
+        stored["results"].update({name: round(seconds, 9) for name, seconds in results.items()})
+        args.baseline.write_text(json.dumps(stored, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save first")
+        return
+    stored = json.loads(args.baseline.read_text())
+    if stored.get("environment") != environment():
+        print(f"Baseline recorded on {stored.get('environment')}, running on {environment()}")
+    print(f"Against baseline (threshold {args.threshold:.0%}):")
+    regressions = compare(results, stored["results"], args.threshold)
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Timezone resolution: direct TimezoneFinder lookups vs the H3 grid index.
+
+Usage: python benchmarks/timezone_lookup.py [--points N] [--spread DEG]
+
+Lookups are drawn around a handful of cities, matching how chart requests
+cluster in practice. The cold-miss phase uses scattered points that each
+land in a new cell, the cost of a birth place seen for the first time.
+Peak RSS is reported after each phase.
+"""
+import argparse
+import random
+import resource
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+CITIES = [(50.45, 30.52), (49.84, 24.03), (46.48, 30.72), (52.23, 21.01), (40.71, -74.0), (48.85, 2.35)]
+
+
+def rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def sample_points(count: int, spread: float):
+    rng = random.Random(42)
+    return [
+        (lat + rng.uniform(-spread, spread), lon + rng.uniform(-spread, spread))
+        for lat, lon in (rng.choice(CITIES) for _ in range(count))
+    ]
+
+
+def scattered_points(count: int):
+    # Europe and the continental US, one point per ~0.05° so cells rarely repeat
+    rng = random.Random(7)
+    boxes = [(36.0, 60.0, -10.0, 40.0), (30.0, 48.0, -120.0, -75.0)]
+    return [
+        (rng.uniform(lat0, lat1), rng.uniform(lon0, lon1))
+        for lat0, lat1, lon0, lon1 in (rng.choice(boxes) for _ in range(count))
+    ]
+
+
+def timed(label: str, fn, points):
+    started = time.perf_counter()
+    for lat, lon in points:
+        fn(lat, lon)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed / len(points) * 1e6:8.1f} us/lookup   peak RSS {rss_mb():7.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--points', type=int, default=20000)
+    parser.add_argument('--spread', type=float, default=0.5)
+    args = parser.parse_args()
+    points = sample_points(args.points, args.spread)
+    scattered = scattered_points(min(args.points, 5000))
+
+    print(f"{'baseline':<28} {'':>19}   peak RSS {rss_mb():7.1f} MB")
+
+    from timezones import TimezoneResolver
+    resolver = TimezoneResolver()
+    print(f"{'resolver created (lazy)':<28} {'':>19}   peak RSS {rss_mb():7.1f} MB")
+
+    started = time.perf_counter()
+    finder = resolver.finder
+    print(f"{'finder loaded':<28} {(time.perf_counter() - started) * 1e3:8.1f} ms           peak RSS {rss_mb():7.1f} MB")
+
+    timed("TimezoneFinder.timezone_at", lambda lat, lon: finder.timezone_at(lat=lat, lng=lon), points)
+    timed("index, cold", resolver.timezone_name, points)
+    # Cells are resolved when a second point lands in them
+    timed("index, second pass", resolver.timezone_name, points)
+    timed("index, warm", resolver.timezone_name, points)
+    timed("TimezoneFinder, scattered", lambda lat, lon: finder.timezone_at(lat=lat, lng=lon), scattered)
+    timed("index, cold miss", resolver.timezone_name, scattered)
+    print(resolver.metrics())
+
+
+if __name__ == '__main__':
+    main()
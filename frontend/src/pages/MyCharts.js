@@ -15,7 +15,7 @@ const MyCharts = () => {
 
   const fetchCharts = async () => {
     try {
-      const response = await axios.get(`${API}/natal-charts`);
+      const response = await axios.get(`${API}/natal-charts`, { params: { view: 'summary' } });
       setCharts(response.data);
     } catch (error) {
       console.error('Error fetching charts:', error);
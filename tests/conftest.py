@@ -0,0 +1,100 @@
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# The backend is run as a flat module directory (uvicorn server:app)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'astrology_test')
+
+
+@pytest.fixture
+def ephemeris():
+    # Chiron needs the seas_*.se1 data files; skip when they are not installed
+    import swisseph as swe
+    import astrology
+
+    astrology.init_ephemeris()
+    try:
+        swe.calc_ut(2447932.5, swe.CHIRON)
+    except swe.Error as e:
+        pytest.skip(f"Swiss Ephemeris data files unavailable: {e}")
+
+
+def _matches(doc, query):
+    # Just the filter shapes the code under test sends: equality, $exists and $ne
+    for field, condition in query.items():
+        if isinstance(condition, dict):
+            if "$exists" in condition and (field in doc) != condition["$exists"]:
+                return False
+            if "$ne" in condition and doc.get(field) == condition["$ne"]:
+                return False
+        elif doc.get(field) != condition:
+            return False
+    return True
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+        self.requested_batch = None
+
+    def batch_size(self, size):
+        self.requested_batch = size
+        return self
+
+    async def to_list(self, length):
+        return [dict(doc) for doc in self.docs]
+
+    async def __aiter__(self):
+        for doc in self.docs:
+            yield dict(doc)
+
+
+class FakeCollection:
+    """A list of documents behind the Motor calls the bulk paths make.
+
+    ``bulk_write`` applies ``$set``, ``$unset`` and upserting
+    ``$setOnInsert`` updates and records each batch in ``writes``.
+    """
+
+    def __init__(self, docs=()):
+        self.docs = list(docs)
+        self.finds = 0
+        self.writes = []
+
+    def find(self, query=None, projection=None):
+        self.finds += 1
+        return FakeCursor([doc for doc in self.docs if _matches(doc, query or {})])
+
+    async def count_documents(self, query):
+        return sum(1 for doc in self.docs if _matches(doc, query))
+
+    async def bulk_write(self, requests, ordered=True):
+        self.writes.append(list(requests))
+        result = SimpleNamespace(matched_count=0, modified_count=0, upserted_count=0)
+        for request in requests:
+            update = request._doc
+            doc = next((doc for doc in self.docs if _matches(doc, request._filter)), None)
+            if doc is None:
+                if request._upsert:
+                    self.docs.append({**request._filter, **update.get("$setOnInsert", {}), **update.get("$set", {})})
+                    result.upserted_count += 1
+                continue
+            result.matched_count += 1
+            before = dict(doc)
+            doc.update(update.get("$set", {}))
+            for field in update.get("$unset", {}):
+                doc.pop(field, None)
+            result.modified_count += doc != before
+        return result
+
+
+@pytest.fixture
+def fake_collection():
+    # Called with the documents to start from: fake_collection([...])
+    return FakeCollection
@@ -0,0 +1,218 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from benchmarks.memory_db import MemoryDatabase, synthetic_charts
+from byte_cache import ByteCache
+from chart_cache import ChartCache, PairCache
+from chart_storage import unpack_chart
+from interpretations import InterpretationCatalogue
+from models import Interpretation
+from readings import reading_keys
+from synastry import composite_chart, synastry_aspects
+
+BIRTH = {"name": "Тест", "birth_date": "1990-05-14", "birth_time": "12:00",
+         "birth_location": "Київ, Україна", "latitude": 50.45, "longitude": 30.52}
+
+
+@pytest.fixture
+def api(monkeypatch):
+    # The app over the in-memory database the benchmarks use, with empty caches
+    import server
+
+    memory = MemoryDatabase()
+    docs = synthetic_charts(3)
+    memory.natal_charts.add([server.natal_chart_to_doc(dict(doc)) for doc in docs])
+    monkeypatch.setattr(server, "db", memory)
+    monkeypatch.setattr(server, "list_db", memory)
+    monkeypatch.setattr(server, "chart_writes", memory.natal_charts)
+    monkeypatch.setattr(server, "chart_cache", ChartCache())
+    monkeypatch.setattr(server, "pair_cache", PairCache())
+    monkeypatch.setattr(server, "chart_response_cache", ByteCache(max_bytes=1 << 20))
+    monkeypatch.setattr(server, "wheel_cache", ByteCache(max_bytes=1 << 20))
+    monkeypatch.setattr(server, "interpretation_catalogue", InterpretationCatalogue(memory.interpretations))
+    return server, [doc["id"] for doc in docs]
+
+
+@pytest.fixture
+def engine(api, monkeypatch):
+    # Stored positions stand in for the ephemeris, which needs data files;
+    # a record at latitude 0 fails in the "worker", as a bad record would
+    server, _ = api
+    computed = {field: synthetic_charts(1)[0][field] for field in ("planets", "houses", "aspects")}
+
+    async def run_waiting(fn, records):
+        return [(False, "No convergence") if latitude == 0 else (True, computed)
+                for _, latitude, _, _ in records]
+
+    monkeypatch.setattr(server.chart_engine, "run_waiting", run_waiting)
+    return server
+
+
+def run(app, scenario):
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await scenario(client)
+
+    return asyncio.run(main())
+
+
+def test_matching_etag_is_not_modified(api):
+    server, (chart_id, *_) = api
+
+    async def scenario(client):
+        first = await client.get(f"/api/natal-charts/{chart_id}")
+        again = await client.get(f"/api/natal-charts/{chart_id}", headers={"If-None-Match": first.headers["etag"]})
+        return first, again
+
+    first, again = run(server.app, scenario)
+
+    assert first.status_code == 200
+    assert again.status_code == 304
+    assert again.headers["etag"] == first.headers["etag"]
+
+
+def test_any_etag_does_not_match_a_missing_chart(api):
+    server, _ = api
+
+    async def scenario(client):
+        return await client.get("/api/natal-charts/missing", headers={"If-None-Match": "*"})
+
+    assert run(server.app, scenario).status_code == 404
+
+
+def test_etag_of_a_deleted_chart_is_not_found(api):
+    server, (chart_id, *_) = api
+
+    async def scenario(client):
+        first = await client.get(f"/api/natal-charts/{chart_id}")
+        wheel = await client.get(f"/api/natal-charts/{chart_id}/wheel.svg")
+        await client.delete(f"/api/natal-charts/{chart_id}")
+        chart_after = await client.get(f"/api/natal-charts/{chart_id}", headers={"If-None-Match": first.headers["etag"]})
+        wheel_after = await client.get(f"/api/natal-charts/{chart_id}/wheel.svg",
+                                       headers={"If-None-Match": wheel.headers["etag"]})
+        return chart_after, wheel_after
+
+    chart_after, wheel_after = run(server.app, scenario)
+
+    assert chart_after.status_code == 404
+    assert wheel_after.status_code == 404
+
+
+def post_batch(server, body, content_type):
+    async def scenario(client):
+        response = await client.post("/api/natal-charts/batch", content=body, headers={"Content-Type": content_type})
+        return response, [json.loads(line) for line in response.text.splitlines()]
+
+    return run(server.app, scenario)
+
+
+def test_batch_reports_each_record_in_order(engine):
+    records = [BIRTH, {**BIRTH, "latitude": 0.0}, {"name": "no birth data"}]
+
+    response, results = post_batch(engine, json.dumps(records), "application/json")
+
+    assert response.status_code == 200
+    assert [(r["index"], r["status"]) for r in results] == [(0, "ok"), (1, "error"), (2, "error")]
+    assert results[1]["error"] == "No convergence"
+    assert "birth_date" in results[2]["error"]
+    stored = asyncio.run(engine.db.natal_charts.find_one({"id": results[0]["chart"]["id"]}))
+    assert stored["name"] == BIRTH["name"]
+
+
+def test_batch_reads_ndjson(engine):
+    body = "\n".join([json.dumps(BIRTH), "{not json", json.dumps(BIRTH)]) + "\n"
+
+    response, results = post_batch(engine, body, "application/x-ndjson")
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [r["status"] for r in results] == ["ok", "error", "ok"]
+
+
+def test_batch_over_the_record_limit_is_refused(engine, monkeypatch):
+    monkeypatch.setattr(engine, "BATCH_MAX_RECORDS", 2)
+
+    response, _ = post_batch(engine, json.dumps([BIRTH] * 3), "application/json")
+
+    assert response.status_code == 400
+
+
+def test_reading_joins_the_chart_to_its_interpretations(api):
+    server, (chart_id, *_) = api
+    chart = unpack_chart(asyncio.run(server.db.natal_charts.find_one({"id": chart_id})))
+    category, _, (key, *_) = reading_keys(chart)[0]
+    interpretation = Interpretation(category=category, key=key, title="Заголовок", content="Зміст")
+    server.db.interpretations.add([interpretation.model_dump()])
+
+    async def scenario(client):
+        return (await client.get(f"/api/natal-charts/{chart_id}/reading"),
+                await client.get("/api/natal-charts/missing/reading"))
+
+    reading, missing = run(server.app, scenario)
+
+    body = reading.json()
+    assert reading.status_code == 200
+    assert body["entries"][0]["key"] == key
+    assert body["entries"][0]["interpretations"][0]["title"] == "Заголовок"
+    assert key not in body["missing_keys"]
+    assert len(body["entries"]) + len(body["missing_keys"]) == len(reading_keys(chart))
+    assert missing.status_code == 404
+
+
+def stored(server, chart_id):
+    return unpack_chart(asyncio.run(server.db.natal_charts.find_one({"id": chart_id})))
+
+
+def test_synastry_of_stored_charts(api):
+    server, (first, second, third) = api
+
+    async def scenario(client):
+        single = await client.post("/api/synastry", json={"chart_id": first, "partner_id": second})
+        batch = await client.post("/api/synastry/batch",
+                                  json={"chart_id": first, "partner_ids": [second, third, second]})
+        missing = await client.post("/api/synastry", json={"chart_id": first, "partner_id": "missing"})
+        return single, batch, missing
+
+    single, batch, missing = run(server.app, scenario)
+
+    expected = synastry_aspects(stored(server, first), [stored(server, second), stored(server, third)])
+    assert single.status_code == 200
+    assert single.json() == {"chart_id": first, "partner_id": second, "aspects": expected[0]}
+    # Duplicate partners are answered once, in first-seen order
+    assert [(r["partner_id"], r["aspects"]) for r in batch.json()] == [(second, expected[0]), (third, expected[1])]
+    assert missing.status_code == 404
+    assert "missing" in missing.json()["detail"]
+
+
+def test_synastry_batch_over_the_partner_limit_is_refused(api, monkeypatch):
+    server, (first, second, third) = api
+    monkeypatch.setattr(server, "SYNASTRY_MAX_PARTNERS", 1)
+
+    async def scenario(client):
+        return await client.post("/api/synastry/batch", json={"chart_id": first, "partner_ids": [second, third]})
+
+    assert run(server.app, scenario).status_code == 400
+
+
+def test_composite_of_stored_charts(api):
+    server, (first, second, _) = api
+
+    async def scenario(client):
+        return (await client.post("/api/composite", json={"chart_id": second, "partner_id": first}),
+                await client.post("/api/composite", json={"chart_id": first, "partner_id": first}))
+
+    composite, same = run(server.app, scenario)
+
+    body = composite.json()
+    chart_ids = sorted([first, second])
+    charts = [stored(server, chart_id) for chart_id in chart_ids]
+    expected = composite_chart(*charts)
+    assert composite.status_code == 200
+    assert body["chart_ids"] == chart_ids
+    assert body["names"] == [chart["name"] for chart in charts]
+    assert body["aspects"] == expected["aspects"]
+    assert [p["longitude"] for p in body["planets"]] == pytest.approx([p["longitude"] for p in expected["planets"]])
+    assert same.status_code == 400
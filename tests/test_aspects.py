@@ -0,0 +1,56 @@
+import random
+
+import numpy as np
+
+from aspects import FULL_TABLE, MAJOR_ASPECTS, find_aspects, to_dicts
+from astrology import calculate_aspects
+
+
+def reference_aspects(planets):
+    # The original nested-loop implementation, kept as the behavioural spec
+    found = []
+    for i in range(len(planets)):
+        for j in range(i + 1, len(planets)):
+            angle = abs(planets[i]['longitude'] - planets[j]['longitude'])
+            if angle > 180:
+                angle = 360 - angle
+            for asp_angle, (asp_name, orb) in MAJOR_ASPECTS.items():
+                diff = abs(angle - asp_angle)
+                if diff <= orb:
+                    found.append((planets[i]['name'], planets[j]['name'], asp_name, angle, diff))
+                    break
+    return found
+
+
+def test_calculate_aspects_matches_the_nested_loop():
+    rng = random.Random(7)
+    for _ in range(50):
+        planets = [{'name': f"p{i}", 'longitude': rng.uniform(0, 360)} for i in range(16)]
+
+        result = [tuple(a.values()) for a in calculate_aspects(planets)]
+
+        assert result == reference_aspects(planets)
+
+
+def test_cross_mode_compares_every_pair():
+    hits = find_aspects([0.0, 90.0], [180.0, 92.0])
+
+    assert list(zip(hits.first.tolist(), hits.second.tolist())) == [(0, 0), (0, 1), (1, 0), (1, 1)]
+    aspects = to_dicts(hits, ["a", "b"], ["c", "d"])
+    assert [(a["planet1"], a["planet2"], a["aspect_type"]) for a in aspects] == [
+        ("a", "c", "Опозиція"), ("a", "d", "Квадрат"), ("b", "c", "Квадрат"), ("b", "d", "Кон'юнкція"),
+    ]
+
+
+def test_minor_aspects_table():
+    hits = find_aspects([0.0, 151.0], table=FULL_TABLE)
+
+    assert [FULL_TABLE.names[k] for k in hits.kind] == ["Квінконс"]
+    assert np.isclose(hits.orb[0], 1.0)
+
+
+def test_no_aspects_yields_empty_arrays():
+    hits = find_aspects([0.0, 20.0])
+
+    assert len(hits) == 0
+    assert to_dicts(hits, ["a", "b"]) == []
@@ -0,0 +1,61 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+import jwt
+import pytest
+
+from auth import PrincipalCache, create_access_token, decode_access_token, hash_password, verify_password
+
+SECRET = "test-secret-that-is-at-least-32-bytes"
+
+
+def test_access_token_carries_iat_and_exp():
+    payload = decode_access_token(create_access_token("admin", SECRET), SECRET)
+
+    assert payload["sub"] == "admin"
+    assert payload["exp"] > payload["iat"]
+
+
+def test_tokens_without_expiry_are_rejected():
+    legacy = jwt.encode({"sub": "admin"}, SECRET, algorithm="HS256")
+
+    with pytest.raises(jwt.MissingRequiredClaimError):
+        decode_access_token(legacy, SECRET)
+
+
+def test_expired_tokens_are_rejected():
+    past = datetime.now(timezone.utc) - timedelta(hours=1)
+    expired = jwt.encode({"sub": "admin", "iat": past, "exp": past}, SECRET, algorithm="HS256")
+
+    with pytest.raises(jwt.ExpiredSignatureError):
+        decode_access_token(expired, SECRET)
+
+
+def test_password_hashing_round_trip_off_the_event_loop():
+    async def scenario():
+        hashed = await hash_password("s3cret")
+        return await verify_password("s3cret", hashed), await verify_password("wrong", hashed)
+
+    assert asyncio.run(scenario()) == (True, False)
+
+
+def test_principal_cache_expires_and_invalidates():
+    cache = PrincipalCache(ttl_seconds=0.05)
+    cache.add("alice")
+    cache.add("bob")
+
+    assert cache.contains("alice")
+    cache.invalidate("alice")
+    assert not cache.contains("alice")
+    time.sleep(0.06)
+    assert not cache.contains("bob")
+
+
+def test_principal_cache_is_bounded():
+    cache = PrincipalCache(max_entries=2)
+    for name in ("a", "b", "c"):
+        cache.add(name)
+
+    assert not cache.contains("a")
+    assert cache.contains("c")
@@ -0,0 +1,108 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from astrology import birth_julian_day, calculate_charts_data
+from batch_import import iter_groups, read_records, stream_ndjson_records
+
+
+def make_request(chunks, content_type):
+    messages = [{"type": "http.request", "body": c, "more_body": True} for c in chunks]
+    messages.append({"type": "http.request", "body": b"", "more_body": False})
+
+    async def receive():
+        return messages.pop(0)
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "headers": [(b"content-type", content_type.encode())],
+    }
+    return Request(scope, receive)
+
+
+async def collect(request, max_records):
+    records = await read_records(request, max_records)
+    return [record async for record in records]
+
+
+def test_ndjson_lines_split_across_chunks():
+    request = make_request([b'{"a": 1}\n{"a"', b': 2}\nnot json\n{"a": 3}'], "application/x-ndjson")
+
+    records = asyncio.run(collect(request, 10))
+
+    assert [index for index, _ in records] == [0, 1, 2, 3]
+    assert records[1][1] == {"a": 2}
+    assert isinstance(records[2][1], ValueError)
+    assert records[3][1] == {"a": 3}
+
+
+def test_ndjson_limit_is_rejected_up_front():
+    request = make_request([b'{}\n{}\n{}\n'], "application/x-ndjson")
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(read_records(request, 2))
+    assert exc.value.status_code == 400
+
+
+def test_json_array_limit_is_rejected_up_front():
+    request = make_request([json.dumps([{}, {}, {}]).encode()], "application/json")
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(read_records(request, 2))
+    assert exc.value.status_code == 400
+
+
+def test_iter_groups_keeps_remainder():
+    async def scenario():
+        async def records():
+            for i in range(5):
+                yield i, {}
+        return [len(g) async for g in iter_groups(records(), 2)]
+
+    assert asyncio.run(scenario()) == [2, 2, 1]
+
+
+def test_calculate_charts_data_reports_errors_per_record():
+    results = calculate_charts_data([("not-a-julian-day", 50.45, 30.52)])
+
+    assert len(results) == 1
+    assert results[0][0] is False
+
+
+def test_calculate_charts_data_preserves_input_order(ephemeris):
+    records = [
+        (birth_julian_day("2000-01-01", "12:00", 50.45, 30.52), 50.45, 30.52),
+        (birth_julian_day("1980-06-15", "08:30", 50.45, 30.52), 50.45, 30.52),
+    ]
+
+    results = calculate_charts_data(records)
+
+    assert all(ok for ok, _ in results)
+    assert results[0][1]['planets'][2]['sign'] == "Козеріг"
+
+
+def test_streamed_ndjson_holds_lines_across_chunks():
+    request = make_request([b'{"a": 1}\n{"a"', b': 2}\n\nnot json\n{"a": 3}'], "application/x-ndjson")
+
+    async def scenario():
+        return [record async for record in stream_ndjson_records(request)]
+
+    records = asyncio.run(scenario())
+
+    assert [(i, r) for i, r in records if not isinstance(r, Exception)] == [(0, {"a": 1}), (1, {"a": 2}), (4, {"a": 3})]
+    assert isinstance(records[2][1], ValueError) and "line 4" in str(records[2][1])
+
+
+def test_streamed_ndjson_rejects_oversized_lines():
+    request = make_request([b"x" * 64], "application/x-ndjson")
+
+    async def scenario():
+        return [record async for record in stream_ndjson_records(request, max_line_bytes=16)]
+
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(scenario())
+    assert excinfo.value.status_code == 413
@@ -0,0 +1,32 @@
+from byte_cache import ByteCache
+
+
+def test_evicts_least_recently_used_by_size():
+    cache = ByteCache(max_bytes=10)
+    cache.put("a|1", b"xxxx")
+    cache.put("b|1", b"xxxx")
+    assert cache.get("a|1") == b"xxxx"
+
+    cache.put("c|1", b"xxxx")
+
+    assert cache.get("b|1") is None
+    assert cache.metrics()["bytes"] == 8
+
+
+def test_oversized_values_are_not_cached():
+    cache = ByteCache(max_bytes=4)
+    cache.put("a|1", b"xxxxx")
+
+    assert cache.get("a|1") is None
+
+
+def test_forget_drops_every_variant_of_a_resource():
+    cache = ByteCache()
+    cache.put("a|svg", b"1")
+    cache.put("a|png", b"2")
+    cache.put("ab|svg", b"3")
+
+    cache.forget("a")
+
+    assert cache.get("a|svg") is None and cache.get("a|png") is None
+    assert cache.get("ab|svg") == b"3"
@@ -0,0 +1,64 @@
+import asyncio
+
+from chart_cache import ChartCache, PairCache, chart_cache_key, pair_cache_key
+
+
+def test_key_ignores_sub_resolution_jitter():
+    assert chart_cache_key(2451545.0, 50.45, 30.52) == chart_cache_key(2451545.0000001, 50.450001, 30.52)
+
+
+def test_key_depends_on_house_system_and_version():
+    base = chart_cache_key(2451545.0, 50.45, 30.52)
+
+    assert chart_cache_key(2451545.0, 50.45, 30.52, house_system="K") != base
+    assert chart_cache_key(2451545.0, 50.45, 30.52, version="other") != base
+    assert chart_cache_key(2451545.0, 50.46, 30.52) != base
+
+
+def test_lru_tier_counts_hits_and_evicts_oldest():
+    cache = ChartCache(max_entries=2)
+
+    async def scenario():
+        await cache.put("a", {"planets": []})
+        await cache.put("b", {"planets": []})
+        assert await cache.get("a") is not None
+        await cache.put("c", {"planets": []})
+        assert await cache.get("b") is None
+        assert await cache.get("c") is not None
+
+    asyncio.run(scenario())
+    metrics = cache.metrics()
+    assert metrics['hits'] == 2
+    assert metrics['misses'] == 1
+    assert metrics['entries'] == 2
+
+
+def test_invalidate_clears_memory_tier():
+    cache = ChartCache()
+
+    async def scenario():
+        await cache.put("a", {"planets": []})
+        await cache.invalidate()
+        return await cache.get("a")
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_pair_key_is_symmetric_only_for_composites():
+    assert pair_cache_key("composite", "a", "b") == pair_cache_key("composite", "b", "a")
+    assert pair_cache_key("synastry", "a", "b") != pair_cache_key("synastry", "b", "a")
+    assert pair_cache_key("synastry", "a", "b", version="other") != pair_cache_key("synastry", "a", "b")
+
+
+def test_forget_chart_drops_every_pair_it_belongs_to():
+    cache = PairCache()
+
+    async def scenario():
+        await cache.put_pair(pair_cache_key("synastry", "a", "b"), {"aspects": []}, ("a", "b"))
+        await cache.put_pair(pair_cache_key("composite", "c", "a"), {"planets": []}, ("a", "c"))
+        await cache.put_pair(pair_cache_key("synastry", "b", "c"), {"aspects": []}, ("b", "c"))
+        await cache.forget_chart("a")
+        return [await cache.get(pair_cache_key(*key)) for key in
+                (("synastry", "a", "b"), ("composite", "a", "c"), ("synastry", "b", "c"))]
+
+    assert asyncio.run(scenario()) == [None, None, {"aspects": []}]
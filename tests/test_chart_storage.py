@@ -0,0 +1,90 @@
+import asyncio
+import random
+
+import bson
+
+from astrology import ANGLES, assign_houses, calculate_aspects, get_degree_in_sign, get_zodiac_sign
+import chart_storage
+from chart_storage import (
+    POINT_NAMES, chart_projection, is_current, migrate_charts, outdated_filter, pack_chart, to_storage, unpack_chart,
+)
+from models import NatalChart
+
+
+def stored_chart(seed=1):
+    rng = random.Random(seed)
+    planets = []
+    for name in POINT_NAMES:
+        lon = rng.uniform(0, 360)
+        planets.append({'name': name, 'longitude': lon, 'latitude': rng.uniform(-5, 5), 'speed': rng.uniform(-1, 13),
+                        'sign': get_zodiac_sign(lon), 'degree': get_degree_in_sign(lon)})
+    start = rng.uniform(0, 360)
+    cusps = [(start + 30 * i + rng.uniform(-10, 10)) % 360 for i in range(12)]
+    assign_houses(planets, cusps)
+    chart = NatalChart(
+        name="Test", birth_date="1990-05-14", birth_time="12:00", birth_location="Kyiv",
+        latitude=50.45, longitude=30.52, planets=planets,
+        houses=[{'number': i + 1, 'cusp': c, 'sign': get_zodiac_sign(c)} for i, c in enumerate(cusps)],
+        aspects=calculate_aspects([p for p in planets if p['name'] not in ANGLES]),
+    )
+    return chart.model_dump()
+
+
+def test_compact_documents_round_trip_exactly():
+    for seed in range(20):
+        doc = stored_chart(seed)
+
+        stored = bson.decode(bson.encode(to_storage(dict(doc))))
+
+        assert "planets" not in stored
+        # BSON dates are millisecond precision; everything else must be exact
+        assert NatalChart(**unpack_chart(stored)).model_dump(exclude={"created_at"}) == \
+            NatalChart(**doc).model_dump(exclude={"created_at"})
+
+
+def test_compact_documents_are_much_smaller():
+    doc = stored_chart()
+
+    assert len(bson.encode(to_storage(dict(doc)))) * 3 < len(bson.encode(doc))
+
+
+def test_unknown_points_keep_the_full_form():
+    doc = stored_chart()
+    doc['planets'][0]['name'] = "Церера"
+
+    assert pack_chart(doc) is None
+    assert to_storage(doc) is doc
+
+
+def test_full_form_can_be_forced(monkeypatch):
+    monkeypatch.setenv('CHART_STORAGE_FORMAT', 'full')
+    doc = stored_chart()
+
+    assert to_storage(doc) is doc
+    assert unpack_chart(doc) is doc
+
+
+def test_projection_pulls_in_packed_fields_only_when_needed():
+    assert chart_projection("id", "name") == {"_id": 0, "id": 1, "name": 1}
+    assert {"points", "positions", "aspect_pairs"} <= set(chart_projection("planets"))
+
+
+def test_migration_compacts_and_expands_stored_charts(fake_collection):
+    originals = [{"_id": i, **stored_chart(i)} for i in range(5)]
+    collection = fake_collection([dict(doc) for doc in originals])
+
+    counts = asyncio.run(migrate_charts(collection, batch_size=2))
+    assert counts == {"migrated": 5, "skipped": 0}
+    assert all(doc["format"] == 1 and "planets" not in doc for doc in collection.docs)
+
+    asyncio.run(migrate_charts(collection, compact=False))
+    assert collection.docs == originals
+
+
+def test_charts_without_a_version_are_legacy(monkeypatch):
+    assert is_current({}) and is_current({"calculation_version": "1"})
+    assert outdated_filter() == {"calculation_version": {"$exists": True, "$ne": "1"}}
+
+    monkeypatch.setattr(chart_storage, "CALCULATION_VERSION", "2")
+    assert not is_current({}) and is_current({"calculation_version": "2"})
+    assert outdated_filter() == {"calculation_version": {"$ne": "2"}}
@@ -0,0 +1,56 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from astrology import get_zodiac_sign
+from compute_engine import ChartComputeEngine, EngineOverloaded, WorkerCrashed
+
+
+@pytest.fixture
+def engine():
+    engine = ChartComputeEngine(max_workers=1, max_pending=1)
+    yield engine
+    engine.shutdown()
+
+
+def test_run_executes_in_worker_and_records_metrics(engine):
+    result = asyncio.run(engine.run(get_zodiac_sign, 95.0))
+
+    assert result == "Рак"
+    metrics = engine.metrics()
+    assert metrics['completed'] == 1
+    assert metrics['pending'] == 0
+    assert metrics['compute_seconds_total'] >= 0
+
+
+def test_run_rejects_when_queue_is_full(engine):
+    async def scenario():
+        slow = asyncio.create_task(engine.run(time.sleep, 0.5))
+        await asyncio.sleep(0)
+        with pytest.raises(EngineOverloaded):
+            await engine.run(get_zodiac_sign, 10.0)
+        await slow
+
+    asyncio.run(scenario())
+    assert engine.metrics()['rejected'] == 1
+    assert engine.metrics()['completed'] == 1
+
+
+def test_worker_errors_are_counted_and_propagated(engine):
+    with pytest.raises(ValueError):
+        asyncio.run(engine.run(int, "not a number"))
+    assert engine.metrics()['failed'] == 1
+
+
+def test_a_dead_worker_is_replaced(engine):
+    async def scenario():
+        # The job kills its worker, and the replacement on the retry
+        with pytest.raises(WorkerCrashed):
+            await engine.run(os._exit, 1)
+        return await engine.run(get_zodiac_sign, 95.0)
+
+    assert asyncio.run(scenario()) == "Рак"
+    assert engine.metrics()['restarts'] == 2
+    assert engine.metrics()['failed'] == 1
@@ -0,0 +1,55 @@
+import pytest
+from pymongo import ReadPreference
+
+from database import chart_write_concern, client_options, create_client, list_read_preference, list_reads
+
+
+def test_pool_options_come_from_the_environment(monkeypatch):
+    monkeypatch.setenv("MONGO_MAX_POOL_SIZE", "20")
+
+    options = client_options("mongodb://localhost:27017")
+
+    assert options["maxPoolSize"] == 20
+    assert options["serverSelectionTimeoutMS"] == 5000
+
+
+def test_options_in_the_url_take_precedence(monkeypatch):
+    monkeypatch.setenv("MONGO_MAX_POOL_SIZE", "20")
+
+    options = client_options("mongodb://localhost:27017/?maxpoolsize=5&socketTimeoutMS=100")
+
+    assert "maxPoolSize" not in options
+    assert "socketTimeoutMS" not in options
+
+    client = create_client("mongodb://localhost:27017/?maxpoolsize=5")
+    try:
+        assert client.options.pool_options.max_pool_size == 5
+    finally:
+        client.close()
+
+
+def test_list_reads_prefer_secondaries_by_default(monkeypatch):
+    monkeypatch.delenv("MONGO_LIST_READ_PREFERENCE", raising=False)
+    monkeypatch.setenv("MONGO_MAX_STALENESS_SECONDS", "120")
+    client = create_client("mongodb://localhost:27017")
+    try:
+        preference = list_reads(client, "astrology_test").read_preference
+    finally:
+        client.close()
+
+    assert preference.mode == ReadPreference.SECONDARY_PREFERRED.mode
+    assert preference.max_staleness == 120
+
+
+def test_unknown_read_preference_is_rejected(monkeypatch):
+    monkeypatch.setenv("MONGO_LIST_READ_PREFERENCE", "fastest")
+
+    with pytest.raises(ValueError):
+        list_read_preference()
+
+
+@pytest.mark.parametrize("value, expected", [("1", 1), ("majority", "majority")])
+def test_chart_write_concern(monkeypatch, value, expected):
+    monkeypatch.setenv("MONGO_CHART_WRITE_CONCERN", value)
+
+    assert chart_write_concern().document["w"] == expected
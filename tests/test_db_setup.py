@@ -0,0 +1,83 @@
+import asyncio
+import os
+import uuid
+
+import pytest
+
+import db_setup
+
+# Filters used on hot paths, with the collection they run against
+HOT_QUERIES = [
+    ("natal_charts", {"id": "x"}),
+    ("interpretations", {"id": "x"}),
+    ("interpretations", {"category": "planet_in_sign"}),
+    ("interpretations", {"category": "planet_in_sign", "key": "sun_in_aries"}),
+    ("admins", {"username": "admin"}),
+    ("jobs", {"id": "x"}),
+    ("jobs", {"status": "queued"}),
+]
+
+
+def index_prefixes(collection):
+    return [[field for field, _ in index.document["key"].items()] for index in db_setup.INDEXES[collection]]
+
+
+@pytest.mark.parametrize("collection,query", HOT_QUERIES)
+def test_hot_queries_have_a_covering_index_prefix(collection, query):
+    fields = set(query)
+
+    assert any(set(prefix[:len(fields)]) == fields for prefix in index_prefixes(collection))
+
+
+@pytest.fixture
+def mongo_url():
+    url = os.environ.get("MONGO_TEST_URL")
+    if not url:
+        pytest.skip("MONGO_TEST_URL not set")
+    return url
+
+
+@pytest.mark.parametrize("collection,query", HOT_QUERIES)
+def test_hot_queries_use_an_index_scan(mongo_url, collection, query):
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    async def scenario():
+        client = AsyncIOMotorClient(mongo_url, tz_aware=True)
+        name = f"astrology_test_{uuid.uuid4().hex[:8]}"
+        db = client[name]
+        try:
+            await db_setup.apply(db)
+            assert await db_setup.missing_indexes(db) == {}
+            return await db[collection].find(query).explain()
+        finally:
+            await client.drop_database(name)
+            client.close()
+
+    plan = asyncio.run(scenario())
+    assert "IXSCAN" in str(plan["queryPlanner"]["winningPlan"])
+
+
+def test_string_dates_are_migrated_in_place(mongo_url):
+    from datetime import datetime, timezone
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    async def scenario():
+        client = AsyncIOMotorClient(mongo_url, tz_aware=True)
+        name = f"astrology_test_{uuid.uuid4().hex[:8]}"
+        db = client[name]
+        try:
+            await db.natal_charts.insert_many([
+                {"id": "a", "created_at": "2024-03-01T10:20:30.123000+00:00"},
+                {"id": "b", "created_at": "2024-03-01T10:20:30"},
+                {"id": "c", "created_at": "not a date"},
+            ])
+            await db_setup.apply(db)
+            return {doc["id"]: doc["created_at"] async for doc in db.natal_charts.find()}
+        finally:
+            await client.drop_database(name)
+            client.close()
+
+    dates = asyncio.run(scenario())
+    assert dates["a"] == datetime(2024, 3, 1, 10, 20, 30, 123000, tzinfo=timezone.utc)
+    assert dates["b"] == datetime(2024, 3, 1, 10, 20, 30, tzinfo=timezone.utc)
+    assert dates["c"] == "not a date"
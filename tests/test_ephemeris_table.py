@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+import swisseph as swe
+
+import transits
+from ephemeris_table import EphemerisTable, accuracy_report, build_table
+from transits import date_to_jd, find_transits
+
+# Bodies the built-in Moshier model covers, so no data files are needed
+BODIES = [swe.SUN, swe.MOON, swe.MARS, swe.MEAN_NODE]
+
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory):
+    path = tmp_path_factory.mktemp("ephemeris") / "table.bin"
+    build_table(str(path), 2024, 2025, bodies=BODIES)
+    return EphemerisTable(str(path))
+
+
+def test_positions_match_swiss_ephemeris(table):
+    report = accuracy_report(table, samples=300)
+
+    assert set(report) == set(BODIES)
+    for errors in report.values():
+        assert errors["lon_max"] < 2.0
+        assert errors["lat_max"] < 2.0
+
+
+def test_scalar_and_vector_lookups_agree(table):
+    jds = np.linspace(table.jd_start, table.jd_end, 50)
+    lons, lats, speeds = table.positions(swe.MOON, jds)
+
+    assert table.calc(float(jds[7]), swe.MOON) == pytest.approx((lons[7], lats[7], speeds[7]))
+    assert ((lons >= 0) & (lons < 360)).all()
+    exact_speed = swe.calc_ut(float(jds[7]), swe.MOON, swe.FLG_SPEED)[0][3]
+    assert speeds[7] == pytest.approx(exact_speed, abs=1e-4)
+
+
+def test_lookups_outside_the_table_are_rejected(table):
+    assert not table.covers(swe.JUPITER, table.jd_start, table.jd_end)
+    with pytest.raises(ValueError):
+        table.positions(swe.SUN, [table.jd_end + 1])
+
+
+def test_transit_grid_from_the_table_finds_the_same_hits(table, monkeypatch):
+    natal = [{"name": "Місяць", "longitude": 123.4}]
+    args = (natal, date_to_jd("2024-03-01"), date_to_jd("2024-09-01"), 1.0, [(swe.MOON, "Місяць")])
+    exact = find_transits(*args)
+
+    monkeypatch.setattr(transits, "ephemeris_table", table)
+    tabled = find_transits(*args)
+
+    assert len(tabled) == len(exact)
+    assert [h["jd"] for h in tabled] == pytest.approx([h["jd"] for h in exact], abs=1e-4)
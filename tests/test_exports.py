@@ -0,0 +1,71 @@
+import asyncio
+import csv
+import io
+import json
+
+from pymongo import UpdateOne
+
+from chart_storage import to_storage
+from exports import CHART_FIELDS, PLANET_FIELDS, bulk_import, export_charts, export_interpretations
+from tests.test_chart_storage import stored_chart
+
+
+async def collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+def test_ndjson_export_expands_compact_charts_one_chunk_per_batch(fake_collection):
+    docs = [stored_chart(seed) for seed in range(5)]
+    cursor = fake_collection([to_storage(dict(doc)) for doc in docs]).find()
+
+    chunks = asyncio.run(collect(export_charts(cursor, "ndjson", batch_size=2)))
+
+    assert cursor.requested_batch == 2 and len(chunks) == 3
+    lines = [json.loads(line) for line in "".join(chunks).splitlines()]
+    assert [line["id"] for line in lines] == [doc["id"] for doc in docs]
+    assert lines[0]["planets"][0]["sign"] == docs[0]["planets"][0]["sign"]
+    assert lines[0]["created_at"] == docs[0]["created_at"].isoformat()
+
+
+def test_csv_export_can_emit_one_row_per_planet(fake_collection):
+    charts = fake_collection([stored_chart(seed) for seed in range(3)])
+    docs = charts.docs
+
+    per_chart = list(csv.reader(io.StringIO("".join(asyncio.run(collect(export_charts(charts.find(), "csv")))))))
+    per_planet = list(csv.reader(io.StringIO(
+        "".join(asyncio.run(collect(export_charts(charts.find(), "csv", per_planet=True))))
+    )))
+
+    assert per_chart[0] == CHART_FIELDS and len(per_chart) == 4
+    assert per_planet[0] == CHART_FIELDS + PLANET_FIELDS
+    assert len(per_planet) == 1 + sum(len(doc["planets"]) for doc in docs)
+
+
+def test_csv_export_of_an_empty_collection_is_just_the_header(fake_collection):
+    chunks = asyncio.run(collect(export_interpretations(fake_collection().find(), "csv")))
+
+    assert "".join(chunks).splitlines() == ["id,category,key,title,content,created_at,updated_at"]
+
+
+async def records(items):
+    for index, item in enumerate(items):
+        yield index, item
+
+
+def to_update(record):
+    if "id" not in record:
+        raise ValueError("missing id")
+    return UpdateOne({"id": record["id"]}, {"$setOnInsert": record}, upsert=True)
+
+
+def test_bulk_import_batches_writes_and_reports_bad_records(fake_collection):
+    # Records "0" and "2" are already stored; $setOnInsert leaves them alone
+    collection = fake_collection([{"id": "0"}, {"id": "2"}])
+    items = [{"id": str(i)} for i in range(5)] + [{"name": "no id"}, ValueError("Invalid JSON on line 7")]
+
+    summary = asyncio.run(bulk_import(collection, records(items), to_update, batch_size=2))
+
+    assert [len(batch) for batch in collection.writes] == [2, 2, 1]
+    assert summary["received"] == 7 and summary["failed"] == 2
+    assert [error["index"] for error in summary["errors"]] == [5, 6]
+    assert summary["inserted"] == 3 and summary["unchanged"] == 2
@@ -0,0 +1,115 @@
+import asyncio
+
+from geocoding import LocationSearchService, PrefixIndex, StaticGeocoderBackend, normalize_query
+
+PLACES = [
+    {"display_name": "Київ, Україна", "lat": 50.4501, "lon": 30.5234},
+    {"display_name": "Кривий Ріг, Дніпропетровська область, Україна", "lat": 47.9105, "lon": 33.3918},
+    {"display_name": "Львів, Україна", "lat": 49.8397, "lon": 24.0297},
+]
+
+
+class FailingBackend(StaticGeocoderBackend):
+    async def geocode(self, query, limit):
+        raise TimeoutError("geocoder unavailable")
+
+
+class SlowBackend(StaticGeocoderBackend):
+    async def geocode(self, query, limit):
+        await asyncio.sleep(0.05)
+        return await super().geocode(query, limit)
+
+
+def test_normalize_query_folds_case_and_whitespace():
+    assert normalize_query("  КИЇВ   Україна ") == "київ україна"
+
+
+def test_prefix_index_matches_any_name_part():
+    index = PrefixIndex()
+    for place in PLACES:
+        index.add(place)
+
+    assert [p["display_name"] for p in index.search("кри", 10)] == [PLACES[1]["display_name"]]
+    assert len(index.search("україна", 10)) == 3
+    assert index.search("одеса", 10) == []
+
+
+def test_prefix_index_evicts_oldest_place():
+    index = PrefixIndex(max_places=2)
+    for place in PLACES:
+        index.add(place)
+
+    assert len(index) == 2
+    assert index.search("київ", 10) == []
+    assert index.search("львів", 10) == [PLACES[2]]
+
+
+def test_repeated_queries_skip_the_geocoder():
+    backend = StaticGeocoderBackend(PLACES)
+    service = LocationSearchService(backend)
+
+    async def scenario():
+        first = await service.search("Київ")
+        assert await service.search("київ ") == first
+        assert await service.search("Одеса") == []
+        assert await service.search("Одеса") == []
+
+    asyncio.run(scenario())
+    assert backend.calls == 2
+    assert service.metrics()["cache_hits"] == 2
+
+
+def test_known_places_do_not_hide_geocoder_results():
+    paris_texas = {"display_name": "Paris, Texas, United States", "lat": 33.66, "lon": -95.56}
+    paris = {"display_name": "Paris, Île-de-France, France", "lat": 48.8589, "lon": 2.32}
+    backend = StaticGeocoderBackend([paris_texas, paris])
+    service = LocationSearchService(backend)
+
+    async def scenario():
+        assert await service.search("Paris, Texas") == [paris_texas]
+        return await service.search("Paris")
+
+    assert asyncio.run(scenario()) == [paris_texas, paris]
+    assert backend.calls == 2
+
+
+def test_short_results_are_topped_up_from_known_places():
+    backend = StaticGeocoderBackend(PLACES)
+    service = LocationSearchService(backend)
+
+    async def scenario():
+        await service.search("Київ")
+        backend.places = []
+        return await service.search("Ки")
+
+    assert asyncio.run(scenario()) == [PLACES[0]]
+    assert service.metrics()["index_hits"] == 1
+
+
+def test_known_places_answer_typeahead_when_the_geocoder_fails():
+    service = LocationSearchService(StaticGeocoderBackend(PLACES))
+
+    async def scenario():
+        await service.search("Львів")
+        service.backend = FailingBackend(PLACES)
+        assert await service.search("Льв") == [PLACES[2]]
+        try:
+            await service.search("Одеса")
+        except TimeoutError:
+            return True
+
+    assert asyncio.run(scenario())
+    assert service.metrics()["index_fallbacks"] == 1
+
+
+def test_identical_inflight_queries_are_coalesced():
+    backend = SlowBackend(PLACES)
+    service = LocationSearchService(backend)
+
+    async def scenario():
+        return await asyncio.gather(*(service.search("Львів") for _ in range(5)))
+
+    results = asyncio.run(scenario())
+    assert backend.calls == 1
+    assert all(r == [PLACES[2]] for r in results)
+    assert service.metrics()["coalesced"] == 4
@@ -0,0 +1,69 @@
+import random
+from typing import get_args
+
+import pytest
+
+from astrology import HOUSE_SYSTEMS, assign_houses, calculate_houses, house_of
+from models import HouseSystem
+
+
+def reference_house(longitude, cusps):
+    # The original per-planet loop, kept as the behavioural spec
+    for i in range(12):
+        next_i = (i + 1) % 12
+        cusp_current = cusps[i]
+        cusp_next = cusps[next_i] if next_i != 0 else cusps[0] + 360
+        if cusp_next < cusp_current:
+            cusp_next += 360
+        adjusted = longitude if longitude >= cusp_current else longitude + 360
+        if cusp_current <= adjusted < cusp_next:
+            return i + 1
+    return None
+
+
+def random_cusps(rng):
+    widths = [rng.uniform(5, 50) for _ in range(12)]
+    scale = 360 / sum(widths)
+    cusps, position = [], rng.uniform(0, 360)
+    for width in widths:
+        cusps.append(position % 360)
+        position += width * scale
+    return cusps
+
+
+def test_bisect_assignment_matches_the_loop():
+    rng = random.Random(11)
+    for _ in range(200):
+        cusps = random_cusps(rng)
+        for longitude in [rng.uniform(0, 360) for _ in range(20)] + cusps:
+            assert house_of(longitude, cusps) == reference_house(longitude, cusps)
+
+
+def test_assign_houses_skips_angles():
+    cusps = [(15 + 30 * i) % 360 for i in range(12)]
+    planets = [{"name": "Асцендент", "longitude": 15.0}, {"name": "Сонце", "longitude": 10.0}]
+
+    assign_houses(planets, cusps)
+
+    assert "house" not in planets[0]
+    assert planets[1]["house"] == 12
+
+
+def test_house_systems_match_the_api_codes():
+    assert set(HOUSE_SYSTEMS) == set(get_args(HouseSystem))
+
+
+@pytest.mark.parametrize("system", sorted(HOUSE_SYSTEMS))
+def test_calculate_houses_supports_every_system(system):
+    houses, ascmc = calculate_houses(2451545.0, 50.45, 30.52, system)
+
+    assert [h.number for h in houses] == list(range(1, 13))
+    if system == "W":
+        assert all(h.cusp % 30 == pytest.approx(0) for h in houses)
+    else:
+        assert houses[0].cusp == pytest.approx(ascmc[0])
+
+
+def test_calculate_houses_rejects_unknown_systems():
+    with pytest.raises(ValueError):
+        calculate_houses(2451545.0, 50.45, 30.52, "X")
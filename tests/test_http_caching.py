@@ -0,0 +1,20 @@
+from http_caching import immutable_headers, not_modified
+
+
+def test_etag_depends_only_on_the_key():
+    first = immutable_headers("chart-1|json|1")
+
+    assert first == immutable_headers("chart-1|json|1")
+    assert first["ETag"] != immutable_headers("chart-1|json|2")["ETag"]
+    assert "immutable" in first["Cache-Control"]
+
+
+def test_if_none_match_lists_and_weak_tags_match():
+    etag = immutable_headers("chart-1|json|1")["ETag"]
+
+    assert not_modified(f'"other", W/{etag}', etag)
+    assert not_modified("*", etag)
+    assert not not_modified('"other"', etag)
+    assert not not_modified(None, etag)
+    # A tag containing ours is not ours
+    assert not not_modified(f'"x{etag[1:]}', etag)
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from interpretations import InterpretationCatalogue
+
+
+def interp(id, category, key, updated_at="2025-01-01T00:00:00+00:00"):
+    return {"_id": f"oid-{id}", "id": id, "category": category, "key": key, "title": key,
+            "content": "...", "created_at": "2025-01-01T00:00:00+00:00", "updated_at": updated_at}
+
+
+@pytest.fixture
+def loaded_catalogue(fake_collection):
+    def load(docs, **kwargs):
+        catalogue = InterpretationCatalogue(fake_collection(docs), **kwargs)
+        asyncio.run(catalogue.ensure_loaded())
+        return catalogue
+    return load
+
+
+def test_catalogue_indexes_by_id_category_and_key(loaded_catalogue):
+    catalogue = loaded_catalogue([
+        interp("1", "planet_in_sign", "sun_in_aries"),
+        interp("2", "planet_in_house", "sun_in_1st_house"),
+        interp("3", "planet_in_sign", "moon_in_leo"),
+    ])
+
+    assert catalogue.get("2")["key"] == "sun_in_1st_house"
+    assert {d["id"] for d in catalogue.list("planet_in_sign")} == {"1", "3"}
+    assert len(catalogue.list()) == 3
+    assert list(catalogue.by_keys(["moon_in_leo", "missing"])) == ["moon_in_leo"]
+    assert "_id" not in catalogue.get("1")
+    assert catalogue.get("1")["created_at"].tzinfo is not None
+
+
+def test_reads_are_served_without_reloading(loaded_catalogue):
+    catalogue = loaded_catalogue([interp("1", "aspect", "sun_conjunct_moon")])
+
+    asyncio.run(catalogue.ensure_loaded())
+    assert catalogue.collection.finds == 1
+
+
+def test_upsert_moves_between_categories_and_changes_etag(loaded_catalogue):
+    catalogue = loaded_catalogue([interp("1", "aspect", "sun_conjunct_moon")])
+    before = catalogue.etag()
+
+    catalogue.upsert(interp("1", "planet_in_sign", "sun_in_aries", updated_at="2025-02-01T00:00:00+00:00"))
+
+    assert catalogue.list("aspect") == []
+    assert catalogue.by_keys(["sun_conjunct_moon"]) == {}
+    assert catalogue.etag() != before
+
+
+def test_etag_is_stable_for_the_same_content(loaded_catalogue):
+    docs = [interp("1", "aspect", "a"), interp("2", "aspect", "b")]
+
+    assert loaded_catalogue(docs).etag("aspect") == loaded_catalogue(list(reversed(docs))).etag("aspect")
+
+
+def test_change_stream_delete_resolves_object_id(loaded_catalogue):
+    catalogue = loaded_catalogue([interp("1", "aspect", "a")])
+
+    catalogue._apply_change({"operationType": "delete", "documentKey": {"_id": "oid-1"}})
+
+    assert catalogue.get("1") is None
+
+
+def test_catalogue_reloads_when_stale_without_change_stream(loaded_catalogue):
+    catalogue = loaded_catalogue([interp("1", "aspect", "a")], refresh_seconds=0)
+
+    asyncio.run(catalogue.ensure_loaded())
+    assert catalogue.collection.finds == 2
@@ -0,0 +1,163 @@
+import asyncio
+import os
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+import chart_storage
+import jobs
+from chart_storage import to_storage
+from jobs import JobFailed, JobQueue, recompute_aspects, run_job
+from tests.test_chart_storage import stored_chart
+
+
+class RecordingQueue:
+    lease_seconds = 60
+
+    def __init__(self):
+        self.calls = []
+
+    async def heartbeat(self, job, progress=None):
+        self.calls.append(("heartbeat", progress))
+        return True
+
+    async def complete(self, job, result):
+        self.calls.append(("complete", result))
+
+    async def fail(self, job, error, permanent=False):
+        self.calls.append(("fail", error, permanent))
+
+
+def job(job_type, attempts=1, max_attempts=3):
+    return {"id": "j1", "type": job_type, "params": {}, "attempts": attempts,
+            "max_attempts": max_attempts, "worker": "w"}
+
+
+@pytest.fixture
+def handlers(monkeypatch):
+    async def ok(ctx, params):
+        await ctx.progress(1, 1)
+        return {"done": True}
+
+    async def broken(ctx, params):
+        raise RuntimeError("flaky")
+
+    async def invalid(ctx, params):
+        raise JobFailed("bad params")
+
+    monkeypatch.setattr(jobs, "JOB_HANDLERS", {"ok": ok, "broken": broken, "invalid": invalid})
+
+
+@pytest.mark.parametrize("job_type,expected", [
+    ("ok", ("complete", {"done": True})),
+    ("broken", ("fail", "flaky", False)),
+    ("invalid", ("fail", "bad params", True)),
+    ("missing", ("fail", "Unknown job type: missing", True)),
+])
+def test_run_job_records_the_outcome(handlers, job_type, expected):
+    queue = RecordingQueue()
+
+    asyncio.run(run_job(queue, job(job_type), db=None, engine=None))
+
+    assert queue.calls[-1] == expected
+
+
+def test_jobs_that_keep_losing_their_worker_are_given_up(handlers):
+    queue = RecordingQueue()
+
+    asyncio.run(run_job(queue, job("ok", attempts=4), db=None, engine=None))
+
+    assert queue.calls == [("fail", "Worker lost while running the job", True)]
+
+
+class UpdateRecorder:
+    def __init__(self):
+        self.updates = []
+
+    async def update_one(self, query, update):
+        self.updates.append((query, update))
+
+        class Result:
+            modified_count = 1
+        return Result()
+
+
+def test_failures_back_off_until_attempts_run_out():
+    collection = UpdateRecorder()
+    queue = JobQueue(collection, retry_base_seconds=10)
+
+    asyncio.run(queue.fail(job("x", attempts=2), "boom"))
+    asyncio.run(queue.fail(job("x", attempts=3), "boom"))
+
+    (query, retry), (_, final) = collection.updates
+    assert query == {"id": "j1", "worker": "w", "attempts": 2, "status": "running"}
+    assert retry["$set"]["status"] == "queued"
+    delay = retry["$set"]["run_after"] - retry["$set"]["updated_at"]
+    assert delay.total_seconds() == pytest.approx(20)
+    assert final["$set"]["status"] == "failed" and final["$set"]["finished_at"]
+
+
+def test_recompute_aspects_rewrites_only_charts_that_changed(monkeypatch, fake_collection):
+    monkeypatch.setattr(jobs, "CALCULATION_VERSION", "2")
+    monkeypatch.setattr(chart_storage, "CALCULATION_VERSION", "2")
+    current = to_storage(stored_chart(1))
+    outdated = stored_chart(2)
+    outdated["aspects"] = outdated["aspects"][1:]
+    charts = fake_collection([current, to_storage(outdated)])
+    queue = RecordingQueue()
+
+    class Db:
+        natal_charts = charts
+
+    ctx = jobs.JobContext(queue, job("recompute_aspects"), Db, engine=None)
+    result = asyncio.run(recompute_aspects(ctx, {"batch_size": 1}))
+
+    assert result == {"charts": 2, "changed": 1}
+    (stamped,), (rewritten,) = charts.writes
+    assert stamped._filter == {"id": current["id"]}
+    assert stamped._doc == {"$set": {"calculation_version": "2"}}
+    assert rewritten._filter == {"id": outdated["id"]}
+    assert rewritten._doc["$set"]["calculation_version"] == "2"
+    assert queue.calls[-1] == ("heartbeat", {"done": 2, "total": 2})
+
+
+def test_recompute_aspects_refuses_without_a_version_bump(fake_collection):
+    class Db:
+        natal_charts = fake_collection([to_storage(stored_chart(1))])
+
+    ctx = jobs.JobContext(RecordingQueue(), job("recompute_aspects"), Db, engine=None)
+    with pytest.raises(JobFailed, match="bump CALCULATION_VERSION"):
+        asyncio.run(recompute_aspects(ctx, {}))
+
+
+@pytest.fixture
+def mongo_url():
+    url = os.environ.get("MONGO_TEST_URL")
+    if not url:
+        pytest.skip("MONGO_TEST_URL not set")
+    return url
+
+
+def test_claims_are_exclusive_and_expired_leases_are_reclaimed(mongo_url):
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    async def scenario():
+        client = AsyncIOMotorClient(mongo_url, tz_aware=True)
+        name = f"astrology_test_{uuid.uuid4().hex[:8]}"
+        try:
+            queue = JobQueue(client[name].jobs, lease_seconds=60)
+            for _ in range(3):
+                await queue.enqueue("transit_scan", {})
+            claimed = await asyncio.gather(*(queue.claim(f"w{i}") for i in range(5)))
+            ids = [c["id"] for c in claimed if c]
+            assert len(ids) == len(set(ids)) == 3
+
+            await queue.collection.update_one({"id": ids[0]}, {"$set": {"locked_until": datetime.now(timezone.utc)}})
+            reclaimed = await queue.claim("w9")
+            assert reclaimed["id"] == ids[0] and reclaimed["attempts"] == 2
+        finally:
+            await client.drop_database(name)
+            client.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,101 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+
+import metrics
+from metrics import (
+    HTTP_REQUESTS, Counter, Histogram, MetricsMiddleware, Registry,
+    buffer_spans, drain_spans, gauges_from, span,
+)
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(5.0, "/a")
+
+    lines = histogram.render()
+
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'latency_seconds_sum{route="/a"} 5.55' in lines
+    assert 'latency_seconds_count{route="/a"} 3' in lines
+
+
+def test_label_values_are_escaped():
+    registry = Registry()
+    counter = registry.register(Counter("things_total", "Things", ("name",)))
+    counter.inc('say "hi"\n')
+
+    assert 'things_total{name="say \\"hi\\"\\n"} 1' in registry.render()
+
+
+def test_gauges_from_skips_non_numeric_values():
+    lines = gauges_from("cache", {"hits": 3, "enabled": True, "backend": "mongo"}, "Cache stats")
+
+    assert "cache_hits 3" in lines
+    assert "cache_enabled 1" in lines
+    assert not any("backend" in line for line in lines)
+
+
+def test_buffered_spans_are_drained_once(monkeypatch):
+    monkeypatch.setattr(metrics, "_span_buffer", None)
+    buffer_spans()
+    with span("houses"):
+        pass
+
+    spans = drain_spans()
+
+    assert [name for name, _ in spans] == ["houses"]
+    assert drain_spans() == []
+
+
+def test_chart_calculation_records_spans(ephemeris, monkeypatch):
+    from astrology import calculate_chart_data
+
+    monkeypatch.setattr(metrics, "_span_buffer", None)
+    buffer_spans()
+    calculate_chart_data(2447932.5, 50.45, 30.52)
+
+    assert {name for name, _ in drain_spans()} == {"ephemeris", "houses", "aspects", "models", "serialize"}
+
+
+def test_middleware_labels_requests_by_route_template():
+    app = FastAPI()
+
+    @app.get("/charts/{chart_id}")
+    async def get_chart(chart_id: str):
+        return {"id": chart_id}
+
+    app.add_middleware(MetricsMiddleware)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await client.get("/charts/a")
+            await client.get("/charts/b")
+            await client.get("/missing")
+
+    asyncio.run(scenario())
+
+    lines = HTTP_REQUESTS.render()
+    assert 'http_requests_total{method="GET",route="/charts/{chart_id}",status="200"} 2' in lines
+    assert any(line.startswith('http_requests_total{method="GET",route="unmatched",status="404"}') for line in lines)
+
+
+def test_pool_listener_tracks_utilization():
+    from pymongo import monitoring
+
+    from metrics import MONGO_POOL_IN_USE, MONGO_POOL_WAITING, MongoPoolMetrics
+
+    listener = MongoPoolMetrics()
+    address = ("pool-test", 27017)
+    listener.connection_check_out_started(monitoring.ConnectionCheckOutStartedEvent(address))
+    listener.connection_check_out_started(monitoring.ConnectionCheckOutStartedEvent(address))
+    listener.connection_checked_out(monitoring.ConnectionCheckedOutEvent(address, 1))
+
+    assert 'mongo_pool_connections_in_use{address="pool-test:27017"} 1' in MONGO_POOL_IN_USE.render()
+    assert 'mongo_pool_checkouts_waiting{address="pool-test:27017"} 1' in MONGO_POOL_WAITING.render()
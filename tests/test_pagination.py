@@ -0,0 +1,35 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from pagination import as_utc, decode_cursor, encode_cursor, keyset_filter
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 11, 29, 12, 10, 59, 969000, tzinfo=timezone.utc)
+
+    assert decode_cursor(encode_cursor(created_at, "abc")) == (created_at, "abc")
+
+
+def test_invalid_cursor_is_a_bad_request():
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not-a-cursor")
+    assert exc.value.status_code == 400
+
+
+def test_keyset_filter_breaks_ties_on_id():
+    created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    assert keyset_filter(None) == {}
+    assert keyset_filter(encode_cursor(created_at, "m")) == {"$or": [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "id": {"$lt": "m"}},
+    ]}
+
+
+def test_as_utc_accepts_legacy_iso_strings_and_naive_datetimes():
+    expected = datetime(2025, 1, 1, 12, tzinfo=timezone.utc)
+
+    assert as_utc("2025-01-01T12:00:00+00:00") == expected
+    assert as_utc(datetime(2025, 1, 1, 12)) == expected
@@ -0,0 +1,45 @@
+from readings import assemble_reading, ordinal, reading_keys
+
+CHART = {
+    "id": "c1",
+    "name": "Test",
+    "planets": [
+        {"name": "Асцендент", "sign": "Лев"},
+        {"name": "Сонце", "sign": "Овен", "house": 1},
+        {"name": "Місяць", "sign": "Рак", "house": 11},
+    ],
+    "aspects": [
+        {"planet1": "Сонце", "planet2": "Місяць", "aspect_type": "Квадрат"},
+    ],
+}
+
+
+def test_ordinal_suffixes():
+    assert [ordinal(n) for n in (1, 2, 3, 4, 11, 12)] == ["1st", "2nd", "3rd", "4th", "11th", "12th"]
+
+
+def test_reading_keys_cover_signs_houses_and_both_aspect_orders():
+    keys = [candidates for _, _, candidates in reading_keys(CHART)]
+
+    assert keys == [
+        ["ascendant_in_leo"],
+        ["sun_in_aries"],
+        ["sun_in_1st_house"],
+        ["moon_in_cancer"],
+        ["moon_in_11th_house"],
+        ["sun_square_moon", "moon_square_sun"],
+    ]
+
+
+def test_assemble_reading_matches_category_and_reports_missing_keys():
+    by_key = {
+        "sun_in_aries": [{"category": "planet_in_sign", "key": "sun_in_aries", "title": "Sun"}],
+        "moon_square_sun": [{"category": "aspect", "key": "moon_square_sun", "title": "Square"}],
+        "moon_in_cancer": [{"category": "aspect", "key": "moon_in_cancer", "title": "wrong category"}],
+    }
+
+    reading = assemble_reading(CHART, by_key)
+
+    assert [e["key"] for e in reading["entries"]] == ["sun_in_aries", "sun_square_moon"]
+    assert reading["entries"][1]["interpretations"][0]["title"] == "Square"
+    assert "moon_in_cancer" in reading["missing_keys"]
@@ -0,0 +1,60 @@
+import json
+from datetime import datetime, timezone
+
+import bson
+from bson.codec_options import CodecOptions
+
+from chart_storage import to_storage, unpack_chart
+from models import Interpretation, NatalChart, NatalChartSummary
+from serialization import dumps, shape
+from tests.test_chart_storage import stored_chart
+
+
+def read_back(doc):
+    # Decoded as the API's client does (tz_aware=True)
+    stored = bson.decode(bson.encode(to_storage(dict(doc))), codec_options=CodecOptions(tz_aware=True))
+    return unpack_chart(stored)
+
+
+def test_stored_charts_encode_like_the_model():
+    for seed in range(10):
+        chart = read_back(stored_chart(seed))
+
+        body = dumps(shape(chart, NatalChart))
+
+        # The schema check the endpoints skip: the body is a valid chart ...
+        NatalChart.model_validate_json(body)
+        # ... and the same JSON that response_model=NatalChart would send
+        assert json.loads(body) == json.loads(NatalChart.model_validate(chart).model_dump_json())
+
+
+def test_summaries_keep_only_summary_fields():
+    chart = read_back(stored_chart())
+
+    body = dumps([shape(chart, NatalChartSummary)])
+
+    assert json.loads(body) == [json.loads(NatalChartSummary.model_validate(chart).model_dump_json())]
+
+
+def test_documents_from_before_a_field_existed_get_its_default():
+    doc = stored_chart()
+    del doc["house_system"]
+    for planet in doc["planets"]:
+        del planet["house"]
+
+    shaped = shape(doc, NatalChart)
+
+    assert shaped["house_system"] == "P"
+    assert all(planet["house"] is None for planet in shaped["planets"])
+    assert shaped == NatalChart.model_validate(doc).model_dump()
+
+
+def test_interpretation_datetimes_are_utc_with_z():
+    doc = {"_id": "object-id", "id": "i1", "category": "aspect", "key": "sun_conjunct_moon",
+           "title": "Title", "content": "Зміст", "created_at": "2025-01-01T00:00:00+00:00",
+           "updated_at": datetime(2025, 2, 1, tzinfo=timezone.utc)}
+
+    body = dumps(shape(doc, Interpretation))
+
+    assert body == Interpretation.model_validate(doc).model_dump_json().encode()
+    assert b'"created_at":"2025-01-01T00:00:00Z"' in body
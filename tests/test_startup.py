@@ -0,0 +1,104 @@
+import asyncio
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from readiness import WarmUp
+
+BACKEND = Path(__file__).resolve().parent.parent / 'backend'
+
+# Loaded on first use or by the warm-up, never by importing the app
+LAZY_MODULES = ("geopy", "passlib", "timezonefinder", "cairosvg", "pandas", "boto3")
+# Generous for slow CI machines; a local import takes well under a second
+IMPORT_BUDGET_SECONDS = float(os.environ.get('IMPORT_BUDGET_SECONDS', 2.5))
+
+
+def import_profile(module: str):
+    env = {**os.environ, "MONGO_URL": "mongodb://localhost:27017", "DB_NAME": "astrology_test"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND, env=env, capture_output=True, text=True, check=True,
+    )
+    # "import time: <self us> | <cumulative us> | <indented module name>"
+    rows = re.findall(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$", result.stderr, re.MULTILINE)
+    return {name: int(cumulative) / 1e6 for _, cumulative, _, name in rows}
+
+
+def test_server_import_stays_within_budget():
+    profile = import_profile("server")
+
+    loaded = sorted(name for name in profile if name.split(".")[0] in LAZY_MODULES)
+    assert loaded == []
+    assert profile["server"] < IMPORT_BUDGET_SECONDS
+
+
+def test_warm_up_retries_failed_steps_until_ready():
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 2:
+            raise ConnectionError("no server")
+
+    async def scenario():
+        warm_up = WarmUp(retry_seconds=0.01)
+        warm_up.add("flaky", flaky)
+        warm_up.add("quick", lambda: asyncio.sleep(0))
+        assert not warm_up.ready
+        warm_up.start()
+        for _ in range(100):
+            if warm_up.ready:
+                break
+            await asyncio.sleep(0.01)
+        await warm_up.stop()
+        return warm_up.report()
+
+    report = asyncio.run(scenario())
+
+    assert report["ready"]
+    assert len(attempts) == 2
+    assert report["steps"]["flaky"]["status"] == "ready"
+    assert report["steps"]["flaky"]["error"] is None
+
+
+def test_stop_cancels_steps_still_running():
+    async def scenario():
+        warm_up = WarmUp()
+        warm_up.add("slow", lambda: asyncio.sleep(10))
+        warm_up.start()
+        await asyncio.sleep(0)
+        await warm_up.stop()
+        return warm_up.report()
+
+    report = asyncio.run(scenario())
+
+    assert not report["ready"]
+    assert report["steps"]["slow"]["status"] == "pending"
+
+
+def test_index_step_fails_while_an_index_cannot_be_built(monkeypatch):
+    import server
+
+    async def partly_applied(db):
+        return False
+
+    monkeypatch.setattr(server.db_setup, "apply", partly_applied)
+
+    async def scenario():
+        warm_up = WarmUp(retry_seconds=10)
+        warm_up.add("indexes", server.apply_indexes)
+        warm_up.start()
+        for _ in range(100):
+            if warm_up.report()["steps"]["indexes"]["status"] != "pending":
+                break
+            await asyncio.sleep(0.01)
+        await warm_up.stop()
+        return warm_up.report()
+
+    report = asyncio.run(scenario())
+
+    assert not report["ready"]
+    assert report["steps"]["indexes"]["status"] == "failed"
+    assert "db_setup.py verify" in report["steps"]["indexes"]["error"]
@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from astrology import ANGLES, calculate_aspects, house_of
+from synastry import composite_chart, midpoint, synastry_aspects
+
+
+def make_chart(chart_id, rng):
+    names = list(ANGLES) + ["Сонце", "Місяць", "Венера", "Марс"]
+    planets = [
+        {"name": name, "longitude": rng.uniform(0, 360), "latitude": 0.0, "speed": 1.0}
+        for name in names
+    ]
+    start = rng.uniform(0, 360)
+    houses = [{"number": i + 1, "cusp": (start + 30 * i) % 360} for i in range(12)]
+    return {"id": chart_id, "name": chart_id, "planets": planets, "houses": houses}
+
+
+def test_midpoint_takes_the_shorter_arc():
+    assert midpoint(350, 10) == pytest.approx(0)
+    assert midpoint(10, 350) == pytest.approx(0)
+    assert midpoint(100, 200) == pytest.approx(150)
+
+
+def test_batched_synastry_matches_pairwise_results():
+    rng = random.Random(3)
+    chart = make_chart("a", rng)
+    partners = [make_chart(f"p{i}", rng) for i in range(20)]
+
+    batched = synastry_aspects(chart, partners)
+
+    assert batched == [synastry_aspects(chart, [partner])[0] for partner in partners]
+    for partner, aspects in zip(partners, batched):
+        partner_names = {p["name"] for p in partner["planets"]}
+        for aspect in aspects:
+            assert aspect["planet1"] not in ANGLES and aspect["planet2"] in partner_names - set(ANGLES)
+
+
+def test_synastry_with_no_partners_or_points():
+    chart = make_chart("a", random.Random(1))
+
+    assert synastry_aspects(chart, []) == []
+    assert synastry_aspects(chart, [{"planets": []}]) == [[]]
+
+
+def test_composite_uses_midpoints_for_planets_and_houses():
+    rng = random.Random(5)
+    first, second = make_chart("a", rng), make_chart("b", rng)
+
+    composite = composite_chart(first, second)
+
+    sun = next(p for p in composite["planets"] if p["name"] == "Сонце")
+    assert sun["longitude"] == pytest.approx(midpoint(first["planets"][2]["longitude"], second["planets"][2]["longitude"]))
+    cusps = [h["cusp"] for h in composite["houses"]]
+    assert cusps[0] == pytest.approx(midpoint(first["houses"][0]["cusp"], second["houses"][0]["cusp"]))
+    assert sun["house"] == house_of(sun["longitude"], cusps)
+    points = [p for p in composite["planets"] if p["name"] not in ANGLES]
+    assert composite["aspects"] == calculate_aspects(points)
@@ -0,0 +1,86 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytz
+
+from timezones import TimezoneResolver
+
+
+def test_finder_is_loaded_lazily():
+    resolver = TimezoneResolver()
+
+    assert resolver.metrics()['finder_loaded'] is False
+    resolver.timezone_name(50.45, 30.52)
+    assert resolver.metrics()['finder_loaded'] is True
+
+
+def test_points_in_a_resolved_cell_are_served_from_the_index():
+    resolver = TimezoneResolver()
+
+    first = resolver.timezone_name(50.4501, 30.5234)
+    second = resolver.timezone_name(50.4502, 30.5235)
+    exact_before = resolver.exact_lookups
+    third = resolver.timezone_name(50.4503, 30.5236)
+
+    assert first == second == third == resolver.finder.timezone_at(lat=50.4503, lng=30.5236)
+    assert resolver.exact_lookups == exact_before
+    assert resolver.hits == 1
+
+
+def test_a_new_cell_costs_one_exact_lookup():
+    resolver = TimezoneResolver()
+
+    assert resolver.timezone_name(48.85, 2.35) == "Europe/Paris"
+    assert resolver.exact_lookups == 1
+
+
+def test_cells_are_resolved_on_the_second_visit():
+    resolver = TimezoneResolver()
+    # Away from borders the finder's grid resolves the cell without lookups
+    resolver.timezone_name(48.85, 2.35)
+    resolver.timezone_name(48.85, 2.35)
+    assert resolver.exact_lookups == 1
+
+    # ~35 km from the Polish / Ukrainian border the cell's points are checked
+    near = (50.0, 23.0)
+    assert resolver.timezone_name(*near) == "Europe/Warsaw"
+    assert resolver.timezone_name(*near) == "Europe/Warsaw"
+    resolved = resolver.exact_lookups
+    assert resolved > 3
+    assert resolver.timezone_name(*near) == "Europe/Warsaw"
+    assert resolver.exact_lookups == resolved
+
+
+def test_border_cells_fall_back_to_exact_lookups():
+    resolver = TimezoneResolver()
+    # Polish / Ukrainian border, ~1 km apart
+    west, east = (50.0, 23.17), (50.0, 23.18)
+
+    assert resolver.timezone_name(*west) == "Europe/Warsaw"
+    assert resolver.timezone_name(*east) == "Europe/Kyiv"
+
+
+def test_to_utc_matches_direct_pytz_localization():
+    resolver = TimezoneResolver()
+    local = datetime(1990, 5, 15, 14, 30)
+    tz = pytz.timezone(resolver.finder.timezone_at(lat=50.45, lng=30.52))
+
+    assert resolver.to_utc(local, 50.45, 30.52) == tz.localize(local).astimezone(pytz.UTC)
+
+
+def test_index_is_bounded():
+    resolver = TimezoneResolver(max_cells=2)
+
+    for lat in (10.0, 20.0, 30.0):
+        resolver.timezone_name(lat, 30.0)
+    assert resolver.metrics()['cells'] == 2
+
+
+def test_lookups_from_threads_match_a_single_thread():
+    points = [(40.0 + i * 0.37, -10.0 + i * 0.91) for i in range(60)]
+    single = TimezoneResolver()
+    expected = [single.timezone_name(*point) for point in points]
+    resolver = TimezoneResolver(max_cells=16)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert list(pool.map(lambda point: resolver.timezone_name(*point), points * 3)) == expected * 3
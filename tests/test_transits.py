@@ -0,0 +1,57 @@
+import swisseph as swe
+
+from transits import date_to_jd, find_transits, scan_windows, time_grid
+
+# Sun and Moon fall back to the built-in Moshier model, so these tests do not
+# need the Swiss Ephemeris data files
+BODIES = [(swe.SUN, "Сонце"), (swe.MOON, "Місяць")]
+
+
+def natal_sun(jd):
+    return [{"name": "Сонце", "longitude": swe.calc_ut(jd, swe.SUN)[0][0]}]
+
+
+def test_time_grid_includes_both_ends():
+    jds = time_grid(100.0, 102.5, 1.0)
+
+    assert list(jds) == [100.0, 101.0, 102.0, 102.5]
+
+
+def test_windows_share_boundaries_and_cover_the_range():
+    windows = scan_windows(0.0, 250.0, 1.0, 120)
+
+    assert windows == [(0.0, 120.0), (120.0, 240.0), (240.0, 250.0)]
+
+
+def test_solar_return_is_found_and_refined():
+    birth = date_to_jd("1990-05-15") + 0.3
+    natal = natal_sun(birth)
+
+    hits = find_transits(natal, date_to_jd("2025-01-01"), date_to_jd("2026-01-01"), 1.0, bodies=BODIES[:1])
+    returns = [h for h in hits if h["angle"] == 0]
+
+    assert len(returns) == 1
+    assert returns[0]["date"][:10] in ("2025-05-14", "2025-05-15")
+    error = (swe.calc_ut(returns[0]["jd"], swe.SUN)[0][0] - natal[0]["longitude"] + 180) % 360 - 180
+    assert abs(error) < 1e-4
+
+
+def test_every_aspect_side_is_reported_once_per_pass():
+    natal = natal_sun(date_to_jd("1990-05-15"))
+
+    hits = find_transits(natal, date_to_jd("2025-01-01"), date_to_jd("2026-01-01"), 1.0, bodies=BODIES[:1])
+
+    # conjunction and opposition once, the other aspects on both sides
+    assert sorted(h["angle"] for h in hits) == [0, 60, 60, 90, 90, 120, 120, 180]
+    assert [h["jd"] for h in hits] == sorted(h["jd"] for h in hits)
+
+
+def test_windowed_scan_matches_single_scan():
+    natal = natal_sun(date_to_jd("1990-05-15"))
+    start, end = date_to_jd("2025-01-01"), date_to_jd("2025-04-01")
+
+    whole = find_transits(natal, start, end, 1.0, bodies=BODIES)
+    windowed = [h for w in scan_windows(start, end, 1.0, 20) for h in find_transits(natal, *w, 1.0, bodies=BODIES)]
+
+    assert [(h["transit"], h["angle"], round(h["jd"], 4)) for h in windowed] == \
+        [(h["transit"], h["angle"], round(h["jd"], 4)) for h in whole]
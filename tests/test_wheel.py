@@ -0,0 +1,34 @@
+import xml.etree.ElementTree as ET
+
+from tests.test_chart_storage import stored_chart
+from wheel import PLANET_SYMBOLS, render_wheel_svg
+
+SVG = "{http://www.w3.org/2000/svg}"
+
+
+def test_wheel_is_valid_svg_scaled_to_the_requested_size():
+    root = ET.fromstring(render_wheel_svg(stored_chart(), size=300))
+
+    assert root.get("width") == "300" and root.get("viewBox") == "0 0 600 600"
+    labels = [text.text for text in root.iter(f"{SVG}text")]
+    assert set(PLANET_SYMBOLS.values()) <= set(labels)
+    assert [str(n) for n in range(1, 13)] == [label for label in labels if label.isdigit()]
+
+
+def test_aspect_lines_are_optional():
+    chart = stored_chart()
+
+    with_aspects = ET.fromstring(render_wheel_svg(chart))
+    without = ET.fromstring(render_wheel_svg(chart, show_aspects=False))
+
+    lines = len(list(with_aspects.iter(f"{SVG}line"))) - len(list(without.iter(f"{SVG}line")))
+    assert lines == len(chart["aspects"])
+
+
+def test_unknown_points_are_labelled_and_escaped():
+    chart = stored_chart()
+    chart["planets"].append({"name": "<Ceres>", "longitude": 10.0})
+
+    root = ET.fromstring(render_wheel_svg(chart))
+
+    assert "<C" in [text.text for text in root.iter(f"{SVG}text")]